@@ -1,14 +1,45 @@
+import time
+
+# 임포트 시간 측정 (/readyz에 표시)
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 from pathlib import Path
 import asyncio
 
 # 🔸 backend/.env 로드 (uvicorn 재로더/서브프로세스에서도 실행되도록 모듈 최상단에)
+# .env는 여기서 한 번만 읽음 (라우터/유틸 모듈은 환경변수만 읽음)
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 수명 관리
+    - 시작: 캐시 스냅샷 복원, 이벤트 루프 지연 측정, 백그라운드 작업 실행기 시작 (리더 선출 포함)
+    - 종료: 작업 실행기/지연 측정 정지, 캐시 스냅샷 저장, 공유 클라이언트(SMTP, HTTP, Supabase) 정리
+    
+    클라이언트들은 시작 시 만들지 않고 처음 쓰일 때 만듭니다. (utils/deps.py)
+    """
+    started = time.perf_counter()
+    startup_state.started_at = time.time()
+    await startup()
+    startup_state.startup_seconds = time.perf_counter() - started
+    startup_state.ready = True
+    print(f"[서버] 준비 완료 (임포트 {startup_state.import_seconds * 1000:.0f}ms, 시작 {startup_state.startup_seconds * 1000:.0f}ms)")
+    print("=" * 50)
+    try:
+        yield
+    finally:
+        startup_state.ready = False
+        await shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 미들웨어 설정 (라우터 등록 전에 추가)
 app.add_middleware(
@@ -19,25 +50,94 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더 허용
 )
 
-from app.routers.news_api import router as news_api, background_cache_updater
-from app.routers.search_stats import router as search_stats
+from app.routers.news_api import router as news_api, refresh_news_cache, keyword_poller, page_prefetcher, CACHE_REFRESH_INTERVAL
+from app.routers.search_stats import router as search_stats, publish_dashboard, DASHBOARD_REFRESH_INTERVAL
 from app.routers.user_profile import router as user_profile
 from app.routers.email_notifications import router as email_notifications
+from app.routers.jobs import router as jobs, job_runner
+from app.routers.health import router as health
+from app.routers.metrics import router as metrics
+from app.routers.cache_admin import router as cache_admin
+from utils.cache import (
+    sync_shared_cache, sync_invalidations, snapshot_cache, save_snapshot, load_snapshot,
+    CACHE_SNAPSHOT_ENABLED, CACHE_SNAPSHOT_INTERVAL,
+)
+from utils.shared_store import prune_expired_entries
+from utils.deps import close_dependencies, startup_state
+from utils.naver_client import probe_upstream
+from utils.metrics import LatencyMiddleware, loop_lag_monitor
+from utils.bursts import burst_detector
 
 app.include_router(news_api)
 app.include_router(search_stats)
 app.include_router(user_profile)
 app.include_router(email_notifications)
+app.include_router(jobs)
+app.include_router(health)
+app.include_router(metrics)
+app.include_router(cache_admin)
 
+# 라우트별/단계별 지연 시간 기록 (CORS보다 바깥에서 전체 시간을 잼)
+app.add_middleware(LatencyMiddleware)
 
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 백그라운드 캐시 작업 시작"""
+# 주기 작업 등록
+# - 리더 프로세스 하나만 Naver API를 호출해서 캐시를 갱신하고 공유 저장소에 게시
+# - 나머지 워커는 공유 저장소에서 새 항목만 가져옴
+job_runner.register("news-cache-refresh", refresh_news_cache, interval=CACHE_REFRESH_INTERVAL,
+                    role="leader", initial_delay=1, retry_interval=60)
+# - 인기 검색어는 키워드별 기사 도착 속도에 맞춘 간격으로 리더가 계속 폴링
+job_runner.register_service("keyword-poller", keyword_poller.start, keyword_poller.stop, keyword_poller.status)
+job_runner.register("shared-cache-sync", sync_shared_cache, interval=5, role="follower")
+# - 관리자 API로 한 워커에서 캐시를 무효화하면 다른 워커(리더 포함)도 같은 항목을 지움
+job_runner.register("cache-invalidation-sync", sync_invalidations, interval=5, role="all")
+# - 서킷 브레이커가 열린 워커는 대기 시간이 지나면 확인 요청으로 복구 여부를 확인
+job_runner.register("naver-breaker-probe", probe_upstream, interval=5, role="all")
+job_runner.register("shared-store-prune", lambda: asyncio.to_thread(prune_expired_entries),
+                    interval=3600, role="leader", initial_delay=60)
+# - 통계 대시보드 스냅샷을 리더가 미리 만들어 게시 (조회는 인코딩된 본문을 그대로 반환)
+job_runner.register("dashboard-snapshot", publish_dashboard, interval=DASHBOARD_REFRESH_INTERVAL,
+                    role="leader", initial_delay=5, retry_interval=30)
+# - 리더가 본 기사로 계산한 급상승 키워드를 다른 워커도 보여 줄 수 있게 게시
+job_runner.register("burst-publish", burst_detector.publish, interval=30, role="leader", initial_delay=30)
+# - 재시작 후 캐시를 곧바로 복원할 수 있게 리더가 주기적으로 스냅샷 저장
+if CACHE_SNAPSHOT_ENABLED and CACHE_SNAPSHOT_INTERVAL > 0:
+    job_runner.register("cache-snapshot", snapshot_cache, interval=CACHE_SNAPSHOT_INTERVAL,
+                        role="leader", initial_delay=CACHE_SNAPSHOT_INTERVAL)
+
+
+async def startup():
+    """캐시 스냅샷 복원 후 백그라운드 작업 실행기 시작"""
     print("=" * 50)
     print("[서버] 시작 중...")
-    print("[서버] 백그라운드 캐시 작업 시작")
-    print("=" * 50)
-    asyncio.create_task(background_cache_updater())
+    config = startup_state.config_checks()
+    print("[서버] 설정: " + ", ".join(f"{name} {'✅' if ok else '❌'}" for name, ok in config.items()))
+    await loop_lag_monitor.start()
+    if CACHE_SNAPSHOT_ENABLED:
+        started = time.perf_counter()
+        try:
+            restored = load_snapshot()
+            print(f"[서버] 캐시 스냅샷 복원: {restored}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        except Exception as e:
+            print(f"[서버] 캐시 스냅샷 복원 실패: {str(e)}")
+    if os.getenv("BACKGROUND_JOBS_ENABLED", "true").lower() != "true":
+        # 벤치마크/테스트용: 캐시를 미리 채우지 않음
+        print("[서버] 백그라운드 작업 비활성화됨 (BACKGROUND_JOBS_ENABLED=false)")
+        return
+    print("[서버] 백그라운드 작업 실행기 시작")
+    await job_runner.start()
+
+
+async def shutdown():
+    """작업 실행기를 멈추고, 캐시 스냅샷 저장, 대기 중인 이메일을 보내고 공유 클라이언트 정리"""
+    await job_runner.stop()
+    await loop_lag_monitor.stop()
+    await page_prefetcher.stop()
+    if CACHE_SNAPSHOT_ENABLED:
+        try:
+            print(f"[서버] 캐시 스냅샷 저장: {save_snapshot()}개")
+        except Exception as e:
+            print(f"[서버] 캐시 스냅샷 저장 실패: {str(e)}")
+    await close_dependencies()
 
 
 @app.get("/api/test")
@@ -47,3 +147,6 @@ async def test_get():
 @app.post("/api/test")
 async def test_post(data: dict):
     return {"received": data}
+
+
+startup_state.import_seconds = time.perf_counter() - _import_started
@@ -0,0 +1,107 @@
+"""
+캐시 관리자 API (X-Admin-Token 필요)
+- /api/cache/entries: 캐시 항목 목록 (히트 수/크기 순)
+- /api/cache/invalidate: 태그나 키 접두사로 캐시 항목 삭제 (다른 워커에도 전달)
+- /api/cache/warm: 검색어 목록을 네이버 API 호출 제한 안에서 미리 캐시에 채움
+
+캐시 태그: endpoint:search, endpoint:feed, endpoint:category-stats, endpoint:popular-keywords,
+query:<정규화한 검색어>, category:<카테고리 이름>
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import List
+import asyncio
+import sys
+from pathlib import Path
+
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.admin import require_admin
+from utils.cache import describe_entries, invalidate
+from utils.metrics import TimedORJSONResponse
+from utils.query import canonical_query
+from app.routers.news_api import warm_search
+
+router = APIRouter(
+    prefix="/api/cache", tags=["cache"],
+    dependencies=[Depends(require_admin)], default_response_class=TimedORJSONResponse
+)
+
+# 일괄 예열에서 한 번에 받을 수 있는 최대 검색어 수와 동시 실행 수
+MAX_WARM_QUERIES = 50
+WARM_CONCURRENCY = 4
+
+
+class InvalidateRequest(BaseModel):
+    tags: List[str] = Field(default_factory=list, description="지울 태그 (예: endpoint:feed, category:사이버보안)")
+    prefixes: List[str] = Field(default_factory=list, description="지울 캐시 키 접두사 (예: news:feed:)")
+    queries: List[str] = Field(default_factory=list, description="지울 검색어 (query:<정규화한 검색어> 태그로 바꿈)")
+
+
+class WarmRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=MAX_WARM_QUERIES)
+    display: int = Field(10, ge=1, le=100, description="검색 결과 개수 (1~100)")
+    pages: int = Field(1, ge=1, le=5, description="검색어마다 채울 페이지 수")
+    sort: str = Field("date", pattern="^(sim|date)$", description="정렬 옵션 (sim: 정확도순, date: 날짜순)")
+    refresh: bool = Field(False, description="캐시에 있어도 새로 가져와서 교체")
+
+
+def _normalize_tag(tag: str) -> str:
+    """query: 태그는 검색 캐시와 같은 형태로 정규화"""
+    if tag.startswith("query:"):
+        return "query:" + canonical_query(tag[len("query:"):])
+    return tag
+
+
+@router.get("/entries")
+async def get_entries(
+    sort: str = Query("hits", regex="^(hits|size)$", description="정렬 기준 (hits: 히트 수, size: 인코딩 크기)"),
+    limit: int = Query(50, ge=1, le=1000, description="반환할 항목 수"),
+    tag: str = Query(None, description="이 태그가 있는 항목만"),
+    prefix: str = Query(None, description="키가 이 접두사로 시작하는 항목만")
+):
+    """이 워커 프로세스의 캐시 항목 (키, 태그, 히트 수, 크기, 남은 만료 시간, stale 여부)"""
+    return describe_entries(sort, limit, _normalize_tag(tag) if tag else None, prefix)
+
+
+@router.post("/invalidate")
+async def invalidate_entries(body: InvalidateRequest):
+    """
+    태그가 하나라도 겹치거나 키가 접두사로 시작하는 캐시 항목을 지웁니다.
+    공유 저장소의 게시 항목도 지우고, 다른 워커는 다음 동기화(5초 이내)에 같은 무효화를 적용합니다.
+    지운 항목은 stale 응답용으로도 남지 않으므로 다음 요청은 네이버 API를 호출합니다.
+    """
+    tags = [_normalize_tag(tag) for tag in body.tags]
+    tags += [f"query:{canonical_query(query)}" for query in body.queries]
+    prefixes = [prefix for prefix in body.prefixes if prefix]
+    if not tags and not prefixes:
+        raise HTTPException(status_code=400, detail="tags, prefixes, queries 중 하나는 있어야 합니다.")
+    removed = await invalidate(tags, prefixes)
+    return {"tags": sorted(set(tags)), "prefixes": sorted(set(prefixes)), "removed": len(removed), "keys": removed}
+
+
+@router.post("/warm")
+async def warm_entries(body: WarmRequest):
+    """
+    검색어 목록을 미리 캐시에 채웁니다. (장애 복구 후나 무효화 후 캐시를 다시 데울 때)
+
+    - 네이버 API 호출은 사용자 요청과 같은 호출 제한(토큰 버킷)과 서킷 브레이커를 거치고,
+      동시에 WARM_CONCURRENCY개까지만 실행합니다
+    - 이미 캐시에 있으면 건너뜀 (refresh=true면 새로 가져와서 교체)
+    - 검색어마다 1페이지부터 pages페이지까지 채움
+    """
+    semaphore = asyncio.Semaphore(WARM_CONCURRENCY)
+
+    async def warm(query: str, start: int) -> dict:
+        async with semaphore:
+            return await warm_search(query, body.display, start, body.sort, refresh=body.refresh)
+
+    results = await asyncio.gather(*(
+        warm(query, 1 + page * body.display)
+        for query in dict.fromkeys(body.queries)
+        for page in range(body.pages)
+        if 1 + page * body.display <= 1000
+    ))
+    summary = {status: sum(r["status"] == status for r in results) for status in ("warmed", "cached", "failed")}
+    return {**summary, "results": results}
@@ -3,16 +3,37 @@
 답장 알림 등의 이메일을 전송하는 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel, EmailStr
-from typing import Optional
-import smtplib
+from typing import Optional, List, Dict
+from datetime import datetime, timezone
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+import sys
+import socket
+import uuid
+import asyncio
+from pathlib import Path
+
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.smtp_pool import SMTPSettings, get_delivery_worker, SEND_OK, SEND_PERMANENT
+from utils.email_templates import render_subject, render_text, render_html
+from utils.deps import get_supabase, SUPABASE_EMAIL_KEY
 
 router = APIRouter(prefix="/api/email", tags=["email"])
 
+# 요약(digest) 모드: 수신자별 pending 알림을 이 시간(초) 동안 모아서 한 통으로 전송
+EMAIL_DIGEST_WINDOW = int(os.getenv("EMAIL_DIGEST_WINDOW", "300"))
+EMAIL_DIGEST_MAX_ITEMS = 50
+
+# email_log 큐 처리 설정 (database/email_queue_setup.sql 필요)
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "100"))  # 한 번에 claim하는 레코드 수
+EMAIL_LEASE_SECONDS = int(os.getenv("EMAIL_LEASE_SECONDS", "120"))  # claim 후 이 시간 안에 ack하지 않으면 다른 워커가 가져감
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))  # 이 횟수를 넘기면 failed
+EMAIL_RETRY_BACKOFF = int(os.getenv("EMAIL_RETRY_BACKOFF", "60"))  # 재시도 백오프 기본값 (초, 2배씩 증가)
+
 
 class ReplyNotificationEmail(BaseModel):
     to_email: EmailStr
@@ -22,6 +43,27 @@ class ReplyNotificationEmail(BaseModel):
     reply_to_content: Optional[str] = None
 
 
+def build_reply_message(notifications: List[ReplyNotificationEmail], sender: str) -> MIMEMultipart:
+    """
+    답장 알림 이메일 메시지를 만듭니다.
+    같은 수신자에게 가는 알림이 여러 개면 한 통의 요약(digest) 이메일로 합칩니다.
+    """
+    first = notifications[0]
+    replies = [(n.from_name, n.message, n.reply_to_content) for n in notifications]
+    
+    # 이메일 메시지 생성
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = render_subject(replies)
+    msg["From"] = sender
+    msg["To"] = first.to_email
+    
+    # 메시지에 텍스트와 HTML 추가
+    msg.attach(MIMEText(render_text(first.to_name, replies), "plain"))
+    msg.attach(MIMEText(render_html(first.to_name, replies), "html"))
+    
+    return msg
+
+
 @router.post("/send-reply-notification")
 async def send_reply_notification(
     notification: ReplyNotificationEmail,
@@ -36,183 +78,237 @@ async def send_reply_notification(
     - SMTP_USER: SMTP 사용자 이메일
     - SMTP_PASSWORD: SMTP 비밀번호
     """
+    configured = SMTPSettings().configured
+    results = await deliver_notifications([[notification]])
     
-    # 환경변수에서 SMTP 설정 가져오기
-    smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USER")
-    smtp_password = os.getenv("SMTP_PASSWORD")
-    
-    if not smtp_user or not smtp_password:
-        # SMTP 설정이 없으면 로그만 남기고 성공 반환 (개발 환경)
-        print(f"[EMAIL NOTIFICATION] Would send to {notification.to_email}")
-        print(f"From: {notification.from_name}")
-        print(f"Message: {notification.message}")
+    if not configured:
         return {
             "success": True,
             "message": "Email notification logged (SMTP not configured)"
         }
     
-    try:
-        # 이메일 메시지 생성
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"[보안뉴스] {notification.from_name}님이 회원님의 메시지에 답장했습니다"
-        msg["From"] = smtp_user
-        msg["To"] = notification.to_email
-        
-        # HTML 이메일 본문
-        html = f"""
-        <html>
-          <head>
-            <style>
-              body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-              .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-              .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-              .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; }}
-              .message-box {{ background: white; padding: 20px; border-left: 4px solid #667eea; margin: 20px 0; border-radius: 5px; }}
-              .reply-box {{ background: #e3f2fd; padding: 15px; border-left: 4px solid #2196f3; margin: 20px 0; border-radius: 5px; }}
-              .button {{ display: inline-block; padding: 12px 30px; background: #667eea; color: white; text-decoration: none; border-radius: 5px; margin-top: 20px; }}
-              .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-            </style>
-          </head>
-          <body>
-            <div class="container">
-              <div class="header">
-                <h1>🔔 새로운 답장이 도착했습니다</h1>
-              </div>
-              <div class="content">
-                <p>안녕하세요, {notification.to_name}님!</p>
-                <p><strong>{notification.from_name}</strong>님이 회원님의 메시지에 답장을 남겼습니다.</p>
-                
-                {f'''
-                <div class="message-box">
-                  <p><strong>회원님의 메시지:</strong></p>
-                  <p>{notification.reply_to_content}</p>
-                </div>
-                ''' if notification.reply_to_content else ''}
-                
-                <div class="reply-box">
-                  <p><strong>{notification.from_name}님의 답장:</strong></p>
-                  <p>{notification.message}</p>
-                </div>
-                
-                <p>커뮤니티에서 대화를 계속하시려면 아래 버튼을 클릭하세요.</p>
-                <a href="http://localhost:3000/community" class="button">커뮤니티로 이동</a>
-                
-                <div class="footer">
-                  <p>이 이메일은 보안뉴스 커뮤니티에서 발송되었습니다.</p>
-                  <p>더 이상 알림을 받고 싶지 않으시다면 프로필 설정에서 변경하실 수 있습니다.</p>
-                </div>
-              </div>
-            </div>
-          </body>
-        </html>
-        """
-        
-        # 텍스트 버전 (HTML을 지원하지 않는 이메일 클라이언트용)
-        text = f"""
-        안녕하세요, {notification.to_name}님!
-        
-        {notification.from_name}님이 회원님의 메시지에 답장을 남겼습니다.
-        
-        {f'회원님의 메시지: {notification.reply_to_content}' if notification.reply_to_content else ''}
-        
-        {notification.from_name}님의 답장: {notification.message}
-        
-        커뮤니티에서 대화를 계속하시려면 http://localhost:3000/community 를 방문하세요.
-        
-        ---
-        이 이메일은 보안뉴스 커뮤니티에서 발송되었습니다.
-        """
-        
-        # 메시지에 텍스트와 HTML 추가
-        part1 = MIMEText(text, "plain")
-        part2 = MIMEText(html, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-        
-        # SMTP 서버 연결 및 이메일 전송
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
-        
+    if results[0] == SEND_OK:
         return {
             "success": True,
             "message": f"Email sent to {notification.to_email}"
         }
-        
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")
-        # 이메일 전송 실패해도 에러 반환하지 않음 (알림은 선택사항)
-        return {
-            "success": False,
-            "message": f"Failed to send email: {str(e)}"
-        }
+    
+    # 이메일 전송 실패해도 에러 반환하지 않음 (알림은 선택사항)
+    return {
+        "success": False,
+        "message": f"Failed to send email to {notification.to_email}"
+    }
 
 
-@router.post("/process-pending")
-async def process_pending_emails():
+async def deliver_notifications(groups: List[List[ReplyNotificationEmail]]) -> List[str]:
+    """
+    공유 SMTP 전송 워커로 알림 이메일들을 전송합니다.
+    각 그룹(같은 수신자에게 가는 알림 묶음)이 이메일 한 통이 됩니다.
+    
+    Returns:
+        입력 순서대로 각 그룹의 전송 결과 (SEND_OK, SEND_RETRYABLE, SEND_PERMANENT)
+    """
+    settings = SMTPSettings()
+    
+    if not settings.configured:
+        # SMTP 설정이 없으면 로그만 남기고 성공 처리 (개발 환경)
+        for group in groups:
+            print(f"[EMAIL NOTIFICATION] Would send to {group[0].to_email} ({len(group)} replies)")
+            for notification in group:
+                print(f"From: {notification.from_name}")
+                print(f"Message: {notification.message}")
+        return [SEND_OK] * len(groups)
+    
+    messages = []
+    results: List[Optional[str]] = [None] * len(groups)
+    for i, group in enumerate(groups):
+        try:
+            messages.append((i, build_reply_message(group, settings.user)))
+        except Exception as e:
+            print(f"Error building email: {str(e)}")
+            # 메시지를 만들 수 없는 알림은 다시 시도해도 같으므로 영구 실패
+            results[i] = SEND_PERMANENT
+    
+    sent = await get_delivery_worker().send_many([msg for _, msg in messages])
+    for (i, _), outcome in zip(messages, sent):
+        results[i] = outcome
+    
+    return results
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Supabase TIMESTAMPTZ 문자열을 datetime으로 변환"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def group_for_digest(records: List[dict], window_seconds: int, now: Optional[datetime] = None):
+    """
+    pending 레코드를 수신자별로 묶습니다.
+    
+    수신자의 가장 오래된 pending 알림이 window_seconds보다 최근이면
+    이번에는 보내지 않고 남겨 두어 이후 답장과 합쳐지게 합니다.
+    
+    Returns:
+        (이번에 보낼 레코드 묶음 목록, 다음으로 미룬 레코드 목록)
     """
-    email_log 테이블에서 pending 상태인 이메일을 조회하여 전송
+    now = now or datetime.now(timezone.utc)
+    by_recipient: Dict[str, List[dict]] = {}
+    for record in records:
+        by_recipient.setdefault(record["recipient_email"], []).append(record)
+    
+    groups = []
+    deferred = []
+    for recipient_records in by_recipient.values():
+        created = [_parse_timestamp(r.get("created_at")) for r in recipient_records]
+        oldest = min((c for c in created if c), default=None)
+        if oldest and (now - oldest).total_seconds() < window_seconds:
+            deferred.extend(recipient_records)
+            continue
+        # 너무 긴 이메일이 되지 않도록 최대 개수로 나눔
+        for i in range(0, len(recipient_records), EMAIL_DIGEST_MAX_ITEMS):
+            groups.append(recipient_records[i:i + EMAIL_DIGEST_MAX_ITEMS])
+    
+    return groups, deferred
+
+
+@router.post("/process-pending")
+async def process_pending_emails(
+    digest: bool = Query(False, description="수신자별 알림을 한 통의 요약 이메일로 합쳐서 전송"),
+    window: int = Query(EMAIL_DIGEST_WINDOW, ge=0, description="요약 모드에서 알림을 모으는 시간 (초)"),
+    batch_size: int = Query(EMAIL_BATCH_SIZE, ge=1, le=1000, description="한 번에 claim하는 레코드 수 (요약 모드에서는 수신자 수)"),
+    max_batches: int = Query(10, ge=1, le=100, description="이번 호출에서 처리할 최대 배치 수")
+):
     """
-    from supabase import create_client
+    email_log 큐에서 전송할 차례가 된 이메일을 배치 단위로 claim하여 전송
     
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
+    배치마다 claim 한 번, 결과 기록(ack) 한 번만 DB를 호출합니다.
+    claim된 레코드는 lease가 끝날 때까지 processing 상태라서
+    여러 워커가 동시에 호출해도 같은 이메일을 두 번 보내지 않습니다.
+    일시적으로 실패한 이메일은 지수 백오프 후 다시 시도되고,
+    수신 거부처럼 영구적으로 실패한 이메일은 바로 failed가 됩니다.
     
-    if not supabase_url or not supabase_key:
+    - **digest**: true면 같은 수신자의 알림을 묶어서 한 통으로 보냅니다.
+      가장 오래된 알림이 window초보다 최근인 수신자는 다음 처리 때까지 미룹니다.
+      claim은 수신자 단위라서 (batch_size명의 전송할 차례가 된 알림 전부)
+      한 수신자의 알림이 여러 배치나 워커로 나뉘어 여러 통으로 가지 않습니다.
+    """
+    supabase = get_supabase(SUPABASE_EMAIL_KEY)
+    if not supabase:
         raise HTTPException(status_code=500, detail="Supabase not configured")
     
-    supabase = create_client(supabase_url, supabase_key)
+    # 이번 호출만의 워커 ID (lease를 잃은 뒤의 ack가 무시되도록)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    
+    totals = {"sent": 0, "retried": 0, "dead": 0, "released": 0}
+    claimed_count = 0
+    email_count = 0
+    batches = 0
     
     try:
-        # pending 상태인 이메일 조회
-        response = supabase.table("email_log").select("*").eq("status", "pending").execute()
-        pending_emails = response.data
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for email_record in pending_emails:
-            try:
-                # 이메일 전송
-                notification = ReplyNotificationEmail(
-                    to_email=email_record["recipient_email"],
-                    to_name=email_record["recipient_email"].split("@")[0],
-                    from_name=email_record["sender_name"],
-                    message=email_record["message_content"],
-                    reply_to_content=email_record.get("original_message_content")
+        for _ in range(max_batches):
+            # 1) 배치 claim (DB 호출 1회, 요약 모드는 수신자 단위)
+            if digest:
+                claim_response = await asyncio.to_thread(
+                    lambda: supabase.rpc("claim_email_digest_batch", {
+                        "p_recipient_count": batch_size,
+                        "p_lease_seconds": EMAIL_LEASE_SECONDS,
+                        "p_worker_id": worker_id
+                    }).execute()
                 )
-                
-                result = await send_reply_notification(notification)
-                
-                if result.get("success"):
-                    # 상태를 sent로 업데이트
-                    supabase.table("email_log").update({
-                        "status": "sent",
-                        "sent_at": "now()"
-                    }).eq("id", email_record["id"]).execute()
-                    sent_count += 1
+            else:
+                claim_response = await asyncio.to_thread(
+                    lambda: supabase.rpc("claim_email_batch", {
+                        "p_batch_size": batch_size,
+                        "p_lease_seconds": EMAIL_LEASE_SECONDS,
+                        "p_worker_id": worker_id
+                    }).execute()
+                )
+            claimed = claim_response.data or []
+            if not claimed:
+                break
+            claimed_units = len({record["recipient_email"] for record in claimed}) if digest else len(claimed)
+            
+            batches += 1
+            claimed_count += len(claimed)
+            
+            if digest:
+                record_groups, deferred = group_for_digest(claimed, window)
+            else:
+                record_groups, deferred = [[record] for record in claimed], []
+            
+            # 2) 알림 객체로 변환 (변환 실패한 레코드는 재시도해도 소용없으므로 dead)
+            dead_ids = []
+            deliverable = []
+            notification_groups = []
+            for records in record_groups:
+                group_records = []
+                group = []
+                for email_record in records:
+                    try:
+                        group.append(ReplyNotificationEmail(
+                            to_email=email_record["recipient_email"],
+                            to_name=email_record["recipient_email"].split("@")[0],
+                            from_name=email_record["sender_name"],
+                            message=email_record["message_content"],
+                            reply_to_content=email_record.get("original_message_content")
+                        ))
+                        group_records.append(email_record)
+                    except Exception as e:
+                        print(f"Error processing email {email_record['id']}: {str(e)}")
+                        dead_ids.append(email_record["id"])
+                if group:
+                    deliverable.append(group_records)
+                    notification_groups.append(group)
+            
+            # 3) 전송 워커의 SMTP 세션 풀로 한꺼번에 전송 (제한된 동시성)
+            results = await deliver_notifications(notification_groups)
+            email_count += len(notification_groups)
+            
+            sent_ids = []
+            retry_ids = []
+            for group_records, outcome in zip(deliverable, results):
+                # 영구 실패(수신 거부 등)는 재시도하지 않고 바로 failed
+                if outcome == SEND_OK:
+                    target = sent_ids
+                elif outcome == SEND_PERMANENT:
+                    target = dead_ids
                 else:
-                    # 실패 시 failed로 업데이트
-                    supabase.table("email_log").update({
-                        "status": "failed"
-                    }).eq("id", email_record["id"]).execute()
-                    failed_count += 1
-                    
-            except Exception as e:
-                print(f"Error processing email {email_record['id']}: {str(e)}")
-                supabase.table("email_log").update({
-                    "status": "failed"
-                }).eq("id", email_record["id"]).execute()
-                failed_count += 1
+                    target = retry_ids
+                target.extend(record["id"] for record in group_records)
+            
+            # 4) 배치 결과 일괄 기록 (DB 호출 1회)
+            ack_response = await asyncio.to_thread(
+                lambda: supabase.rpc("ack_email_batch", {
+                    "p_worker_id": worker_id,
+                    "p_sent_ids": sent_ids,
+                    "p_retry_ids": retry_ids,
+                    "p_dead_ids": dead_ids,
+                    "p_release_ids": [record["id"] for record in deferred],
+                    "p_release_window": window,
+                    "p_max_attempts": EMAIL_MAX_ATTEMPTS,
+                    "p_backoff_seconds": EMAIL_RETRY_BACKOFF
+                }).execute()
+            )
+            for key, value in (ack_response.data or {}).items():
+                totals[key] = totals.get(key, 0) + value
+            
+            if claimed_units < batch_size:
+                break
         
         return {
             "success": True,
-            "processed": len(pending_emails),
-            "sent": sent_count,
-            "failed": failed_count
+            "batches": batches,
+            "processed": claimed_count - totals["released"],
+            "sent": totals["sent"],
+            "retried": totals["retried"],
+            "failed": totals["dead"],
+            "emails": email_count,
+            "deferred": totals["released"]
         }
         
     except Exception as e:
@@ -220,6 +316,12 @@ async def process_pending_emails():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics")
+async def get_email_metrics():
+    """SMTP 전송 워커의 처리량/지연 시간 메트릭"""
+    return get_delivery_worker().metrics()
+
+
 @router.get("/test")
 async def test_email_config():
     """SMTP 설정 테스트"""
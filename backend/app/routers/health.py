@@ -0,0 +1,32 @@
+"""
+상태 확인 API
+- /healthz: 프로세스가 살아 있는지 (항상 200)
+- /readyz: 시작 작업(캐시 복원, 작업 실행기 시작)이 끝나서 요청을 받을 준비가 됐는지 (아니면 503)
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+import sys
+from pathlib import Path
+
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.deps import startup_state
+
+router = APIRouter(tags=["health"], default_response_class=ORJSONResponse)
+
+
+@router.get("/healthz")
+async def healthz():
+    """살아 있는지만 확인합니다. (외부 서비스를 호출하지 않음)"""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """
+    준비 상태와 임포트/시작 시간, 외부 서비스 설정 여부를 반환합니다.
+    시작 작업이 끝나기 전이나 종료 중에는 503을 반환합니다.
+    """
+    state = startup_state.to_dict()
+    return ORJSONResponse(state, status_code=200 if startup_state.ready else 503)
@@ -0,0 +1,23 @@
+"""
+백그라운드 작업 API
+작업 스케줄과 마지막 실행 상태를 조회하는 엔드포인트
+"""
+
+from fastapi import APIRouter
+import sys
+from pathlib import Path
+
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.jobs import job_runner
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/status")
+async def get_job_status():
+    """
+    이 워커 프로세스의 리더 여부와 등록된 작업들의 스케줄/마지막 실행 상태를 반환합니다.
+    리더가 아닌 워커에서는 리더가 게시한 작업 상태도 함께 반환합니다.
+    """
+    return job_runner.status()
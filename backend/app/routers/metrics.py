@@ -0,0 +1,67 @@
+"""
+지연 시간 계측 API
+- /api/metrics/latency: 라우트별 지연 시간 히스토그램 (단계별: cache, naver, supabase_auth, supabase_query, serialize, other)
+- /api/metrics/loop-lag: 이벤트 루프 지연
+- /api/metrics/profile: 관리자 토큰으로 N초 동안 샘플링 프로파일러를 켜고 접힌 스택을 반환
+
+값은 이 워커 프로세스 것만입니다.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+import asyncio
+import threading
+import sys
+from pathlib import Path
+
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.admin import require_admin
+from utils.metrics import (
+    latency_registry, loop_lag_monitor, profiler, format_collapsed,
+    TimedORJSONResponse, PROFILE_MAX_SECONDS, PROFILE_INTERVAL,
+)
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"], default_response_class=TimedORJSONResponse)
+
+
+@router.get("/latency")
+async def get_latency():
+    """라우트별 전체/단계별 지연 시간 (요청 수, 평균, p50/p90/p99, 최대, 버킷별 개수)"""
+    return latency_registry.to_dict()
+
+
+@router.post("/latency/reset", dependencies=[Depends(require_admin)])
+async def reset_latency():
+    """지연 시간 히스토그램 초기화 (관리자)"""
+    latency_registry.reset()
+    return {"reset": True}
+
+
+@router.get("/loop-lag")
+async def get_loop_lag():
+    """이벤트 루프 지연 (interval마다 측정한 값의 히스토그램)"""
+    return loop_lag_monitor.status()
+
+
+@router.post("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def run_profile(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS, description="샘플링 시간 (초)"),
+    interval: float = Query(PROFILE_INTERVAL, ge=0.001, le=1, description="샘플링 간격 (초)"),
+    all_threads: bool = Query(False, description="이벤트 루프 스레드뿐 아니라 모든 스레드 샘플링")
+):
+    """
+    샘플링 프로파일러를 seconds 동안 켜고 접힌 스택(collapsed stack)을 반환합니다. (관리자)
+    
+    - 출력 한 줄: '스레드;바깥 함수;...;안쪽 함수 샘플 수' (flamegraph.pl, speedscope에 그대로 사용)
+    - 기본은 이벤트 루프 스레드만 샘플링 (asyncio.to_thread 작업까지 보려면 all_threads=true)
+    - 한 번에 하나만 실행할 수 있습니다 (실행 중이면 409)
+    """
+    thread_ids = None if all_threads else {threading.get_ident()}
+    stacks = await asyncio.to_thread(profiler.run, seconds, interval, thread_ids)
+    if stacks is None:
+        raise HTTPException(status_code=409, detail="프로파일러가 이미 실행 중입니다.")
+    return PlainTextResponse(
+        format_collapsed(stacks),
+        headers={"X-Profile-Samples": str(sum(stacks.values()))}
+    )
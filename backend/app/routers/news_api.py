@@ -1,29 +1,44 @@
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from pydantic import BaseModel, Field
 import httpx
-import os
-from typing import Optional
-from dotenv import load_dotenv
+import orjson
+from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import sys
 from pathlib import Path
 import asyncio
+import time
 
 # utils 모듈을 임포트하기 위해 경로 추가
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.cache import get_cached_data, set_cached_data
+from utils.cache import set_cached_data, get_cache_entry, get_stale_entry, is_cached, CacheEntry
+from utils.http_cache import cached_response
+from utils.naver_client import (
+    fetch_news, is_configured, breaker, rate_limiter,
+    NaverAPIError, NaverRateLimited, NaverCircuitOpen, UpstreamBusy,
+)
+from utils.singleflight import SingleFlight
+from utils.feed import build_stream, merge_streams
+from utils.volume import category_volume
+from utils.keyword_poller import KeywordPoller, PollResult
+from utils.request_limit import request_limiter, mark_verified
+from utils.projection import parse_fields, project_data, projected_entry
+from utils.metrics import TimedORJSONResponse
+from utils.articles import article_id, article_index
+from utils.prefetch import PagePrefetcher
+from utils.query import canonical_query
+from utils.bursts import burst_detector
+from utils.admission import upstream_admission, parse_deadline, wait_with_deadline, DeadlineExceeded
+from app.routers.user_profile import get_category_settings
 
-router = APIRouter(prefix="/api/news", tags=["news"])
-load_dotenv()  # .env 파일 로드
-
-NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
-NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
-NAVER_API_URL = "https://openapi.naver.com/v1/search/news.json"
+router = APIRouter(prefix="/api/news", tags=["news"], default_response_class=TimedORJSONResponse)
 
 # 캐시 저장 (10분으로 늘림)
 _category_stats_cache = None
 _cache_timestamp = None
 CACHE_DURATION = 600  # 10분 (초)
+CATEGORY_STATS_CACHE_KEY = "news:category-stats"
 
 # API 요청 간 딜레이 (초)
 API_DELAY = 1.0  # 1초로 늘림 (429 에러 방지)
@@ -34,8 +49,206 @@ POPULAR_KEYWORDS = [
     "보안제품", "암호화", "네트워크 보안", "보안 정책", "데이터 보안"
 ]
 
-# 백그라운드 작업 실행 여부
-_background_task_running = False
+# 뉴스 카테고리 (name은 user_profiles.category_settings의 키와 같음)
+NEWS_CATEGORIES = [
+    {"id": "cyber-security", "name": "사이버보안", "keyword": "사이버보안"},
+    {"id": "hacking", "name": "해킹/침해사고", "keyword": "해킹"},
+    {"id": "privacy", "name": "개인정보보호", "keyword": "개인정보"},
+    {"id": "it-trends", "name": "IT/보안 트렌드", "keyword": "IT 보안"},
+    {"id": "malware", "name": "악성코드/피싱", "keyword": "악성코드"},
+    {"id": "security-products", "name": "보안제품/서비스", "keyword": "보안제품"},
+    {"id": "authentication", "name": "인증·암호화", "keyword": "암호화"},
+    {"id": "network-security", "name": "네트워크보안", "keyword": "네트워크 보안"},
+    {"id": "policy", "name": "정책·제도", "keyword": "보안 정책"},
+    {"id": "data-security", "name": "데이터보안", "keyword": "데이터 보안"},
+]
+
+# 피드용 카테고리 스트림 (카테고리마다 최신 기사 100개, 모든 사용자가 공유)
+FEED_STREAM_SIZE = 100
+FEED_STREAM_CACHE_SECONDS = 600
+
+# 인기 검색어 캐시 갱신 주기 (초)
+CACHE_REFRESH_INTERVAL = 600
+
+# 메인 페이지 카테고리별 기사 수 (폴링 결과로 미리 캐싱하는 검색 크기)
+MAIN_PAGE_DISPLAY = 7
+# 폴링으로 채운 캐시가 다음 폴링 전에 만료되지 않도록 더하는 여유 시간 (초)
+POLL_CACHE_GRACE_SECONDS = 120
+
+# 배치 검색에서 한 번에 받을 수 있는 최대 검색어 수
+MAX_BATCH_QUERIES = 20
+
+# 같은 캐시 키의 동시 캐시 미스를 업스트림 호출 한 번으로 합침
+_search_flight = SingleFlight()
+_stream_flight = SingleFlight()
+
+
+def _search_cache_key(query: str, display: int, start: int, sort: str) -> str:
+    """검색 캐시 키 (query, display, start, sort 조합)"""
+    return f"news:search:{hashlib.md5(f'{query}:{display}:{start}:{sort}'.encode()).hexdigest()}"
+
+
+def _search_tags(query: str) -> tuple:
+    """검색 캐시 항목 태그 (관리자 API 무효화용)"""
+    return ("endpoint:search", f"query:{query}")
+
+
+def _filter_recent_items(items: list, limit: Optional[int] = None) -> list:
+    """2020년 이후 기사만 필터링 (limit개가 모이면 중단)"""
+    cutoff_date = datetime(2020, 1, 1)
+    filtered_items = []
+    
+    for item in items:
+        try:
+            pub_date = datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S %z')
+            if pub_date.replace(tzinfo=None) >= cutoff_date:
+                filtered_items.append(item)
+        except Exception:
+            filtered_items.append(item)
+        if limit is not None and len(filtered_items) >= limit:
+            break
+    
+    return filtered_items
+
+
+def _rate_limited_body(start: int) -> dict:
+    """네이버 API 429 시 돌려주는 빈 결과"""
+    return {
+        "lastBuildDate": datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        "total": 0,
+        "start": start,
+        "display": 0,
+        "items": [],
+        "message": "일시적으로 요청이 많습니다. 잠시 후 다시 시도해주세요."
+    }
+
+
+async def get_news(query: str, display: int = 10, start: int = 1, sort: str = "date") -> CacheEntry:
+    """
+    캐시 우선으로 검색 결과를 가져옵니다.
+    캐시 미스면 네이버 API를 호출해서 캐시에 저장하고,
+    같은 키로 동시에 들어온 캐시 미스는 업스트림 호출 한 번으로 합칩니다.
+    
+    Raises:
+        NaverRateLimited: 네이버 API 429
+        NaverAPIError: 그 밖의 네이버 API 오류
+        httpx.TimeoutException: 시간 초과
+    """
+    cache_key = _search_cache_key(query, display, start, sort)
+    
+    # 캐시에서 데이터 확인 (항상 먼저 캐시 확인)
+    cached_entry = get_cache_entry(cache_key)
+    if cached_entry:
+        print(f"✓ 캐시에서 반환: {query}")
+        return cached_entry
+    
+    # 캐시 미스: 실시간으로 API 호출 (같은 키의 동시 요청은 한 번만)
+    return await _search_flight.do(cache_key, lambda: _load_search(cache_key, query, display, start, sort))
+
+
+async def _load_search(cache_key: str, query: str, display: int, start: int, sort: str) -> CacheEntry:
+    """네이버 API로 검색해서 캐시에 저장 (10분)"""
+    print(f"⚠ 캐시 미스 - 실시간 API 호출: {query}")
+    data = await fetch_news(query, display, start, sort)
+    
+    data['items'] = _filter_recent_items(data.get('items', []))
+    data['display'] = len(data['items'])
+    
+    entry = await set_cached_data(cache_key, data, expire_seconds=600, tags=_search_tags(query))
+    print(f"✓ API 호출 성공 및 캐시 저장: {query}")
+    return entry
+
+
+async def get_news_or_stale(
+    query: str, display: int = 10, start: int = 1, sort: str = "date", timeout: Optional[float] = None
+) -> Tuple[CacheEntry, bool]:
+    """
+    get_news와 같지만, 업스트림이 실패하거나 서킷 브레이커가 열려 있거나 대기열이 가득 찼거나
+    timeout초(요청 기한) 안에 결과가 오지 않으면 만료된 캐시 항목(stale)이 남아 있는 경우 그것으로 대신합니다.
+    기한이 지나도 업스트림 호출은 백그라운드에서 끝까지 진행해서 캐시를 채웁니다.
+    
+    Returns:
+        (CacheEntry, stale 여부)
+    
+    Raises:
+        DeadlineExceeded: 기한 초과이고 stale 항목도 없음
+    """
+    try:
+        if timeout is None:
+            return await get_news(query, display, start, sort), False
+        return await wait_with_deadline(get_news(query, display, start, sort), timeout), False
+    except (NaverAPIError, httpx.TransportError, DeadlineExceeded):
+        stale_entry = get_stale_entry(_search_cache_key(query, display, start, sort))
+        if stale_entry is None:
+            raise
+        print(f"⚠ 업스트림 실패 - 만료된 캐시로 응답: {query}")
+        return stale_entry, True
+
+
+def _is_search_miss(query: str, display: int, start: int, sort: str) -> bool:
+    """캐시에 없고 같은 키로 가져오는 중도 아니면 캐시 미스 (업스트림 호출이 새로 생김)"""
+    cache_key = _search_cache_key(query, display, start, sort)
+    return not is_cached(cache_key) and not _search_flight.in_flight(cache_key)
+
+
+# 순서대로 페이지를 넘기는 검색은 다음 페이지를 미리 가져옴 (업스트림 여유가 있을 때만)
+page_prefetcher = PagePrefetcher(
+    load=get_news,
+    is_cached=lambda query, display, start, sort: not _is_search_miss(query, display, start, sort),
+    headroom=rate_limiter.headroom,
+    upstream_open=lambda: breaker.is_open,
+    free_slots=upstream_admission.free_slots,
+)
+
+
+async def warm_search(query: str, display: int = 10, start: int = 1, sort: str = "date",
+                      refresh: bool = False) -> dict:
+    """
+    검색 결과를 미리 캐시에 채웁니다. (관리자 캐시 API의 일괄 예열용)
+    네이버 API 호출은 사용자 요청과 같은 경로(동시 요청 합치기, 호출 제한, 서킷 브레이커)를 거칩니다.
+    
+    Args:
+        refresh: True면 캐시에 있어도 새로 가져와서 교체 (교체 전까지 기존 항목으로 계속 응답)
+    
+    Returns:
+        {"query", "canonical_query", "status": "cached" | "warmed" | "failed", "error"}
+    """
+    canonical = canonical_query(query)
+    result = {"query": query, "canonical_query": canonical, "display": display, "start": start, "sort": sort}
+    if not canonical:
+        return dict(result, status="failed", error="빈 검색어")
+    
+    cache_key = _search_cache_key(canonical, display, start, sort)
+    if not refresh and is_cached(cache_key):
+        return dict(result, status="cached")
+    try:
+        await _search_flight.do(cache_key, lambda: _load_search(cache_key, canonical, display, start, sort))
+    except (NaverAPIError, httpx.HTTPError) as e:
+        return dict(result, status="failed", error=str(e) or type(e).__name__)
+    return dict(result, status="warmed")
+
+
+def _parse_fields(fields: Optional[str], compact: bool):
+    try:
+        return parse_fields(fields, compact)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _parse_deadline(x_deadline_ms: Optional[str]) -> float:
+    try:
+        return parse_deadline(x_deadline_ms)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms는 밀리초 단위 숫자여야 합니다.")
+
+
+def _circuit_open_error(e) -> HTTPException:
+    """서킷 브레이커가 열려 있거나(NaverCircuitOpen) 업스트림 대기열이 가득 참(UpstreamBusy) → 503"""
+    return HTTPException(
+        status_code=503,
+        detail="뉴스 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(int(e.retry_after + 0.999))}
+    )
 
 
 @router.get("/search")
@@ -44,7 +257,10 @@ async def search_news(
     query: str = Query(..., description="검색어"),
     display: int = Query(10, ge=1, le=100, description="검색 결과 개수 (1~100)"),
     start: int = Query(1, ge=1, description="검색 시작 위치 (1~1000)"),
-    sort: str = Query("date", regex="^(sim|date)$", description="정렬 옵션 (sim: 정확도순, date: 날짜순)")
+    sort: str = Query("date", regex="^(sim|date)$", description="정렬 옵션 (sim: 정확도순, date: 날짜순)"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 기사 필드 (title, originallink, link, description, pubDate)"),
+    compact: bool = Query(False, description="목록용 필드(title, originallink, pubDate)만 반환"),
+    x_deadline_ms: Optional[str] = Header(None, description="캐시 미스 때 업스트림을 기다릴 최대 시간 (밀리초)")
 ):
     """
     네이버 뉴스 API를 사용하여 뉴스를 검색합니다.
@@ -54,224 +270,512 @@ async def search_news(
     - **display**: 한 번에 표시할 검색 결과 개수 (기본값: 10, 최대: 100)
     - **start**: 검색 시작 위치 (기본값: 1)
     - **sort**: 정렬 옵션 (sim: 정확도순, date: 날짜순)
-    """
+    - **fields**, **compact**: 기사 필드 선택 (title/description은 태그와 HTML 엔티티가 정리된 일반 텍스트)
     
-    # 캐시 키 생성 (query, display, start, sort 조합)
-    cache_key = f"news:search:{hashlib.md5(f'{query}:{display}:{start}:{sort}'.encode()).hexdigest()}"
+    검색어는 캐시를 찾기 전에 정규화됩니다. (유니코드 NFKC, 공백, 대소문자, 별칭 → utils/query.py)
     
-    # 캐시에서 데이터 확인 (항상 먼저 캐시 확인)
-    cached_result = await get_cached_data(cache_key)
-    if cached_result:
-        print(f"✓ 캐시에서 반환: {query}")
-        return cached_result
+    응답에는 ETag/Last-Modified/Cache-Control 헤더가 붙고,
+    If-None-Match가 현재 캐시 내용과 같으면 본문 없이 304를 반환합니다.
     
-    # 캐시 미스: 실시간으로 API 호출
-    print(f"⚠ 캐시 미스 - 실시간 API 호출: {query}")
+    네이버 API가 실패하거나 서킷 브레이커가 열려 있으면 만료된 캐시가 있는 경우 그것을
+    X-Cache-Status: stale 헤더와 함께 반환하고, 없으면 429 안내 메시지나 503(Retry-After)을 반환합니다.
+    
+    클라이언트별 요청 수 제한(캐시 미스는 더 엄격)을 넘으면 429(Retry-After)를 반환합니다.
+    start를 display씩 늘려 가며 페이지를 넘기면 다음 페이지를 백그라운드에서 미리 가져옵니다.
     
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+    업스트림 호출 대기열이 가득 차면 바로 503(Retry-After)을 반환하고,
+    X-Deadline-Ms(없으면 REQUEST_DEADLINE_SECONDS) 안에 결과가 오지 않으면 stale 캐시나 504를 반환합니다.
+    """
+    if not is_configured():
         raise HTTPException(
             status_code=500,
             detail="네이버 API 인증 정보가 설정되지 않았습니다."
         )
     
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-    }
+    query = canonical_query(query)
+    if not query:
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
     
-    params = {
-        "query": query,
-        "display": display,
-        "start": start,
-        "sort": sort
-    }
+    selected_fields = _parse_fields(fields, compact)
+    deadline = _parse_deadline(x_deadline_ms)
+    request_limiter.hit(request, "search", misses=int(_is_search_miss(query, display, start, sort)))
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                NAVER_API_URL,
-                headers=headers,
-                params=params,
-                timeout=10.0
-            )
-            
-            if response.status_code == 429:
-                # 429 에러 시 캐시된 인기 검색어 중 유사한 것 반환
-                print(f"⚠ 429 에러 발생: {query}")
-                return {
-                    "lastBuildDate": datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0900"),
-                    "total": 0,
-                    "start": start,
-                    "display": 0,
-                    "items": [],
-                    "message": "일시적으로 요청이 많습니다. 잠시 후 다시 시도해주세요."
-                }
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"네이버 API 오류: {response.status_code}"
-                )
-            
-            data = response.json()
-            
-            # 2020년 이후 기사만 필터링
-            cutoff_date = datetime(2020, 1, 1)
-            filtered_items = []
-            
-            for item in data.get('items', []):
-                try:
-                    pub_date = datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S %z')
-                    if pub_date.replace(tzinfo=None) >= cutoff_date:
-                        filtered_items.append(item)
-                except Exception:
-                    filtered_items.append(item)
-            
-            data['items'] = filtered_items
-            data['display'] = len(filtered_items)
-            
-            # 캐시 저장 (10분)
-            await set_cached_data(cache_key, data, expire_seconds=600)
-            print(f"✓ API 호출 성공 및 캐시 저장: {query}")
-            
-            return data
-            
+        entry, stale = await get_news_or_stale(query, display, start, sort, timeout=deadline)
+    except NaverRateLimited:
+        # 429 에러 시 빈 결과와 안내 메시지 반환
+        print(f"⚠ 429 에러 발생: {query}")
+        return _rate_limited_body(start)
+    except (NaverCircuitOpen, UpstreamBusy) as e:
+        raise _circuit_open_error(e)
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="API 요청 시간 초과")
+    except NaverAPIError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="API 요청 시간 초과")
     except Exception as e:
         print(f"❌ API 호출 오류: {query} - {str(e)}")
         raise HTTPException(status_code=500, detail=f"API 호출 실패: {str(e)}")
+    
+    if not stale:
+        page_prefetcher.observe(query, display, start, sort)
+    return cached_response(request, projected_entry(entry, selected_fields), stale=stale)
+
+
+class BatchSearchQuery(BaseModel):
+    query: str = Field(..., min_length=1, description="검색어")
+    display: int = Field(10, ge=1, le=100, description="검색 결과 개수 (1~100)")
+    start: int = Field(1, ge=1, le=1000, description="검색 시작 위치 (1~1000)")
+    sort: str = Field("date", pattern="^(sim|date)$", description="정렬 옵션 (sim: 정확도순, date: 날짜순)")
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[BatchSearchQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+    fields: Optional[str] = Field(None, description="쉼표로 구분한 기사 필드 (모든 검색에 적용)")
+    compact: bool = Field(False, description="목록용 필드(title, originallink, pubDate)만 반환")
+
+
+@router.post("/search/batch")
+async def search_news_batch(
+    request: Request,
+    batch: BatchSearchRequest,
+    x_deadline_ms: Optional[str] = Header(None, description="캐시 미스 때 업스트림을 기다릴 최대 시간 (밀리초)")
+):
+    """
+    여러 검색을 한 번의 요청으로 처리합니다.
+    
+    - 검색어를 정규화한 뒤 같은 (query, display, start, sort) 조합은 한 번만 처리합니다
+    - 캐시에 있는 것은 캐시에서, 없는 것은 업스트림 호출 제한 안에서 동시에 가져옵니다
+    - 결과는 요청 순서대로, 검색마다 status(200/429/504 등)와 data 또는 error를 담아 반환합니다
+    - 업스트림 실패 시 만료된 캐시로 대신한 결과에는 stale: true가 붙습니다
+    - 요청 수 제한에서 캐시 미스는 캐시에 없는 검색어 수만큼 셉니다
+    - X-Deadline-Ms 기한은 배치 전체에 적용되고, 기한 안에 못 받은 검색은 504로 표시합니다
+    """
+    if not is_configured():
+        raise HTTPException(
+            status_code=500,
+            detail="네이버 API 인증 정보가 설정되지 않았습니다."
+        )
+    
+    selected_fields = _parse_fields(batch.fields, batch.compact)
+    deadline = _parse_deadline(x_deadline_ms)
+    
+    canonical = [canonical_query(q.query) for q in batch.queries]
+    if not all(canonical):
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    
+    # 정규화한 검색어 기준으로 중복 제거
+    unique = {}
+    for q, query in zip(batch.queries, canonical):
+        unique.setdefault(_search_cache_key(query, q.display, q.start, q.sort), (query, q))
+    
+    misses = sum(_is_search_miss(query, q.display, q.start, q.sort) for query, q in unique.values())
+    request_limiter.hit(request, "search-batch", misses=misses)
+    
+    outcomes = await asyncio.gather(
+        *(get_news_or_stale(query, q.display, q.start, q.sort, timeout=deadline) for query, q in unique.values()),
+        return_exceptions=True
+    )
+    by_key = dict(zip(unique.keys(), outcomes))
+    
+    results = []
+    for q, query in zip(batch.queries, canonical):
+        outcome = by_key[_search_cache_key(query, q.display, q.start, q.sort)]
+        result = {"query": q.query, "display": q.display, "start": q.start, "sort": q.sort}
+        if query != q.query:
+            result["canonical_query"] = query
+        
+        if isinstance(outcome, tuple):
+            entry, stale = outcome
+            # 캐시에 미리 인코딩된 본문을 그대로 끼워 넣음
+            result.update(status=200, data=orjson.Fragment(projected_entry(entry, selected_fields).body))
+            if stale:
+                result["stale"] = True
+        elif isinstance(outcome, NaverRateLimited):
+            result.update(status=429, data=_rate_limited_body(q.start), error=str(outcome))
+        elif isinstance(outcome, (NaverCircuitOpen, UpstreamBusy)):
+            result.update(status=503, error=str(outcome), retry_after=int(outcome.retry_after + 0.999))
+        elif isinstance(outcome, NaverAPIError):
+            result.update(status=outcome.status_code, error=str(outcome))
+        elif isinstance(outcome, (httpx.TimeoutException, DeadlineExceeded)):
+            result.update(status=504, error="API 요청 시간 초과")
+        else:
+            print(f"❌ API 호출 오류: {query} - {str(outcome)}")
+            result.update(status=500, error=f"API 호출 실패: {str(outcome)}")
+        results.append(result)
+    
+    # Fragment는 jsonable_encoder를 거치지 않도록 응답 객체를 직접 반환
+    return TimedORJSONResponse({"results": results})
 
 
 @router.get("/security")
 async def search_security_news(
     request: Request,
     display: int = Query(20, ge=1, le=100, description="검색 결과 개수"),
-    start: int = Query(1, ge=1, description="검색 시작 위치")
+    start: int = Query(1, ge=1, description="검색 시작 위치"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 기사 필드"),
+    compact: bool = Query(False, description="목록용 필드만 반환"),
+    x_deadline_ms: Optional[str] = Header(None, description="캐시 미스 때 업스트림을 기다릴 최대 시간 (밀리초)")
 ):
     """
     보안 관련 뉴스를 검색합니다.
     """
-    return await search_news(request, query="보안", display=display, start=start, sort="date")
+    return await search_news(request, query="보안", display=display, start=start, sort="date",
+                             fields=fields, compact=compact, x_deadline_ms=x_deadline_ms)
+
+
+@router.get("/article/{item_id}")
+async def get_article(item_id: str):
+    """
+    고정 ID로 기사 하나를 반환합니다. (검색/피드 결과의 id)
+    
+    최근 본 기사 색인에서 바로 찾으며 네이버 API는 호출하지 않습니다.
+    색인과 캐시 어디에도 없으면(오래됐거나 잘못된 ID) 404를 반환합니다.
+    """
+    item = article_index.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="기사를 찾을 수 없습니다.")
+    if "id" not in item:
+        # ID를 붙이기 전에 캐시된 기사
+        item = dict(item, id=article_id(item))
+    # 같은 ID의 기사 내용은 거의 바뀌지 않음
+    return TimedORJSONResponse(item, headers={"Cache-Control": f"max-age={CACHE_DURATION}"})
+
+
+@router.get("/upstream-status")
+async def get_upstream_status():
+    """네이버 API 서킷 브레이커 상태와 호출 제한 여유(0~1), 업스트림 동시 호출/대기열, 들어오는 요청 제한 현황"""
+    return {
+        "breaker": breaker.status(),
+        "rate_limit_headroom": round(rate_limiter.headroom(), 2),
+        "admission": upstream_admission.status(),
+        "request_limit": request_limiter.status(),
+        "prefetch": page_prefetcher.status()
+    }
 
 
 @router.get("/category-stats")
-async def get_category_stats():
+async def get_category_stats(request: Request):
     """
     각 카테고리별 오늘의 뉴스 기사 수를 반환합니다.
-    5분간 캐시됩니다.
+    10분간 캐시되며, ETag로 조건부 요청(304)을 지원합니다.
+    서킷 브레이커가 열려 있으면 만료된 통계(stale)를 대신 반환합니다.
     """
-    # Redis 캐시 키
-    cache_key = "news:category-stats"
-    
     # 캐시에서 데이터 확인
-    cached_result = await get_cached_data(cache_key)
-    if cached_result:
+    cached_entry = get_cache_entry(CATEGORY_STATS_CACHE_KEY)
+    request_limiter.hit(request, "category-stats", misses=int(cached_entry is None))
+    if cached_entry:
         print("카테고리 통계 캐시에서 반환")
-        return cached_result
+        return cached_response(request, cached_entry)
     
-    print("새로운 카테고리 통계 데이터 가져오는 중...")
+    try:
+        entry = await refresh_category_stats()
+    except NaverCircuitOpen as e:
+        stale_entry = get_stale_entry(CATEGORY_STATS_CACHE_KEY)
+        if stale_entry is None:
+            raise _circuit_open_error(e)
+        return cached_response(request, stale_entry, stale=True)
+    return cached_response(request, entry)
+
+
+def _stream_cache_key(category: dict) -> str:
+    return f"news:feed:stream:{category['id']}"
+
+
+async def _store_category_stream(category: dict, items: list, expire_seconds: int, shared: bool = False) -> list:
+    """검색 결과 items를 피드 스트림으로 변환해서 캐시에 저장합니다."""
+    stream = build_stream(_filter_recent_items(items), category["name"])
+    await set_cached_data(
+        _stream_cache_key(category),
+        {"category": category["name"], "items": stream},
+        expire_seconds=expire_seconds,
+        shared=shared,
+        tags=("endpoint:feed", f"category:{category['name']}", f"query:{canonical_query(category['keyword'])}")
+    )
+    return stream
+
+
+async def build_category_stream(category: dict, shared: bool = False) -> list:
+    """
+    카테고리 최신 기사를 가져와서 피드 스트림으로 캐시에 저장합니다.
+    
+    Args:
+        shared: True면 다른 워커 프로세스도 쓸 수 있게 공유 저장소에 게시
+    """
+    data = await fetch_news(category["keyword"], FEED_STREAM_SIZE, 1, "date")
+    return await _store_category_stream(category, data.get('items', []), FEED_STREAM_CACHE_SECONDS, shared)
+
+
+async def get_category_stream(category: dict) -> list:
+    """카테고리 스트림 (캐시 우선, 동시 캐시 미스는 한 번만 가져옴)"""
+    cache_key = _stream_cache_key(category)
+    cached_entry = get_cache_entry(cache_key)
+    if cached_entry:
+        return cached_entry.data["items"]
+    try:
+        return await _stream_flight.do(cache_key, lambda: build_category_stream(category))
+    except (NaverAPIError, httpx.TransportError):
+        # 업스트림 실패 시 만료된 스트림이라도 사용
+        stale_entry = get_stale_entry(cache_key)
+        if stale_entry is None:
+            raise
+        return stale_entry.data["items"]
+
+
+def cached_headlines(limit: int = 10) -> list:
+    """
+    캐시에 있는 피드 카테고리 스트림에서 최신 기사 (대시보드 스냅샷용, 네이버 API를 호출하지 않음)
+    만료됐더라도 stale 보관 중인 스트림은 사용합니다.
+    """
+    streams = []
+    for category in NEWS_CATEGORIES:
+        entry = get_stale_entry(_stream_cache_key(category))
+        if entry is not None:
+            streams.append(entry.data["items"])
+    items, _ = merge_streams(streams, limit)
+    return project_data({"items": items}, parse_fields(None, compact=True))["items"]
+
+
+def cached_category_stats() -> Optional[dict]:
+    """캐시에 있는 카테고리 통계 (대시보드 스냅샷용, 없으면 None - 집계는 news-cache-refresh 작업이 함)"""
+    entry = get_stale_entry(CATEGORY_STATS_CACHE_KEY)
+    return entry.data if entry is not None else None
+
+
+def _select_categories(settings: Optional[dict], names: Optional[str]) -> list:
+    """사용자 설정 또는 categories 파라미터(이름이나 id, 쉼표 구분)로 피드 카테고리 선택"""
+    if settings is not None:
+        return [c for c in NEWS_CATEGORIES if settings.get(c["name"], True)]
+    if names:
+        wanted = {name.strip() for name in names.split(",")}
+        return [c for c in NEWS_CATEGORIES if c["name"] in wanted or c["id"] in wanted]
+    return list(NEWS_CATEGORIES)
+
+
+@router.get("/feed")
+async def get_feed(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100, description="한 페이지 기사 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    categories: Optional[str] = Query(None, description="쉼표로 구분한 카테고리 이름 또는 id (로그인하지 않았을 때)"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 기사 필드 (category/timestamp는 항상 포함)"),
+    compact: bool = Query(False, description="목록용 필드(title, originallink, pubDate)만 반환"),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    사용자가 켠 카테고리의 기사를 최신순으로 합친 피드를 반환합니다.
+    
+    - 로그인하면 프로필의 category_settings를, 아니면 categories 파라미터(없으면 전체)를 사용합니다
+    - 카테고리 스트림은 모든 사용자가 같은 캐시를 쓰므로 비용은 사용자 수가 아니라 카테고리 수에 비례합니다
+    - 같은 기사(link)는 한 번만 나오며, next_cursor로 다음 페이지를 가져옵니다
+    - fields/compact로 기사 필드를 고를 수 있습니다
+    """
+    selected_fields = _parse_fields(fields, compact)
+    settings = None
+    if authorization and authorization.startswith("Bearer "):
+        try:
+            user_id, settings = await asyncio.to_thread(get_category_settings, authorization.replace("Bearer ", ""))
+            mark_verified(request, user_id)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"❌ 피드 카테고리 설정 조회 오류: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
     
-    categories = [
-        {"id": "cyber-security", "name": "사이버보안", "keyword": "사이버보안"},
-        {"id": "hacking", "name": "해킹/침해사고", "keyword": "해킹"},
-        {"id": "privacy", "name": "개인정보보호", "keyword": "개인정보"},
-        {"id": "it-trends", "name": "IT/보안 트렌드", "keyword": "IT 보안"},
-        {"id": "malware", "name": "악성코드/피싱", "keyword": "악성코드"},
-        {"id": "security-products", "name": "보안제품/서비스", "keyword": "보안제품"},
-        {"id": "authentication", "name": "인증·암호화", "keyword": "암호화"},
-        {"id": "network-security", "name": "네트워크보안", "keyword": "네트워크 보안"},
-        {"id": "policy", "name": "정책·제도", "keyword": "보안 정책"},
-        {"id": "data-security", "name": "데이터보안", "keyword": "데이터 보안"},
-    ]
-    
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+    selected = _select_categories(settings, categories)
+    
+    if selected and not is_configured():
         raise HTTPException(
             status_code=500,
             detail="네이버 API 인증 정보가 설정되지 않았습니다."
         )
     
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
+    misses = sum(
+        not is_cached(_stream_cache_key(c)) and not _stream_flight.in_flight(_stream_cache_key(c))
+        for c in selected
+    )
+    request_limiter.hit(request, "feed", misses=misses)
+    
+    outcomes = await asyncio.gather(
+        *(get_category_stream(category) for category in selected),
+        return_exceptions=True
+    )
+    
+    streams = []
+    unavailable = []
+    for category, outcome in zip(selected, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"⚠ 피드 스트림 가져오기 실패: {category['name']} - {str(outcome)}")
+            unavailable.append(category["name"])
+        else:
+            streams.append(outcome)
+    
+    try:
+        items, next_cursor = merge_streams(streams, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "categories": [c["name"] for c in selected],
+        "unavailable": unavailable,
+        "items": project_data({"items": items}, selected_fields)["items"],
+        "next_cursor": next_cursor
     }
+
+
+@router.get("/category-volume")
+async def get_category_volume(
+    request: Request,
+    start: Optional[datetime] = Query(None, description="시작 시각 (기본값: hour면 24시간 전, day면 7일 전)"),
+    end: Optional[datetime] = Query(None, description="끝 시각 (기본값: 현재)"),
+    interval: str = Query("hour", regex="^(hour|day)$", description="버킷 단위 (hour, day)"),
+    categories: Optional[str] = Query(None, description="쉼표로 구분한 카테고리 이름 또는 id (기본값: 전체)")
+):
+    """
+    카테고리별 기사 수 추이를 시간/일 단위로 반환합니다.
+    카테고리 통계 집계 때 미리 쌓아 둔 버킷만 읽으며 네이버 API는 호출하지 않습니다.
+    보관 기간(CATEGORY_VOLUME_RETENTION_DAYS, 기본값 30일)보다 오래된 구간은 0입니다.
+    """
+    request_limiter.hit(request, "category-volume")
+    await category_volume.sync()
+    
+    end_ts = end.timestamp() if end else datetime.now().timestamp()
+    if start:
+        start_ts = start.timestamp()
+    else:
+        start_ts = end_ts - (86400 if interval == "hour" else 7 * 86400)
+    if start_ts >= end_ts:
+        raise HTTPException(status_code=400, detail="start는 end보다 앞이어야 합니다.")
+    
+    start_hour = int(start_ts // 3600)
+    end_hour = int(end_ts // 3600) + 1
+    if interval == "day":
+        # 로컬 자정에 맞춤
+        day_start = datetime.fromtimestamp(start_hour * 3600).replace(hour=0)
+        start_hour = int(day_start.timestamp() // 3600)
+    start_hour = max(start_hour, end_hour - category_volume.retention_hours)
+    
+    selected = [c["name"] for c in _select_categories(None, categories)]
+    hourly = category_volume.query(selected, start_hour, end_hour)
+    labels = [datetime.fromtimestamp(hour * 3600) for hour in range(start_hour, end_hour)]
+    
+    if interval == "hour":
+        buckets = [label.strftime('%Y-%m-%dT%H:00') for label in labels]
+        series = hourly
+    else:
+        buckets = sorted({label.strftime('%Y-%m-%d') for label in labels})
+        index = {day: i for i, day in enumerate(buckets)}
+        series = {}
+        for category, counts in hourly.items():
+            daily = [0] * len(buckets)
+            for label, count in zip(labels, counts):
+                daily[index[label.strftime('%Y-%m-%d')]] += count
+            series[category] = daily
+    
+    return {
+        "interval": interval,
+        "buckets": buckets,
+        "series": series,
+        "totals": {category: sum(counts) for category, counts in series.items()}
+    }
+
+
+async def refresh_category_stats(shared: bool = False) -> CacheEntry:
+    """
+    카테고리별 오늘의 기사 수를 새로 집계하여 캐시에 저장합니다.
+    
+    Args:
+        shared: True면 다른 워커 프로세스도 쓸 수 있게 공유 저장소에 게시
+    """
+    print("새로운 카테고리 통계 데이터 가져오는 중...")
+    
+    if not is_configured():
+        raise HTTPException(
+            status_code=500,
+            detail="네이버 API 인증 정보가 설정되지 않았습니다."
+        )
     
     results = []
     # 오늘 날짜 (시작)
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    async with httpx.AsyncClient() as client:
-        for category in categories:
-            try:
-                today_count = 0
-                consecutive_old_articles = 0
-                max_consecutive_old = 50  # 연속으로 50개 오래된 기사가 나오면 중단
+    if breaker.is_open:
+        raise NaverCircuitOpen(max(1.0, breaker.retry_at - time.time()))
+    
+    # 이전에 게시된 시계열을 이어서 수집
+    await category_volume.sync()
+    
+    for category in NEWS_CATEGORIES:
+        try:
+            today_count = 0
+            crawled = []  # 시간 단위 시계열에 더할 기사 (발행 시각, link)
+            consecutive_old_articles = 0
+            max_consecutive_old = 50  # 연속으로 50개 오래된 기사가 나오면 중단
+            
+            # 여러 페이지를 가져와서 오늘 기사를 모두 카운트
+            for page in range(1, 6):  # 최대 500개 기사 확인 (100 * 5)
+                # 페이지 요청 사이 딜레이 추가
+                if page > 1:
+                    await asyncio.sleep(API_DELAY)
+                
+                try:
+                    data = await fetch_news(category["keyword"], 100, (page - 1) * 100 + 1, "date")
+                except NaverCircuitOpen:
+                    raise
+                except NaverAPIError:
+                    break
                 
-                # 여러 페이지를 가져와서 오늘 기사를 모두 카운트
-                for page in range(1, 6):  # 최대 500개 기사 확인 (100 * 5)
-                    # 페이지 요청 사이 딜레이 추가
-                    if page > 1:
-                        await asyncio.sleep(API_DELAY)
-                    
-                    params = {
-                        "query": category["keyword"],
-                        "display": 100,
-                        "start": (page - 1) * 100 + 1,
-                        "sort": "date"
-                    }
-                    
-                    response = await client.get(
-                        NAVER_API_URL,
-                        headers=headers,
-                        params=params,
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    items = data.get('items', [])
-                    
-                    if not items:
-                        break
-                    
-                    # 오늘 날짜 기사만 카운트
-                    page_today_count = 0
-                    for item in items:
-                        try:
-                            pub_date = datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S %z')
-                            pub_date_naive = pub_date.replace(tzinfo=None)
-                            
-                            if pub_date_naive >= today:
-                                page_today_count += 1
-                                consecutive_old_articles = 0  # 오늘 기사 발견 시 카운터 리셋
-                            else:
-                                consecutive_old_articles += 1
-                        except Exception:
-                            continue
-                    
-                    today_count += page_today_count
-                    print(f"{category['name']} - 페이지 {page}: 오늘 기사 {page_today_count}개, 총 {today_count}개")
-                    
-                    # 연속으로 오래된 기사만 나오면 중단
-                    if consecutive_old_articles >= max_consecutive_old:
-                        print(f"{category['name']}: 연속 {consecutive_old_articles}개 오래된 기사, 검색 중단")
-                        break
+                items = data.get('items', [])
                 
-                results.append({
-                    "category": category["name"],
-                    "count": today_count,
-                    "percentage": 0
-                })
+                if not items:
+                    break
                 
-            except Exception as e:
-                print(f"Error fetching {category['name']}: {str(e)}")
-                results.append({
-                    "category": category["name"],
-                    "count": 0,
-                    "percentage": 0
-                })
+                # 오늘 날짜 기사만 카운트
+                page_today_count = 0
+                for item in items:
+                    try:
+                        pub_date = datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S %z')
+                        pub_date_naive = pub_date.replace(tzinfo=None)
+                        crawled.append({"timestamp": pub_date.timestamp(), "link": item['link']})
+                        
+                        if pub_date_naive >= today:
+                            page_today_count += 1
+                            consecutive_old_articles = 0  # 오늘 기사 발견 시 카운터 리셋
+                        else:
+                            consecutive_old_articles += 1
+                    except Exception:
+                        continue
+                
+                today_count += page_today_count
+                print(f"{category['name']} - 페이지 {page}: 오늘 기사 {page_today_count}개, 총 {today_count}개")
+                
+                # 연속으로 오래된 기사만 나오면 중단
+                if consecutive_old_articles >= max_consecutive_old:
+                    print(f"{category['name']}: 연속 {consecutive_old_articles}개 오래된 기사, 검색 중단")
+                    break
+            
+            category_volume.ingest(category["name"], crawled)
+            
+            results.append({
+                "category": category["name"],
+                "count": today_count,
+                "percentage": 0
+            })
+            
+        except NaverCircuitOpen:
+            # 일부 카테고리만 0으로 집계된 통계를 캐시하지 않도록 중단
+            raise
+        except Exception as e:
+            print(f"Error fetching {category['name']}: {str(e)}")
+            results.append({
+                "category": category["name"],
+                "count": 0,
+                "percentage": 0
+            })
+
+    if shared:
+        await category_volume.publish()
     
     # 전체 합계 계산 및 퍼센티지 계산
     total = sum(r["count"] for r in results)
@@ -285,119 +789,69 @@ async def get_category_stats():
     }
     
     # 캐시 저장 (10분)
-    await set_cached_data(cache_key, response_data, expire_seconds=600)
-    
-    return response_data
+    return await set_cached_data(
+        CATEGORY_STATS_CACHE_KEY, response_data, expire_seconds=600, shared=shared, tags=("endpoint:category-stats",)
+    )
 
 
-async def fetch_and_cache_news(keyword: str, display: int = 10):
-    """
-    백그라운드에서 뉴스를 미리 가져와서 캐시에 저장합니다.
-    """
-    cache_key = f"news:search:{hashlib.md5(f'{keyword}:{display}:1:date'.encode()).hexdigest()}"
-    
-    # 이미 캐시에 있는지 확인
-    cached = await get_cached_data(cache_key)
-    if cached:
-        print(f"[백그라운드] 이미 캐시됨: {keyword}")
-        return
-    
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-        return
-    
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-    }
-    
-    params = {
-        "query": keyword,
-        "display": 100,
-        "start": 1,
-        "sort": "date"
-    }
-    
-    try:
-        await asyncio.sleep(API_DELAY)
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                NAVER_API_URL,
-                headers=headers,
-                params=params,
-                timeout=10.0
+def _polled_cache_seconds(result: PollResult) -> int:
+    """다음 폴링 전에 만료되지 않도록 (최소 10분)"""
+    return max(CACHE_REFRESH_INTERVAL, int(result.interval) + POLL_CACHE_GRACE_SECONDS)
+
+
+async def _cache_polled_keyword(result: PollResult):
+    """폴링 결과로 메인 페이지용 검색 캐시(최신 7개)를 갱신합니다. (키는 정규화한 검색어)"""
+    data = dict(result.data)
+    data['items'] = _filter_recent_items(result.data.get('items', []), limit=MAIN_PAGE_DISPLAY)
+    data['display'] = len(data['items'])
+    query = canonical_query(result.keyword)
+    await set_cached_data(
+        _search_cache_key(query, MAIN_PAGE_DISPLAY, 1, "date"),
+        data,
+        expire_seconds=_polled_cache_seconds(result),
+        shared=True,
+        tags=_search_tags(query)
+    )
+    if result.new_items:
+        print(f"[폴링] {result.keyword}: 새 기사 {len(result.new_items)}개, 다음 폴링 {result.interval:.0f}초 후")
+
+
+async def _update_polled_stream(result: PollResult):
+    """폴링한 키워드가 카테고리 키워드면 피드 스트림도 갱신합니다."""
+    for category in NEWS_CATEGORIES:
+        if category["keyword"] == result.keyword:
+            await _store_category_stream(
+                category, result.data.get('items', []), _polled_cache_seconds(result), shared=True
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # 2020년 이후 기사만 필터링
-                cutoff_date = datetime(2020, 1, 1)
-                filtered_items = []
-                
-                for item in data.get('items', []):
-                    try:
-                        pub_date = datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S %z')
-                        if pub_date.replace(tzinfo=None) >= cutoff_date:
-                            filtered_items.append(item)
-                            if len(filtered_items) >= display:
-                                break
-                    except Exception:
-                        filtered_items.append(item)
-                        if len(filtered_items) >= display:
-                            break
-                
-                data['items'] = filtered_items
-                data['display'] = len(filtered_items)
-                
-                # 캐시 저장
-                await set_cached_data(cache_key, data, expire_seconds=600)
-                print(f"[백그라운드] 캐시 저장 완료: {keyword}")
-            else:
-                print(f"[백그라운드] API 오류 {response.status_code}: {keyword}")
-                
-    except Exception as e:
-        print(f"[백그라운드] 오류: {keyword} - {str(e)}")
 
 
-async def background_cache_updater():
-    """
-    서버 시작 시 즉시 캐싱하고, 이후 10분마다 인기 검색어를 미리 캐싱합니다.
+# 인기 검색어 적응형 폴링 (작업 실행기가 리더 프로세스에서만 실행)
+keyword_poller = KeywordPoller(lambda keyword: fetch_news(keyword, FEED_STREAM_SIZE, 1, "date"), enabled=is_configured)
+keyword_poller.subscribe(_cache_polled_keyword)
+keyword_poller.subscribe(_update_polled_stream)
+for _keyword in POPULAR_KEYWORDS:
+    keyword_poller.track(_keyword)
+
+# 인기 검색어와 카테고리 키워드는 급상승 감지에서 항상 추적
+for _keyword in POPULAR_KEYWORDS + [category["keyword"] for category in NEWS_CATEGORIES]:
+    burst_detector.track(_keyword)
+
+
+async def refresh_news_cache():
     """
-    global _background_task_running
-    _background_task_running = True
+    카테고리 통계를 미리 캐싱합니다.
+    작업 실행기(utils/jobs.py)가 리더 프로세스에서만 10분마다 실행하며,
+    결과는 공유 저장소를 통해 다른 워커 프로세스에도 전달됩니다.
     
-    print("[백그라운드] 캐시 업데이터 시작")
+    인기 검색어와 피드 카테고리 스트림은 keyword_poller가 키워드별 간격으로 갱신합니다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[백그라운드] 카테고리 통계 갱신 시작 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"{'='*60}")
     
-    # 첫 실행: 서버 시작 1초 후 (즉시 시작)
-    await asyncio.sleep(1)
+    await refresh_category_stats(shared=True)
     
-    while _background_task_running:
-        try:
-            print(f"\n{'='*60}")
-            print(f"[백그라운드] 캐시 갱신 시작 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
-            
-            # 인기 검색어 캐싱 (각 검색어 사이 1초 대기)
-            for i, keyword in enumerate(POPULAR_KEYWORDS, 1):
-                print(f"[백그라운드] ({i}/{len(POPULAR_KEYWORDS)}) 처리 중: {keyword}")
-                await fetch_and_cache_news(keyword, display=7)
-                await asyncio.sleep(1)  # 각 검색어 사이 1초 대기
-            
-            # 카테고리 통계 캐싱
-            print(f"\n[백그라운드] 카테고리 통계 갱신 중...")
-            await get_category_stats()
-            
-            print(f"\n{'='*60}")
-            print(f"[백그라운드] ✅ 캐시 갱신 완료!")
-            print(f"[백그라운드] 다음 갱신: 10분 후 ({(datetime.now() + timedelta(minutes=10)).strftime('%H:%M:%S')})")
-            print(f"{'='*60}\n")
-            
-            # 10분 대기
-            await asyncio.sleep(600)
-            
-        except Exception as e:
-            print(f"[백그라운드] ❌ 오류 발생: {str(e)}")
-            print(f"[백그라운드] 1분 후 재시도...")
-            await asyncio.sleep(60)  # 오류 시 1분 후 재시도
-
+    print(f"\n{'='*60}")
+    print(f"[백그라운드] ✅ 캐시 갱신 완료!")
+    print(f"[백그라운드] 다음 갱신: 10분 후 ({(datetime.now() + timedelta(seconds=CACHE_REFRESH_INTERVAL)).strftime('%H:%M:%S')})")
+    print(f"{'='*60}\n")
@@ -1,32 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
 from collections import Counter
+import asyncio
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 
-load_dotenv()
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.cache import get_cache_entry, get_stale_entry, set_cached_data
+from utils.http_cache import cached_response
+from utils.singleflight import SingleFlight
+from utils.deps import get_supabase
+from utils.metrics import TimedORJSONResponse
+from utils.query import canonical_query
+from utils.bursts import burst_detector
+from app.routers.news_api import cached_headlines, cached_category_stats
 
-router = APIRouter(prefix="/api/stats", tags=["search_stats"])
-
-# Supabase 클라이언트 초기화
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-print(f"🔍 Supabase URL: {SUPABASE_URL[:30]}..." if SUPABASE_URL else "❌ SUPABASE_URL not set")
-print(f"🔍 Supabase Key: {'✅ Set' if SUPABASE_KEY else '❌ Not set'}")
-
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        print("✅ Supabase client initialized successfully")
-    except Exception as e:
-        print(f"❌ Failed to initialize Supabase: {str(e)}")
-else:
-    print("⚠️ Warning: SUPABASE_URL or SUPABASE_KEY not set. Stats features will be limited.")
+router = APIRouter(prefix="/api/stats", tags=["search_stats"], default_response_class=TimedORJSONResponse)
 
 class SearchLog(BaseModel):
     keyword: str
@@ -46,9 +39,15 @@ async def log_search(keyword: str):
     검색 키워드를 Supabase에 기록합니다.
     키워드가 이미 존재하면 count를 증가시키고, 없으면 새로 생성합니다.
     PostgreSQL 함수를 사용하여 원자적으로 처리합니다.
+    같은 검색어가 표기 차이로 따로 세지지 않도록 정규화한 검색어로 기록합니다.
     """
+    keyword = canonical_query(keyword)
+    if not keyword:
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    
     print(f"🔍 Attempting to log search keyword: {keyword}")
     
+    supabase = get_supabase()
     if not supabase:
         print("❌ Supabase client not initialized")
         return {"status": "error", "message": "Database not configured"}
@@ -69,28 +68,74 @@ async def log_search(keyword: str):
         traceback.print_exc()
         return {"status": "error", "keyword": keyword, "message": str(e)}
 
-@router.get("/popular-keywords")
-async def get_popular_keywords(limit: int = 10) -> List[KeywordStat]:
+# 인기 검색어 캐시 시간 (초) - 대시보드가 자주 다시 불러오므로 짧게 캐시
+POPULAR_KEYWORDS_CACHE_SECONDS = 60
+
+
+def _query_popular_keywords(supabase, limit: int) -> list:
+    """search_log에서 count 기준 상위 키워드"""
+    # count 기준 내림차순 정렬
+    response = supabase.table("search_log")\
+        .select("keyword, count")\
+        .order("count", desc=True)\
+        .limit(limit)\
+        .execute()
+    
+    # DB에서 받은 값을 그대로 사용 (응답 모델 검증은 캐시 경로에서 생략됨)
+    return [
+        {"keyword": row['keyword'], "count": row['count']}
+        for row in response.data
+    ]
+
+
+def _query_search_trend(supabase, days: int) -> list:
+    """날짜별 총 검색 횟수 (updated_at 기준, 빈 날짜는 0)"""
+    # 모든 키워드의 updated_at과 count 가져오기
+    response = supabase.table("search_log")\
+        .select("updated_at, count")\
+        .execute()
+    
+    # 날짜별 검색 수 집계 (updated_at 기준)
+    date_counts = Counter()
+    for row in response.data:
+        try:
+            # updated_at을 날짜로 변환
+            date = datetime.fromisoformat(row['updated_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d')
+            # 해당 날짜의 총 검색 수 누적
+            date_counts[date] += row['count']
+        except:
+            pass
+    
+    # 날짜별 데이터 생성 (빈 날짜도 포함)
+    trend_data = []
+    for i in range(days):
+        date = (datetime.now() - timedelta(days=days-1-i)).strftime('%Y-%m-%d')
+        trend_data.append({"date": date, "count": date_counts.get(date, 0)})
+    
+    return trend_data
+
+
+@router.get("/popular-keywords", response_model=List[KeywordStat])
+async def get_popular_keywords(request: Request, limit: int = 10):
     """
     인기 검색 키워드를 반환합니다.
+    1분간 캐시되며, ETag로 조건부 요청(304)을 지원합니다.
     """
+    supabase = get_supabase()
     if not supabase:
         return []
     
+    cache_key = f"stats:popular-keywords:{limit}"
+    cached_entry = get_cache_entry(cache_key)
+    if cached_entry:
+        return cached_response(request, cached_entry)
+    
     try:
-        # count 기준 내림차순 정렬
-        response = supabase.table("search_log")\
-            .select("keyword, count")\
-            .order("count", desc=True)\
-            .limit(limit)\
-            .execute()
-        
-        popular = [
-            KeywordStat(keyword=row['keyword'], count=row['count'])
-            for row in response.data
-        ]
-        
-        return popular
+        popular = _query_popular_keywords(supabase, limit)
+        entry = await set_cached_data(
+            cache_key, popular, expire_seconds=POPULAR_KEYWORDS_CACHE_SECONDS, tags=("endpoint:popular-keywords",)
+        )
+        return cached_response(request, entry)
     except Exception as e:
         print(f"Error fetching popular keywords: {str(e)}")
         return []
@@ -101,34 +146,12 @@ async def get_search_trend(days: int = 7) -> List[TrendData]:
     검색량 추이를 반환합니다.
     날짜별 총 검색 횟수(count 합계)를 반환합니다.
     """
+    supabase = get_supabase()
     if not supabase:
         return []
     
     try:
-        # 모든 키워드의 updated_at과 count 가져오기
-        response = supabase.table("search_log")\
-            .select("updated_at, count")\
-            .execute()
-        
-        # 날짜별 검색 수 집계 (updated_at 기준)
-        date_counts = Counter()
-        for row in response.data:
-            try:
-                # updated_at을 날짜로 변환
-                date = datetime.fromisoformat(row['updated_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                # 해당 날짜의 총 검색 수 누적
-                date_counts[date] += row['count']
-            except:
-                pass
-        
-        # 날짜별 데이터 생성 (빈 날짜도 포함)
-        trend_data = []
-        for i in range(days):
-            date = (datetime.now() - timedelta(days=days-1-i)).strftime('%Y-%m-%d')
-            count = date_counts.get(date, 0)
-            trend_data.append(TrendData(date=date, count=count))
-        
-        return trend_data
+        return [TrendData(**row) for row in _query_search_trend(supabase, days)]
     except Exception as e:
         print(f"Error fetching search trend: {str(e)}")
         import traceback
@@ -140,6 +163,7 @@ async def get_keyword_relations(keyword: str, limit: int = 20):
     """
     연관 키워드를 count 순으로 반환합니다.
     """
+    supabase = get_supabase()
     if not supabase:
         return []
     
@@ -161,3 +185,97 @@ async def get_keyword_relations(keyword: str, limit: int = 20):
     except Exception as e:
         print(f"Error fetching keyword relations: {str(e)}")
         return []
+
+
+@router.get("/bursts")
+async def get_bursts(limit: int = Query(20, ge=1, le=100, description="반환할 단어 수")):
+    """
+    기사 수가 갑자기 늘어난 보안 키워드/제목 단어를 반환합니다. (z-점수 내림차순)
+    이미 가져온 기사로만 계산하며 네이버 API는 호출하지 않습니다. (utils/bursts.py)
+    
+    - recent_count: 최근(BURST_SHORT_WINDOW, 기본값 1시간) 기사 수 추정치
+    - expected_count: 긴 기간(BURST_LONG_WINDOW, 기본값 24시간) 도착률로 기대한 기사 수
+    - z: (recent_count - expected_count) / sqrt(expected_count), BURST_Z_THRESHOLD 이상이면 급상승
+    - since: 급상승으로 처음 표시된 시각
+    """
+    return await burst_detector.report(limit)
+
+
+# 대시보드 스냅샷 (리더가 주기적으로 만들어서 게시, 조회는 미리 인코딩된 본문을 그대로 반환)
+DASHBOARD_CACHE_KEY = "stats:dashboard"
+DASHBOARD_REFRESH_INTERVAL = int(os.getenv("DASHBOARD_REFRESH_INTERVAL", "60"))
+# 리더가 잠시 멈춰도 다른 워커가 계속 응답할 수 있게 갱신 주기보다 길게 보관
+DASHBOARD_CACHE_SECONDS = DASHBOARD_REFRESH_INTERVAL * 3
+DASHBOARD_KEYWORDS = 30
+DASHBOARD_TREND_DAYS = 7
+DASHBOARD_HEADLINES = 10
+
+_dashboard_flight = SingleFlight()
+
+
+async def refresh_dashboard(shared: bool = False):
+    """
+    통계 대시보드 스냅샷을 만들어 캐시에 저장합니다.
+    인기 키워드, 카테고리별 기사 수, 검색량 추이, 최신 헤드라인, 급상승 키워드를 한 응답으로 묶습니다.
+    
+    - 카테고리 통계와 헤드라인은 이미 캐시에 있는 것만 사용 (네이버 API를 호출하지 않음)
+    - Supabase 조회는 이벤트 루프를 막지 않도록 스레드에서 실행하고, 실패하면 이전 스냅샷 값을 유지
+    - 내용이 바뀌지 않으면 ETag와 버전이 그대로라서 클라이언트의 304 재검증이 계속 통함
+    
+    Args:
+        shared: True면 다른 워커 프로세스도 쓸 수 있게 공유 저장소에 게시
+    """
+    previous = get_stale_entry(DASHBOARD_CACHE_KEY)
+    previous = previous.data if previous is not None else {}
+    popular = previous.get("popular_keywords", [])
+    trend = previous.get("trend", [])
+    
+    supabase = get_supabase()
+    if supabase:
+        try:
+            popular, trend = await asyncio.gather(
+                asyncio.to_thread(_query_popular_keywords, supabase, DASHBOARD_KEYWORDS),
+                asyncio.to_thread(_query_search_trend, supabase, DASHBOARD_TREND_DAYS),
+            )
+        except Exception as e:
+            print(f"[대시보드] Supabase 조회 실패, 이전 값 유지: {str(e)}")
+    
+    dashboard = {
+        "popular_keywords": popular,
+        "category_stats": cached_category_stats(),
+        "trend": trend,
+        "headlines": cached_headlines(DASHBOARD_HEADLINES),
+        "bursts": burst_detector.bursts(limit=10),
+    }
+    return await set_cached_data(
+        DASHBOARD_CACHE_KEY, dashboard, expire_seconds=DASHBOARD_CACHE_SECONDS,
+        shared=shared, tags=("endpoint:dashboard",)
+    )
+
+
+async def publish_dashboard():
+    """주기 작업용 (리더): 스냅샷을 만들어 공유 저장소에 게시"""
+    await refresh_dashboard(shared=True)
+
+
+@router.get("/dashboard")
+async def get_dashboard(request: Request):
+    """
+    통계 대시보드에 필요한 데이터를 한 번에 반환합니다.
+    
+    - popular_keywords: 인기 검색 키워드 상위 30개
+    - category_stats: 카테고리별 오늘의 기사 수 (/api/news/category-stats와 같은 형식, 아직 집계 전이면 null)
+    - trend: 최근 7일 검색량 추이
+    - headlines: 피드 카테고리 최신 기사 10개 (목록용 필드)
+    - bursts: 급상승 키워드 상위 10개
+    
+    리더 프로세스가 DASHBOARD_REFRESH_INTERVAL초(기본값 60)마다 미리 만들어 둔 스냅샷의
+    인코딩된 본문을 그대로 반환하며, ETag로 조건부 요청(304)을 지원합니다.
+    스냅샷이 없으면(시작 직후, 백그라운드 작업 비활성화) 한 번만 만들어서 반환합니다.
+    """
+    entry = get_cache_entry(DASHBOARD_CACHE_KEY)
+    if entry is None:
+        entry = await _dashboard_flight.do(DASHBOARD_CACHE_KEY, refresh_dashboard)
+    response = cached_response(request, entry)
+    response.headers["X-Snapshot-Version"] = str(entry.version)
+    return response
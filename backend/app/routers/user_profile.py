@@ -1,27 +1,54 @@
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
-from typing import Optional, Dict
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from typing import Optional, Dict, Tuple
+import sys
+from pathlib import Path
 
-load_dotenv()
+# utils 모듈을 임포트하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.deps import get_supabase, SUPABASE_SERVICE_ROLE_KEY
+from utils.metrics import TimedORJSONResponse
 
-router = APIRouter(prefix="/api/user", tags=["user_profile"])
+router = APIRouter(prefix="/api/user", tags=["user_profile"], default_response_class=TimedORJSONResponse)
 
-# Supabase 클라이언트 초기화
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE = os.getenv("SUPABASE_SERVICE_ROLE")  # RLS 우회를 위한 서비스 역할 키
+# 새 프로필의 카테고리 설정 (모두 켜짐)
+DEFAULT_CATEGORY_SETTINGS = {
+    "사이버보안": True,
+    "해킹/침해사고": True,
+    "개인정보보호": True,
+    "IT/보안 트렌드": True,
+    "악성코드/피싱": True,
+    "보안제품/서비스": True,
+    "인증·암호화": True,
+    "네트워크보안": True,
+    "정책·제도": True,
+    "데이터보안": True
+}
 
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_SERVICE_ROLE:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE)
-        print("✅ User Profile API: Supabase client initialized with SERVICE_ROLE")
-    except Exception as e:
-        print(f"❌ User Profile API: Failed to initialize Supabase: {str(e)}")
-else:
-    print(f"⚠️ SUPABASE_URL: {SUPABASE_URL is not None}, SUPABASE_SERVICE_ROLE: {SUPABASE_SERVICE_ROLE is not None}")
+def get_category_settings(token: str) -> Tuple[str, Dict[str, bool]]:
+    """
+    토큰 사용자의 카테고리 설정을 가져옵니다. (프로필이 없으면 기본값)
+    Supabase 클라이언트가 동기 방식이므로 async 코드에서는 스레드에서 호출하세요.
+    
+    Returns:
+        (검증된 사용자 ID, 카테고리 설정)
+    """
+    supabase = get_supabase(SUPABASE_SERVICE_ROLE_KEY)  # RLS 우회를 위한 서비스 역할 키
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+    
+    user = supabase.auth.get_user(token)
+    if not user or not user.user:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    response = supabase.table("user_profiles")\
+        .select("category_settings")\
+        .eq("id", user.user.id)\
+        .execute()
+    
+    if not response.data or not response.data[0].get("category_settings"):
+        return user.user.id, dict(DEFAULT_CATEGORY_SETTINGS)
+    return user.user.id, response.data[0]["category_settings"]
 
 class CategorySettings(BaseModel):
     category_settings: Dict[str, bool]
@@ -34,6 +61,7 @@ async def get_user_profile(authorization: Optional[str] = Header(None)):
     """
     사용자 프로필 정보를 가져옵니다.
     """
+    supabase = get_supabase(SUPABASE_SERVICE_ROLE_KEY)  # RLS 우회를 위한 서비스 역할 키
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
@@ -70,18 +98,7 @@ async def get_user_profile(authorization: Optional[str] = Header(None)):
                     "id": user_id,
                     "email": user_email,
                     "name": user_name,
-                    "category_settings": {
-                        "사이버보안": True,
-                        "해킹/침해사고": True,
-                        "개인정보보호": True,
-                        "IT/보안 트렌드": True,
-                        "악성코드/피싱": True,
-                        "보안제품/서비스": True,
-                        "인증·암호화": True,
-                        "네트워크보안": True,
-                        "정책·제도": True,
-                        "데이터보안": True
-                    },
+                    "category_settings": dict(DEFAULT_CATEGORY_SETTINGS),
                     "email_notification": True,
                     "comments": []
                 }
@@ -114,6 +131,7 @@ async def update_category_settings(
     """
     카테고리 설정을 업데이트합니다.
     """
+    supabase = get_supabase(SUPABASE_SERVICE_ROLE_KEY)  # RLS 우회를 위한 서비스 역할 키
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
@@ -153,6 +171,7 @@ async def update_email_notification(
     """
     이메일 알림 설정을 업데이트합니다.
     """
+    supabase = get_supabase(SUPABASE_SERVICE_ROLE_KEY)  # RLS 우회를 위한 서비스 역할 키
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
@@ -189,6 +208,7 @@ async def get_user_comments(authorization: Optional[str] = Header(None)):
     """
     사용자가 작성한 댓글 목록을 가져옵니다.
     """
+    supabase = get_supabase(SUPABASE_SERVICE_ROLE_KEY)  # RLS 우회를 위한 서비스 역할 키
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
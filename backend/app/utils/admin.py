@@ -0,0 +1,21 @@
+"""
+관리자 API 인증
+X-Admin-Token 헤더가 ADMIN_API_TOKEN 환경변수와 같아야 합니다.
+ADMIN_API_TOKEN이 설정되지 않으면 관리자 API는 모두 꺼져 있습니다. (403)
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """관리자 토큰 확인 (라우트 의존성으로 사용)"""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다. (ADMIN_API_TOKEN 미설정)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
@@ -0,0 +1,165 @@
+"""
+업스트림 호출 입장 제어(admission control)와 요청 기한(deadline)
+업스트림이 느려져도 대기 중인 호출(소켓, 메모리)이 끝없이 쌓이지 않도록
+
+- 동시에 진행하는 업스트림 호출은 UPSTREAM_MAX_CONCURRENCY개까지,
+  기다리는 호출은 UPSTREAM_MAX_QUEUE개까지만 받고 그 이상은 바로 거절
+- 줄에서 UPSTREAM_QUEUE_TIMEOUT초 넘게 기다리면 거절
+- 클라이언트는 X-Deadline-Ms 헤더(밀리초)로 서버가 업스트림을 기다려 줄 최대 시간을 정할 수 있음
+  (REQUEST_DEADLINE_SECONDS보다 길게는 못 정함). 기한이 지나면 응답은 바로 돌려주고,
+  진행 중인 업스트림 호출은 백그라운드에서 끝까지 진행해서 캐시를 채움 (같은 검색을 기다리는 다른 요청도 그대로 받음)
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Optional, Set
+
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16"))
+UPSTREAM_MAX_QUEUE = int(os.getenv("UPSTREAM_MAX_QUEUE", "32"))
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "2"))
+# 요청 하나가 업스트림을 기다리는 최대 시간 (초, X-Deadline-Ms가 없을 때의 기본값이자 상한)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "10"))
+# 이보다 짧은 기한은 이 값으로 올림 (캐시 히트도 못 할 만큼 짧은 값 방지)
+_MIN_DEADLINE_SECONDS = 0.05
+
+
+class AdmissionRejected(Exception):
+    """동시 호출 수와 대기 줄이 가득 찼거나 줄에서 너무 오래 기다림"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"업스트림 호출 대기열 초과 ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """요청 기한 안에 업스트림 결과가 오지 않음"""
+
+
+class AdmissionController:
+    """동시 실행 수 제한 + 길이와 대기 시간이 제한된 대기 줄"""
+
+    def __init__(
+        self,
+        max_concurrency: int = UPSTREAM_MAX_CONCURRENCY,
+        max_queue: int = UPSTREAM_MAX_QUEUE,
+        queue_timeout: float = UPSTREAM_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        # 이벤트 루프가 생긴 뒤 처음 쓸 때 만듦
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.stats = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0, "max_waiting": 0}
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        업스트림 호출 자리 하나를 잡습니다.
+
+        Raises:
+            AdmissionRejected: 대기 줄이 가득 찼거나 queue_timeout 안에 자리가 나지 않음
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.stats["rejected_full"] += 1
+                raise AdmissionRejected("full", self.queue_timeout)
+            self.waiting += 1
+            self.stats["queued"] += 1
+            self.stats["max_waiting"] = max(self.stats["max_waiting"], self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats["rejected_timeout"] += 1
+                raise AdmissionRejected("timeout", self.queue_timeout) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.stats["admitted"] += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def free_slots(self) -> int:
+        """지금 바로 쓸 수 있는 호출 자리 수 (기다리는 호출이 있으면 그만큼 음수 쪽으로)"""
+        return self.max_concurrency - self.active - self.waiting
+
+    def status(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            **self.stats,
+        }
+
+
+def parse_deadline(value: Optional[str]) -> float:
+    """
+    X-Deadline-Ms 헤더 값을 기다릴 시간(초)으로 바꿉니다. (없으면 REQUEST_DEADLINE_SECONDS)
+
+    Raises:
+        ValueError: 숫자가 아님
+    """
+    if value is None or not value.strip():
+        return REQUEST_DEADLINE_SECONDS
+    seconds = float(value) / 1000
+    if seconds != seconds:
+        raise ValueError("X-Deadline-Ms는 숫자여야 합니다.")
+    return min(REQUEST_DEADLINE_SECONDS, max(_MIN_DEADLINE_SECONDS, seconds))
+
+
+# 기한이 지나 응답과 분리된 작업 (끝날 때까지 참조를 잡아 둠)
+_detached: Set[asyncio.Task] = set()
+
+
+def _finish_detached(task: asyncio.Task):
+    _detached.discard(task)
+    if not task.cancelled():
+        # 기다리는 쪽이 없으므로 "exception was never retrieved" 경고 방지
+        task.exception()
+
+
+def _detach(task: asyncio.Task):
+    _detached.add(task)
+    task.add_done_callback(_finish_detached)
+
+
+async def wait_with_deadline(aw: Awaitable, timeout: float):
+    """
+    aw를 최대 timeout초 기다립니다. 기한이 지나도 작업은 취소하지 않고 백그라운드에서 끝까지 실행합니다.
+
+    Raises:
+        DeadlineExceeded: 기한 안에 끝나지 않음
+    """
+    task = asyncio.ensure_future(aw)
+    started = time.monotonic()
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.CancelledError:
+        # 클라이언트 연결이 끊긴 경우에도 작업은 끝까지 실행
+        if not task.done():
+            _detach(task)
+        raise
+    except asyncio.TimeoutError:
+        if task.done():
+            # 작업 자체가 TimeoutError로 끝남 (기한 초과가 아님)
+            return task.result()
+        _detach(task)
+        raise DeadlineExceeded(f"요청 기한 초과 ({time.monotonic() - started:.1f}초)") from None
+
+
+# 프로세스 전체에서 공유하는 업스트림 입장 제어
+upstream_admission = AdmissionController()
@@ -0,0 +1,86 @@
+"""
+기사 ID와 ID → 기사 색인
+기사마다 originallink(없으면 link)를 정규화한 URL의 해시로 고정 ID를 붙이고,
+최근 본 기사들을 ID로 바로 찾을 수 있게 색인해 둡니다. (상세 화면에서 다시 검색하지 않음)
+
+- ID는 내용에서 나오므로 워커 프로세스나 재시작과 상관없이 같은 기사는 같은 ID
+- 색인은 최근 사용 순서(OrderedDict)로 ARTICLE_INDEX_SIZE개까지 보관
+- 색인에 없으면 로컬 캐시(검색 결과, 피드 스트림, 복원한 스냅샷, 다른 워커가 게시한 항목)를 한 번 훑어서 채움
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from utils.cache import iter_cache_entries
+
+# 색인에 보관하는 최대 기사 수
+ARTICLE_INDEX_SIZE = int(os.getenv("ARTICLE_INDEX_SIZE", "20000"))
+# 캐시를 다시 훑기 전 최소 간격 (초) - 없는 ID 요청이 반복돼도 매번 훑지 않도록
+_RESCAN_INTERVAL = 5.0
+
+
+def normalize_url(url: str) -> str:
+    """스킴/호스트 소문자, 프래그먼트와 경로 끝 / 제거"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    path = parts.path.rstrip("/") if parts.path != "/" else ""
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def article_id(item: dict) -> str:
+    """기사 고정 ID (정규화한 originallink, 없으면 link의 64비트 해시, 16자리 16진수)"""
+    url = item.get("originallink") or item.get("link") or ""
+    return hashlib.blake2b(normalize_url(url).encode(), digest_size=8).hexdigest()
+
+
+class ArticleIndex:
+    """ID → 기사 (최근 사용 순서, 크기 제한)"""
+
+    def __init__(self, max_size: int = ARTICLE_INDEX_SIZE):
+        self.max_size = max_size
+        self._articles: "OrderedDict[str, dict]" = OrderedDict()
+        self._scanned_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def add(self, items: Iterable[dict]):
+        for item in items:
+            item_id = item.get("id") or article_id(item)
+            self._articles[item_id] = item
+            self._articles.move_to_end(item_id)
+        while len(self._articles) > self.max_size:
+            self._articles.popitem(last=False)
+
+    def get(self, item_id: str) -> Optional[dict]:
+        """ID로 기사를 찾습니다. 색인에 없으면 로컬 캐시를 훑어서 다시 찾습니다."""
+        item = self._articles.get(item_id)
+        if item is None and self._rescan():
+            item = self._articles.get(item_id)
+        if item is not None:
+            self._articles.move_to_end(item_id)
+        return item
+
+    def _rescan(self) -> bool:
+        now = time.monotonic()
+        if now - self._scanned_at < _RESCAN_INTERVAL:
+            return False
+        self._scanned_at = now
+        for entry in iter_cache_entries():
+            data = entry.data
+            if isinstance(data, dict) and isinstance(data.get("items"), list):
+                self.add(item for item in data["items"] if isinstance(item, dict) and "link" in item)
+        return True
+
+    def status(self) -> dict:
+        return {"size": len(self._articles), "max_size": self.max_size}
+
+
+# 프로세스 전체에서 공유하는 기사 색인
+article_index = ArticleIndex()
@@ -0,0 +1,283 @@
+"""
+보안 키워드 급상승 감지 (스트리밍 EWMA)
+네이버 API에서 새로 들어온 기사마다 단어별 도착률 추정치(EWMA)를 갱신하고,
+짧은 기간 도착률이 긴 기간 기준선보다 z-점수 BURST_Z_THRESHOLD 이상 높으면 급상승으로 표시합니다.
+(다시 검색하지 않고 이미 가져온 기사만으로 판단)
+
+- 단어: 추적 키워드(인기 검색어, 카테고리 키워드)와 제목에서 뽑은 단어 (CVE 번호 포함)
+- 단어마다 [기준 시각, 짧은 EWMA, 긴 EWMA] 세 값만 보관하고 기사 하나당 상수 시간에 갱신
+  (발행 시각 순서가 뒤바뀐 기사는 기준 시각까지 감쇠한 만큼만 더함)
+- 제목 단어는 최근 갱신 순서로 BURST_MAX_TERMS개까지만 보관 (추적 키워드는 항상 보관)
+- 같은 기사는 ID로 한 번만 셈 (최근 BURST_SEEN_SIZE개 기억)
+- z-점수: 짧은 기간 기사 수를 긴 기간 도착률로 기대한 수(포아송)와 비교
+  (관측 기간이 짧을 때는 EWMA를 관측 기간으로 보정해서 시작 직후 모든 단어가 급상승으로 보이지 않게 함)
+- 리더가 주기적으로 급상승 목록을 공유 저장소에 게시하고, 다른 워커는 게시된 목록을 반환
+"""
+
+import asyncio
+import calendar
+import math
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.query import normalize_query
+from utils.shared_store import read_state_if_changed, write_state
+
+BURST_SHORT_WINDOW = float(os.getenv("BURST_SHORT_WINDOW", "3600"))
+BURST_LONG_WINDOW = float(os.getenv("BURST_LONG_WINDOW", "86400"))
+BURST_Z_THRESHOLD = float(os.getenv("BURST_Z_THRESHOLD", "3.0"))
+# 짧은 기간 기사 수가 이보다 적으면 급상승으로 보지 않음
+BURST_MIN_COUNT = float(os.getenv("BURST_MIN_COUNT", "5"))
+BURST_MAX_TERMS = int(os.getenv("BURST_MAX_TERMS", "20000"))
+BURST_SEEN_SIZE = int(os.getenv("BURST_SEEN_SIZE", "50000"))
+# 기준선이 거의 0인 단어의 z-점수가 무한히 커지지 않도록 하는 최소 기대 기사 수
+_MIN_EXPECTED = 0.5
+# 긴 기간의 3배보다 오래된 기사는 기여가 거의 없으므로 세지 않음
+_MAX_AGE = 3 * BURST_LONG_WINDOW
+_MAX_TITLE_TERMS = 20
+
+_STATE_NAME = "bursts"
+
+# 제목 단어: CVE 번호, 또는 두 글자 이상의 한글/영문/숫자
+_TERM_RE = re.compile(r"cve-\d{4}-\d{4,7}|[^\W_]{2,}")
+# 단어 끝의 조사 (긴 것부터)
+_JOSA = ("에서", "에게", "으로", "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "와", "과")
+_STOPWORDS = frozenset({
+    "기자", "뉴스", "속보", "단독", "종합", "포토", "영상", "오늘", "관련", "위해", "대한", "통해", "이번",
+    "the", "and", "for", "with", "from", "that", "this", "are", "was",
+})
+
+
+def extract_terms(title: str) -> Set[str]:
+    """제목에서 급상승 감지용 단어를 뽑습니다. (정규화, 조사 제거, 불용어/숫자 제외)"""
+    terms = set()
+    for token in _TERM_RE.findall(normalize_query(title)):
+        if token.endswith(_JOSA):
+            for josa in _JOSA:
+                if token.endswith(josa) and len(token) > len(josa) + 1:
+                    token = token[:-len(josa)]
+                    break
+        if token in _STOPWORDS or token.isdigit():
+            continue
+        terms.add(token)
+        if len(terms) >= _MAX_TITLE_TERMS:
+            break
+    return terms
+
+
+_MONTHS = {name: i for i, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1
+)}
+
+
+def _event_time(item: dict, now: float) -> float:
+    """
+    기사 발행 시각 (없거나 미래면 현재 시각)
+    pubDate 형식이 "Mon, 19 Oct 2026 10:00:00 +0900"로 고정이라 strptime 대신 직접 나눔 (기사마다 호출)
+    """
+    try:
+        _, day, month, year, clock, zone = item["pubDate"].split()
+        hour, minute, second = clock.split(":")
+        offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[0] == "-" else 1)
+        published = calendar.timegm(
+            (int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
+        ) - offset
+    except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+        return now
+    return min(published, now)
+
+
+class BurstDetector:
+    """단어별 짧은/긴 기간 EWMA 도착률과 급상승 표시"""
+
+    def __init__(
+        self,
+        short_window: float = BURST_SHORT_WINDOW,
+        long_window: float = BURST_LONG_WINDOW,
+        z_threshold: float = BURST_Z_THRESHOLD,
+        min_count: float = BURST_MIN_COUNT,
+        max_terms: int = BURST_MAX_TERMS,
+        seen_size: int = BURST_SEEN_SIZE,
+    ):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.max_terms = max_terms
+        self.seen_size = seen_size
+        # 단어 → [기준 시각, 짧은 EWMA, 긴 EWMA] (도착률, 기사/초)
+        self._terms: "OrderedDict[str, list]" = OrderedDict()
+        self._tracked: Dict[str, list] = {}
+        # 추적 키워드 (공백을 뺀 형태 → 표시용 정규화 형태)
+        self._tracked_compact: Dict[str, str] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # 급상승으로 표시된 단어 → 처음 표시된 시각
+        self._bursting: Dict[str, float] = {}
+        # 가장 오래된 기사 시각 (EWMA 관측 기간 보정용)
+        self._first_at: Optional[float] = None
+        self.articles = 0
+        self.updates = 0
+        # 관측 기간 보정 계수 (observe 호출마다 한 번 계산)
+        self._short_correction = 1.0
+        self._long_correction = 1.0
+        self._publisher = False
+        self._shared: Optional[dict] = None
+        self._state_mtime = 0.0
+
+    def track(self, keyword: str):
+        """항상 보관하고 기사 본문(제목+요약)에 들어 있는지로 세는 추적 키워드"""
+        term = normalize_query(keyword)
+        if term and term not in self._tracked:
+            self._tracked[term] = self._terms.pop(term, None) or [0.0, 0.0, 0.0]
+            self._tracked_compact[term.replace(" ", "")] = term
+
+    def observe(self, items: Iterable[dict], now: Optional[float] = None) -> int:
+        """
+        검색 결과 기사들로 단어별 도착률을 갱신합니다. (처음 본 기사만)
+
+        Returns:
+            새로 센 기사 수
+        """
+        now = time.time() if now is None else now
+        self._set_corrections(now)
+        counted = 0
+        for item in items:
+            item_id = item.get("id") or item.get("link")
+            if not item_id or item_id in self._seen:
+                continue
+            self._seen[item_id] = None
+            if len(self._seen) > self.seen_size:
+                self._seen.popitem(last=False)
+
+            t = _event_time(item, now)
+            if now - t > _MAX_AGE:
+                continue
+            if self._first_at is None or t < self._first_at:
+                self._first_at = t
+                self._set_corrections(now)
+            title = item.get("title", "")
+            terms = extract_terms(title)
+            for term in terms:
+                self._update(term, t, now)
+            if self._tracked_compact:
+                text = normalize_query(f"{title} {item.get('description', '')}").replace(" ", "")
+                for compact, term in self._tracked_compact.items():
+                    # 제목 단어로 이미 센 추적 키워드는 한 기사에서 두 번 세지 않음
+                    if compact in text and term not in terms:
+                        self._update(term, t, now)
+            counted += 1
+        self.articles += counted
+        return counted
+
+    def _update(self, term: str, t: float, now: float):
+        state = self._tracked.get(term)
+        if state is None:
+            state = self._terms.get(term)
+            if state is None:
+                state = self._terms[term] = [t, 0.0, 0.0]
+                if len(self._terms) > self.max_terms:
+                    evicted, _ = self._terms.popitem(last=False)
+                    self._bursting.pop(evicted, None)
+            else:
+                self._terms.move_to_end(term)
+
+        if t >= state[0]:
+            elapsed = t - state[0]
+            state[0] = t
+            state[1] = state[1] * math.exp(-elapsed / self.short_window) + 1 / self.short_window
+            state[2] = state[2] * math.exp(-elapsed / self.long_window) + 1 / self.long_window
+        else:
+            # 늦게 도착한 과거 기사: 기준 시각까지 감쇠한 만큼만 더함
+            age = state[0] - t
+            state[1] += math.exp(-age / self.short_window) / self.short_window
+            state[2] += math.exp(-age / self.long_window) / self.long_window
+        self.updates += 1
+
+        # 감쇠 전 기사 수로 먼저 걸러서 대부분의 갱신은 z-점수를 계산하지 않음
+        if term not in self._bursting and state[1] * self._short_correction * self.short_window >= self.min_count:
+            z, count, _ = self._score(state, now)
+            if z >= self.z_threshold and count >= self.min_count:
+                self._bursting[term] = now
+                print(f"[급상승] {term}: 최근 {count:.1f}건 (z={z:.1f})")
+
+    def _set_corrections(self, now: float):
+        """관측 기간이 창보다 짧으면 EWMA가 작게 나오므로 나눠 줄 보정 계수"""
+        span = max(1.0, now - (self._first_at if self._first_at is not None else now))
+        self._short_correction = 1 / -math.expm1(-span / self.short_window)
+        self._long_correction = 1 / -math.expm1(-span / self.long_window)
+
+    def _score(self, state: list, now: float):
+        """(z-점수, 짧은 기간 기사 수, 기대 기사 수) - now 시점으로 감쇠해서 계산"""
+        elapsed = max(0.0, now - state[0])
+        short = state[1] * math.exp(-elapsed / self.short_window) * self._short_correction
+        long = state[2] * math.exp(-elapsed / self.long_window) * self._long_correction
+        count = short * self.short_window
+        expected = max(long * self.short_window, _MIN_EXPECTED)
+        return (count - expected) / math.sqrt(expected), count, expected
+
+    def bursts(self, limit: int = 20, now: Optional[float] = None) -> List[dict]:
+        """지금 급상승 중인 단어 (z-점수 내림차순). 기준 아래로 내려간 단어는 표시를 지움"""
+        now = time.time() if now is None else now
+        self._set_corrections(now)
+        result = []
+        for term, since in list(self._bursting.items()):
+            state = self._tracked.get(term) or self._terms.get(term)
+            if state is None:
+                del self._bursting[term]
+                continue
+            z, count, expected = self._score(state, now)
+            if z < self.z_threshold or count < self.min_count:
+                del self._bursting[term]
+                continue
+            result.append({
+                "term": term,
+                "tracked": term in self._tracked,
+                "z": round(z, 2),
+                "recent_count": round(count, 1),
+                "expected_count": round(expected, 2),
+                "since": since,
+            })
+        result.sort(key=lambda burst: burst["z"], reverse=True)
+        return result[:limit]
+
+    def status(self) -> dict:
+        return {
+            "short_window_seconds": self.short_window,
+            "long_window_seconds": self.long_window,
+            "z_threshold": self.z_threshold,
+            "min_count": self.min_count,
+            "terms": len(self._terms),
+            "max_terms": self.max_terms,
+            "tracked": len(self._tracked),
+            "articles": self.articles,
+            "updates": self.updates,
+        }
+
+    async def publish(self):
+        """급상승 목록을 공유 저장소에 게시합니다. (리더, 주기 작업)"""
+        self._publisher = True
+        try:
+            state = {"updated_at": time.time(), "bursts": self.bursts(limit=100), **self.status()}
+            self._state_mtime = await asyncio.to_thread(write_state, _STATE_NAME, state)
+        except OSError as e:
+            print(f"[급상승] 게시 실패: {str(e)}")
+
+    async def report(self, limit: int = 20) -> dict:
+        """
+        급상승 목록 (API 응답용)
+        리더가 게시한 목록이 있으면 그것을, 없으면(리더이거나 단일 프로세스) 이 프로세스의 계산 결과를 반환
+        """
+        if not self._publisher:
+            state, self._state_mtime = await asyncio.to_thread(read_state_if_changed, _STATE_NAME, self._state_mtime)
+            if state is not None:
+                self._shared = state
+            if self._shared is not None:
+                return dict(self._shared, bursts=self._shared.get("bursts", [])[:limit], source="leader")
+        return {"updated_at": time.time(), "bursts": self.bursts(limit), **self.status(), "source": "local"}
+
+
+# 프로세스 전체에서 공유하는 급상승 감지기
+burst_detector = BurstDetector()
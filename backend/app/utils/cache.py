@@ -1,12 +1,246 @@
-import json
-from typing import Optional
-from datetime import datetime, timedelta
+import asyncio
+import time
+import hashlib
+import mmap
+import os
+import orjson
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import OrderedDict
 
-# 메모리 캐시
+from utils.shared_store import (
+    SHARED_STATE_DIR, EMPTY_MARK, publish_entry, read_updated_entries,
+    publish_invalidation, read_invalidations_if_changed, remove_entries,
+)
+from utils.metrics import timed
+
+# 메모리 캐시 (키 -> CacheEntry, LRU 순서)
 _memory_cache = OrderedDict()
-_cache_timestamps = {}
 MAX_CACHE_SIZE = 200  # 최대 캐시 항목 수 증가 (100 -> 200)
+# 만료된 항목도 이 시간(초) 동안은 지우지 않고 남겨 둠 (업스트림 장애 시 stale 응답용)
+CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", "86400"))
+# 검색 결과/피드 스트림의 기사를 항목끼리 공유하는 기사 풀 사용 여부
+CACHE_ARTICLE_POOL = os.getenv("CACHE_ARTICLE_POOL", "true").lower() == "true"
+
+
+class _PooledArticle:
+    """기사 풀의 기사 하나 (기사 dict, 인코딩한 JSON, 이 기사를 쓰는 캐시 항목 수)"""
+    __slots__ = ("key", "item", "encoded", "refs")
+    
+    def __init__(self, key: tuple, item: dict, encoded: bytes):
+        self.key = key
+        self.item = item
+        self.encoded = encoded
+        self.refs = 0
+
+
+# 기사 풀 ((link, 인코딩한 기사) -> _PooledArticle)
+# 같은 기사가 "보안", "데이터 보안", "개인정보" 검색과 display 10/20/100 결과에 함께 나와도 한 번만 보관
+# (내용이 다르면(피드 스트림의 category 등) 다른 기사로 취급)
+_article_pool: Dict[tuple, _PooledArticle] = {}
+_ITEMS_MARKER = b'"items":[]'
+
+
+class CacheEntry:
+    """
+    캐시 항목 하나
+    
+    - body: 미리 인코딩한 JSON 바이트 (응답할 때 다시 직렬화하지 않음)
+    - etag: 내용 해시 (같은 내용이면 워커 프로세스가 달라도 같은 값)
+    - version: 같은 키의 내용이 바뀔 때마다 1씩 증가
+    - last_modified: 내용이 마지막으로 바뀐 시각 (epoch 초)
+    - variants: 같은 내용을 필드만 골라서 인코딩한 항목들 (utils/projection.py, 처음 요청될 때 만듦)
+    - tags: 무효화용 태그 ("endpoint:search", "query:랜섬웨어", "category:사이버보안" 등)
+    - hits: 캐시 히트 수 (관리자 API에서 많이 쓰이는 항목을 보기 위함)
+    - articles/envelope: 기사 풀에 넣은 항목이면 기사 참조 배열과 items를 뺀 나머지(total, start 등)의 인코딩 앞뒤 조각
+      (본문은 보관하지 않고 body를 읽을 때 인코딩된 조각을 이어 붙여 만듦, 다시 직렬화하지 않음)
+    """
+    __slots__ = ("data", "_body", "expires_at", "etag", "version", "last_modified", "variants", "tags", "hits",
+                 "articles", "envelope")
+    
+    def __init__(self, data, body: bytes, expires_at: float, etag: str, version: int, last_modified: float,
+                 tags: frozenset = frozenset(), articles: Optional[tuple] = None,
+                 envelope: Optional[Tuple[bytes, bytes]] = None):
+        self.data = data
+        self._body = body if articles is None else None
+        self.expires_at = expires_at
+        self.etag = etag
+        self.version = version
+        self.last_modified = last_modified
+        self.variants = None
+        self.tags = tags
+        self.hits = 0
+        self.articles = articles
+        self.envelope = envelope
+    
+    @property
+    def body(self) -> bytes:
+        """미리 인코딩한 JSON 바이트 (기사 풀 항목은 조각을 이어 붙임)"""
+        if self._body is not None:
+            return self._body
+        return _join_body(self.envelope, self.articles)
+    
+    @property
+    def ttl(self) -> int:
+        """남은 만료 시간 (초)"""
+        return max(0, int(self.expires_at - time.time()))
+
+
+def _encode(data) -> bytes:
+    """
+    응답 본문으로 쓸 JSON 바이트를 만듭니다.
+    키를 정렬하므로 같은 내용이면 항상 같은 바이트(= 같은 ETag)가 나옵니다.
+    """
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+
+def _content_hash(body: bytes) -> str:
+    """인코딩된 본문으로 ETag를 만듭니다."""
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def _join_body(envelope: Tuple[bytes, bytes], articles: tuple) -> bytes:
+    head, tail = envelope
+    return b"".join((head, b",".join([article.encoded for article in articles]), tail))
+
+
+def _intern_articles(data):
+    """
+    data의 items를 기사 풀에 넣습니다. (참조 수 증가)
+    
+    Returns:
+        (기사 풀의 기사로 바꾼 data, 기사 참조 배열, 인코딩 앞뒤 조각)
+        또는 풀에 넣을 수 없는 모양(items가 없거나 link 없는 기사가 있음)이면 None
+    """
+    if not CACHE_ARTICLE_POOL or not isinstance(data, dict):
+        return None
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return None
+    if not all(isinstance(item, dict) and isinstance(item.get("link"), str) for item in items):
+        return None
+    rest = _encode(dict(data, items=[]))
+    if rest.count(_ITEMS_MARKER) != 1:
+        return None
+    head, tail = rest.split(_ITEMS_MARKER)
+    
+    articles = []
+    for item in items:
+        encoded = _encode(item)
+        key = (item["link"], encoded)
+        article = _article_pool.get(key)
+        if article is None:
+            # orjson 출력은 버퍼 여유분(수 KB)을 그대로 들고 있어서, 오래 보관할 작은 조각은 딱 맞는 크기로 복사
+            encoded = bytes(memoryview(encoded))
+            key = (item["link"], encoded)
+            article = _article_pool[key] = _PooledArticle(key, item, encoded)
+        article.refs += 1
+        articles.append(article)
+    return (
+        dict(data, items=[article.item for article in articles]),
+        tuple(articles),
+        (head + b'"items":[', b"]" + tail),
+    )
+
+
+def _release(entry: CacheEntry):
+    """캐시에서 빠진 항목이 쓰던 기사의 참조 수를 줄이고, 아무도 안 쓰는 기사는 풀에서 지웁니다."""
+    if entry.articles is None:
+        return
+    for article in entry.articles:
+        article.refs -= 1
+        if article.refs <= 0:
+            _article_pool.pop(article.key, None)
+    # 이미 응답 중인 요청은 기사 참조를 그대로 들고 있으므로 본문을 계속 만들 수 있음
+
+
+def _new_entry(data, expires_at: float, version_of, tags: frozenset) -> CacheEntry:
+    """
+    data를 인코딩해서 캐시 항목을 만듭니다. (기사 풀에 넣을 수 있으면 넣음)
+    version_of(etag)는 (version, last_modified)를 돌려줍니다.
+    """
+    interned = _intern_articles(data)
+    if interned is None:
+        body = _encode(data)
+        etag = _content_hash(body)
+        version, last_modified = version_of(etag)
+        return CacheEntry(data, body, expires_at, etag, version, last_modified, tags)
+    data, articles, envelope = interned
+    etag = _content_hash(_join_body(envelope, articles))
+    version, last_modified = version_of(etag)
+    return CacheEntry(data, None, expires_at, etag, version, last_modified, tags, articles, envelope)
+
+
+def _evict_lru():
+    """가장 오래된 항목 제거"""
+    _, evicted = _memory_cache.popitem(last=False)
+    _release(evicted)
+
+
+def article_pool_status() -> dict:
+    """기사 풀 크기 (기사 수, 참조 수, 인코딩 크기)"""
+    articles = list(_article_pool.values())
+    return {
+        "enabled": CACHE_ARTICLE_POOL,
+        "articles": len(articles),
+        "refs": sum(article.refs for article in articles),
+        "encoded_bytes": sum(len(article.encoded) for article in articles),
+    }
+
+
+def derived_entry(entry: CacheEntry, data) -> CacheEntry:
+    """
+    entry 내용을 바꾼 data로 만든 항목 (만료/버전/수정 시각은 entry와 같음, 캐시에 넣지 않음)
+    ETag는 data의 인코딩으로 새로 만들므로 원래 항목과 구분됩니다.
+    """
+    body = _encode(data)
+    return CacheEntry(data, body, entry.expires_at, _content_hash(body), entry.version, entry.last_modified, entry.tags)
+
+
+@timed("cache")
+def get_cache_entry(key: str) -> Optional[CacheEntry]:
+    """
+    만료되지 않은 캐시 항목을 메타데이터(ETag, 버전 등)와 함께 가져옵니다.
+    
+    Args:
+        key: 캐시 키
+    
+    Returns:
+        CacheEntry 또는 None
+    """
+    entry = _memory_cache.get(key)
+    if entry is None:
+        return None
+    
+    # 만료 시간 확인 (만료된 항목은 stale 응답용으로 남겨 둠)
+    now = time.time()
+    if now >= entry.expires_at:
+        if now >= entry.expires_at + CACHE_STALE_SECONDS:
+            del _memory_cache[key]
+            _release(entry)
+        return None
+    
+    _memory_cache.move_to_end(key)  # LRU: 최근 사용으로 이동
+    entry.hits += 1
+    return entry
+
+
+def is_cached(key: str) -> bool:
+    """만료되지 않은 항목이 있는지만 확인 (LRU 순서와 히트 수는 바꾸지 않음)"""
+    entry = _memory_cache.get(key)
+    return entry is not None and time.time() < entry.expires_at
+
+
+@timed("cache")
+def get_stale_entry(key: str) -> Optional[CacheEntry]:
+    """
+    만료되었더라도 CACHE_STALE_SECONDS 안이면 캐시 항목을 가져옵니다.
+    업스트림이 실패하거나 서킷 브레이커가 열려 있을 때 오래된 결과라도 보여 주기 위해 사용합니다.
+    """
+    entry = _memory_cache.get(key)
+    if entry is None or time.time() >= entry.expires_at + CACHE_STALE_SECONDS:
+        return None
+    return entry
 
 
 async def get_cached_data(key: str) -> Optional[dict]:
@@ -19,22 +253,14 @@ async def get_cached_data(key: str) -> Optional[dict]:
     Returns:
         캐시된 데이터 또는 None
     """
-    if key in _memory_cache:
-        # 만료 시간 확인
-        if key in _cache_timestamps:
-            if datetime.now() < _cache_timestamps[key]:
-                # 캐시가 유효함
-                _memory_cache.move_to_end(key)  # LRU: 최근 사용으로 이동
-                return _memory_cache[key]
-            else:
-                # 만료됨
-                del _memory_cache[key]
-                del _cache_timestamps[key]
-    
-    return None
+    entry = get_cache_entry(key)
+    return entry.data if entry else None
 
 
-async def set_cached_data(key: str, data: dict, expire_seconds: int = 600):
+@timed("cache")
+async def set_cached_data(
+    key: str, data: dict, expire_seconds: int = 600, shared: bool = False, tags: Iterable[str] = ()
+) -> CacheEntry:
     """
     메모리 캐시에 데이터를 저장합니다.
     
@@ -42,18 +268,268 @@ async def set_cached_data(key: str, data: dict, expire_seconds: int = 600):
         key: 캐시 키
         data: 저장할 데이터
         expire_seconds: 만료 시간 (초), 기본값 10분
+        shared: True면 공유 저장소에도 게시하여 다른 워커 프로세스가 가져가게 함
+        tags: 무효화용 태그 (invalidate로 같은 태그의 항목을 한꺼번에 지움)
+    
+    Returns:
+        저장된 CacheEntry
     """
+    now = time.time()
+    previous = _memory_cache.pop(key, None)
+    
+    def version_of(etag: str):
+        if previous is not None and previous.etag == etag:
+            # 내용이 같으면 버전과 Last-Modified 유지 (클라이언트의 304 재검증이 계속 통함)
+            return previous.version, previous.last_modified
+        return (previous.version + 1 if previous is not None else 1), now
+    
+    # 새 항목을 풀에 넣은 뒤 이전 항목을 놓음 (겹치는 기사가 풀에서 빠졌다 다시 들어오지 않도록)
+    entry = _new_entry(data, now + expire_seconds, version_of, frozenset(tags))
+    if previous is not None:
+        _release(previous)
+    
     # 캐시 크기 제한 (LRU)
-    if len(_memory_cache) >= MAX_CACHE_SIZE:
-        # 가장 오래된 항목 제거
-        oldest_key = next(iter(_memory_cache))
-        del _memory_cache[oldest_key]
-        if oldest_key in _cache_timestamps:
-            del _cache_timestamps[oldest_key]
-    
-    _memory_cache[key] = data
-    _cache_timestamps[key] = datetime.now() + timedelta(seconds=expire_seconds)
-    _memory_cache.move_to_end(key)  # 최근 항목으로 이동
+    while len(_memory_cache) >= MAX_CACHE_SIZE:
+        _evict_lru()
+    
+    _memory_cache[key] = entry  # 최근 항목으로 추가
+    
+    if shared:
+        try:
+            await asyncio.to_thread(publish_entry, key, data, expire_seconds, entry.tags)
+        except Exception as e:
+            print(f"[캐시] 공유 저장소 게시 실패: {key} - {str(e)}")
+    
+    return entry
+
+
+# 공유 저장소에서 마지막으로 읽은 위치 (파일 mtime과 그 mtime에 이미 읽은 파일들)
+_shared_sync_mark = EMPTY_MARK
+
+
+async def sync_shared_cache() -> int:
+    """
+    리더 프로세스가 공유 저장소에 게시한 새 항목을 메모리 캐시로 가져옵니다.
+    남은 만료 시간은 게시 시점 기준으로 유지됩니다.
+    
+    Returns:
+        가져온 항목 수
+    """
+    global _shared_sync_mark
+    # 디렉터리 훑기와 JSON 디코딩은 이벤트 루프 밖에서
+    entries, _shared_sync_mark = await asyncio.to_thread(read_updated_entries, _shared_sync_mark)
+    now = time.time()
+    for entry in entries:
+        remaining = int(entry["expires_at"] - now)
+        if remaining > 0:
+            await set_cached_data(entry["key"], entry["data"], expire_seconds=remaining, tags=entry.get("tags", ()))
+    return len(entries)
+
+
+def _matches(key: str, tags: frozenset, invalidate_tags: Iterable[str], prefixes: Iterable[str]) -> bool:
+    return not tags.isdisjoint(invalidate_tags) or any(key.startswith(prefix) for prefix in prefixes)
+
+
+def _invalidate_local(tags: Iterable[str], prefixes: Iterable[str]) -> List[str]:
+    tags, prefixes = frozenset(tags), tuple(prefixes)
+    removed = [key for key, entry in _memory_cache.items() if _matches(key, entry.tags, tags, prefixes)]
+    for key in removed:
+        _release(_memory_cache.pop(key))
+    return removed
+
+
+# 이 프로세스가 적용한 무효화 (프로세스 시작 전의 기록은 적용하지 않음)
+_invalidation_mark = EMPTY_MARK
+_invalidations_since = time.time()
+_applied_invalidations: "OrderedDict[str, None]" = OrderedDict()
+
+
+async def invalidate(tags: Iterable[str] = (), prefixes: Iterable[str] = (), shared: bool = True) -> List[str]:
+    """
+    태그가 하나라도 겹치거나 키가 prefix로 시작하는 캐시 항목을 지웁니다. (stale 응답용으로도 남기지 않음)
+    
+    Args:
+        tags: 지울 태그들
+        prefixes: 지울 캐시 키 접두사들
+        shared: True면 공유 저장소의 게시 항목도 지우고, 다른 워커도 같은 무효화를 적용하게 기록
+            (공유 저장소 파일 작업은 이벤트 루프 밖에서)
+    
+    Returns:
+        이 프로세스에서 지운 캐시 키 목록
+    """
+    tags, prefixes = sorted(set(tags)), sorted(set(prefixes))
+    removed = _invalidate_local(tags, prefixes)
+    if shared and (tags or prefixes):
+        try:
+            await asyncio.to_thread(
+                remove_entries, lambda entry: _matches(entry["key"], frozenset(entry.get("tags", ())), tags, prefixes)
+            )
+            event = await asyncio.to_thread(publish_invalidation, tags, prefixes)
+            _applied_invalidations[event["id"]] = None
+        except Exception as e:
+            print(f"[캐시] 무효화 게시 실패: {str(e)}")
+    print(f"[캐시] 무효화: 태그 {tags}, 접두사 {prefixes} → {len(removed)}개 삭제")
+    return removed
+
+
+async def sync_invalidations() -> int:
+    """
+    다른 워커가 기록한 캐시 무효화를 이 프로세스의 메모리 캐시에도 적용합니다. (모든 워커에서 주기 실행)
+    
+    Returns:
+        지운 항목 수
+    """
+    global _invalidation_mark
+    events, _invalidation_mark = await asyncio.to_thread(read_invalidations_if_changed, _invalidation_mark)
+    removed = 0
+    for event in events:
+        if event["id"] in _applied_invalidations or event["at"] < _invalidations_since:
+            continue
+        _applied_invalidations[event["id"]] = None
+        removed += len(_invalidate_local(event.get("tags", ()), event.get("prefixes", ())))
+    while len(_applied_invalidations) > 1000:
+        _applied_invalidations.popitem(last=False)
+    return removed
+
+
+def _entry_size(entry: CacheEntry) -> int:
+    """본문과 필드 선택 변형들의 인코딩 크기 (바이트)"""
+    return len(entry.body) + sum(len(variant.body) for variant in (entry.variants or {}).values())
+
+
+def describe_entries(sort: str = "hits", limit: int = 50, tag: Optional[str] = None, prefix: Optional[str] = None) -> dict:
+    """
+    관리자 API용 캐시 항목 목록 (hits 또는 size 내림차순)
+    
+    Args:
+        sort: "hits" 또는 "size"
+        tag, prefix: 이 태그가 있거나 키가 이 접두사로 시작하는 항목만
+    """
+    now = time.time()
+    rows = []
+    for key, entry in _live_entries():
+        if tag is not None and tag not in entry.tags:
+            continue
+        if prefix is not None and not key.startswith(prefix):
+            continue
+        rows.append({
+            "key": key,
+            "tags": sorted(entry.tags),
+            "hits": entry.hits,
+            "size": _entry_size(entry),
+            "variants": len(entry.variants or ()),
+            "ttl": entry.ttl,
+            "stale": now >= entry.expires_at,
+            "version": entry.version,
+            "last_modified": entry.last_modified,
+        })
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return {
+        "count": len(rows),
+        "total_size": sum(row["size"] for row in rows),
+        "max_entries": MAX_CACHE_SIZE,
+        "article_pool": article_pool_status(),
+        "entries": rows[:limit],
+    }
+
+
+# 캐시 스냅샷 (재시작 후 캐시를 곧바로 복원)
+CACHE_SNAPSHOT_ENABLED = os.getenv("CACHE_SNAPSHOT_ENABLED", "true").lower() == "true"
+CACHE_SNAPSHOT_PATH = Path(os.getenv("CACHE_SNAPSHOT_PATH", str(SHARED_STATE_DIR / "cache_snapshot.ndjson")))
+# 주기적으로 스냅샷을 남기는 간격 (초, 0이면 종료 시에만)
+CACHE_SNAPSHOT_INTERVAL = int(os.getenv("CACHE_SNAPSHOT_INTERVAL", "300"))
+
+_SNAPSHOT_MAGIC = b"cache-snapshot 1\n"
+
+
+def _live_entries() -> list:
+    """stale 보관 기간이 지나지 않은 항목 (LRU 순서, 오래된 것부터)"""
+    now = time.time()
+    return [(key, entry) for key, entry in _memory_cache.items() if entry.expires_at + CACHE_STALE_SECONDS > now]
+
+
+def iter_cache_entries() -> list:
+    """stale 보관 기간이 지나지 않은 캐시 항목들 (복사한 목록이라 순회 중에 캐시가 바뀌어도 됨)"""
+    return [entry for _, entry in _live_entries()]
+
+
+def _write_snapshot(entries: list, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_MAGIC)
+        for key, entry in entries:
+            f.write(orjson.dumps([key, entry.expires_at, entry.etag, entry.version, entry.last_modified, sorted(entry.tags)]))
+            f.write(b"\n")
+            f.write(entry.body)
+            f.write(b"\n")
+    os.replace(tmp_path, path)
+
+
+def save_snapshot(path: Path = CACHE_SNAPSHOT_PATH) -> int:
+    """
+    캐시 항목(stale 보관 중인 것 포함)을 파일로 저장합니다. (서버 종료 시)
+    
+    항목마다 두 줄: 메타데이터 JSON [key, expires_at, etag, version, last_modified, tags]과
+    미리 인코딩된 본문을 그대로 씁니다. (다시 직렬화하지 않음, orjson 출력에는 줄바꿈이 없음)
+    
+    Returns:
+        저장한 항목 수
+    """
+    entries = _live_entries()
+    _write_snapshot(entries, path)
+    return len(entries)
+
+
+async def snapshot_cache() -> int:
+    """주기 작업용: 항목 목록만 이벤트 루프에서 모으고 파일 쓰기는 스레드에서 합니다."""
+    entries = _live_entries()
+    await asyncio.to_thread(_write_snapshot, entries, CACHE_SNAPSHOT_PATH)
+    return len(entries)
+
+
+def load_snapshot(path: Path = CACHE_SNAPSHOT_PATH) -> int:
+    """
+    스냅샷 파일을 메모리 매핑해서 한 항목씩 읽어 캐시에 넣습니다.
+    남은 만료 시간은 저장 시점의 만료 시각 기준이며, 만료된 항목은 stale 응답용으로만 쓰입니다.
+    ETag/버전/Last-Modified도 그대로 복원되므로 클라이언트의 304 재검증이 계속 통합니다.
+    
+    Returns:
+        복원한 항목 수
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return 0
+    
+    restored = 0
+    now = time.time()
+    with f:
+        if os.fstat(f.fileno()).st_size <= len(_SNAPSHOT_MAGIC):
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+            if snapshot.readline() != _SNAPSHOT_MAGIC:
+                print(f"[캐시] 알 수 없는 스냅샷 형식: {path}")
+                return 0
+            while True:
+                header = snapshot.readline()
+                body = snapshot.readline()
+                if not header or not body.endswith(b"\n"):
+                    # 끝까지 읽었거나 잘린 파일
+                    break
+                key, expires_at, _etag, version, last_modified, *rest = orjson.loads(header)
+                if expires_at + CACHE_STALE_SECONDS <= now or key in _memory_cache:
+                    continue
+                body = body[:-1]  # 줄바꿈 제거
+                while len(_memory_cache) >= MAX_CACHE_SIZE:
+                    _evict_lru()
+                tags = frozenset(rest[0]) if rest else frozenset()  # 태그가 없던 이전 스냅샷도 읽음
+                # 버전/Last-Modified는 저장된 값 그대로 (기사 풀에 넣어도 본문은 같은 바이트라 ETag도 같음)
+                _memory_cache[key] = _new_entry(
+                    orjson.loads(body), expires_at, lambda _: (version, last_modified), tags
+                )
+                restored += 1
+    return restored
 
 
 async def close_redis():
@@ -0,0 +1,107 @@
+"""
+공유 의존성 (Supabase 클라이언트, 네이버 HTTP 클라이언트, SMTP 전송 워커)
+모듈을 임포트할 때 클라이언트를 만들지 않고, 처음 필요할 때 한 번 만들어서 프로세스 전체에서 재사용합니다.
+서버 수명(lifespan)이 끝날 때 close_dependencies()로 정리합니다.
+
+준비 상태(/readyz)에 쓰는 임포트/시작 시간도 여기에 기록합니다.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.metrics import instrument_http_client
+from utils.naver_client import breaker as naver_breaker, close_http_client, is_configured as naver_configured
+from utils.smtp_pool import SMTPSettings, close_delivery_worker
+
+# Supabase 키 환경변수 (용도별로 다른 키를 씀)
+SUPABASE_ANON_KEY = "SUPABASE_KEY"                   # 검색 통계
+SUPABASE_SERVICE_ROLE_KEY = "SUPABASE_SERVICE_ROLE"  # 사용자 프로필 (RLS 우회)
+SUPABASE_EMAIL_KEY = "SUPABASE_SERVICE_KEY"          # 이메일 큐
+
+_supabase_clients: Dict[str, object] = {}
+# 라우터가 asyncio.to_thread 안에서 처음 호출할 수도 있으므로 스레드 잠금
+_supabase_lock = threading.Lock()
+
+
+def get_supabase(key_env: str = SUPABASE_ANON_KEY):
+    """
+    key_env 환경변수의 키로 만든 Supabase 클라이언트 (처음 호출할 때 생성, 이후 재사용)
+
+    Returns:
+        Client 또는 설정이 없거나 생성에 실패하면 None
+    """
+    client = _supabase_clients.get(key_env)
+    if client is not None:
+        return client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv(key_env)
+    if not url or not key:
+        return None
+
+    with _supabase_lock:
+        client = _supabase_clients.get(key_env)
+        if client is None:
+            # supabase 패키지 임포트도 처음 쓸 때까지 미룸 (워커 부팅 시간 단축)
+            from supabase import create_client
+            try:
+                client = create_client(url, key)
+            except Exception as e:
+                print(f"❌ Supabase 클라이언트 생성 실패 ({key_env}): {str(e)}")
+                return None
+            _instrument_supabase(client)
+            _supabase_clients[key_env] = client
+            print(f"✅ Supabase 클라이언트 생성 ({key_env})")
+    return client
+
+
+def _instrument_supabase(client):
+    """인증(auth.get_user 등)과 테이블/RPC 호출 시간을 요청 지연 시간 단계로 기록 (utils/metrics.py)"""
+    try:
+        instrument_http_client(client.auth._http_client, "supabase_auth")
+        instrument_http_client(client.postgrest.session, "supabase_query")
+    except AttributeError as e:
+        # supabase 패키지 내부 구조가 바뀐 경우: 계측 없이 사용
+        print(f"[서버] Supabase 호출 계측 생략: {str(e)}")
+
+
+async def close_dependencies():
+    """서버 종료 시 대기 중인 이메일을 보내고 SMTP 세션과 HTTP 클라이언트를 정리합니다."""
+    await close_delivery_worker()
+    await close_http_client()
+    _supabase_clients.clear()
+
+
+class StartupState:
+    """임포트/시작 시간과 준비 여부"""
+
+    def __init__(self):
+        self.import_seconds: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.ready = False
+        self.started_at: Optional[float] = None
+
+    def config_checks(self) -> dict:
+        """외부 서비스 설정 여부 (네트워크 호출 없음)"""
+        return {
+            "naver": naver_configured(),
+            "supabase": bool(os.getenv("SUPABASE_URL") and os.getenv(SUPABASE_ANON_KEY)),
+            "supabase_service_role": bool(os.getenv("SUPABASE_URL") and os.getenv(SUPABASE_SERVICE_ROLE_KEY)),
+            "smtp": SMTPSettings().configured,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "import_ms": round(self.import_seconds * 1000, 1) if self.import_seconds is not None else None,
+            "startup_ms": round(self.startup_seconds * 1000, 1) if self.startup_seconds is not None else None,
+            "uptime_seconds": round(time.time() - self.started_at, 1) if self.started_at else None,
+            "supabase_clients": sorted(_supabase_clients),
+            "config": self.config_checks(),
+            "naver_breaker": naver_breaker.status(),
+        }
+
+
+startup_state = StartupState()
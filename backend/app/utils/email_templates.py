@@ -0,0 +1,145 @@
+"""
+답장 알림 이메일 템플릿
+템플릿과 변하지 않는 HTML 조각(CSS 포함)은 모듈 로드 시 한 번만 만들고,
+이메일마다 바뀌는 부분만 작은 조각으로 렌더링해서 이어 붙입니다.
+"""
+
+import html
+from functools import lru_cache
+from string import Template
+from typing import List, Optional, Sequence, Tuple
+
+COMMUNITY_URL = "http://localhost:3000/community"
+
+_STYLE = """
+          body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+          .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+          .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+          .content { background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; }
+          .message-box { background: white; padding: 20px; border-left: 4px solid #667eea; margin: 20px 0; border-radius: 5px; }
+          .reply-box { background: #e3f2fd; padding: 15px; border-left: 4px solid #2196f3; margin: 20px 0; border-radius: 5px; }
+          .button { display: inline-block; padding: 12px 30px; background: #667eea; color: white; text-decoration: none; border-radius: 5px; margin-top: 20px; }
+          .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+"""
+
+# 고정 조각: 한 번만 만들어 두고 재사용
+_HTML_HEAD = f"""
+    <html>
+      <head>
+        <style>{_STYLE}        </style>
+      </head>
+      <body>
+        <div class="container">"""
+
+_HTML_TAIL = f"""
+            <p>커뮤니티에서 대화를 계속하시려면 아래 버튼을 클릭하세요.</p>
+            <a href="{COMMUNITY_URL}" class="button">커뮤니티로 이동</a>
+
+            <div class="footer">
+              <p>이 이메일은 보안뉴스 커뮤니티에서 발송되었습니다.</p>
+              <p>더 이상 알림을 받고 싶지 않으시다면 프로필 설정에서 변경하실 수 있습니다.</p>
+            </div>
+          </div>
+        </div>
+      </body>
+    </html>
+    """
+
+_TEXT_TAIL = f"""
+        커뮤니티에서 대화를 계속하시려면 {COMMUNITY_URL} 를 방문하세요.
+
+        ---
+        이 이메일은 보안뉴스 커뮤니티에서 발송되었습니다.
+        """
+
+# 가변 조각 템플릿 (모듈 로드 시 컴파일)
+_HEADER = Template("""
+          <div class="header">
+            <h1>🔔 $title</h1>
+          </div>
+          <div class="content">
+            <p>안녕하세요, $to_name님!</p>
+            <p>$intro</p>
+""")
+
+_ORIGINAL_BOX = Template("""
+            <div class="message-box">
+              <p><strong>회원님의 메시지:</strong></p>
+              <p>$content</p>
+            </div>
+""")
+
+_REPLY_BOX = Template("""
+            <div class="reply-box">
+              <p><strong>$from_name님의 답장:</strong></p>
+              <p>$message</p>
+            </div>
+""")
+
+_TEXT_REPLY = Template("""
+        $original
+        $from_name님의 답장: $message
+""")
+
+# (보낸 사람, 답장 내용, 원본 메시지)
+Reply = Tuple[str, str, Optional[str]]
+
+
+@lru_cache(maxsize=64)
+def _header_fragments(count: int) -> Tuple[str, str]:
+    """답장 개수별 제목/인사말 (개수 종류가 적어서 캐시)"""
+    if count == 1:
+        return "새로운 답장이 도착했습니다", "님이 회원님의 메시지에 답장을 남겼습니다."
+    return f"새로운 답장 {count}개가 도착했습니다", f"회원님의 메시지에 답장 {count}개가 도착했습니다."
+
+
+def render_subject(replies: Sequence[Reply]) -> str:
+    """이메일 제목"""
+    if len(replies) == 1:
+        return f"[보안뉴스] {replies[0][0]}님이 회원님의 메시지에 답장했습니다"
+    return f"[보안뉴스] 회원님의 메시지에 새로운 답장 {len(replies)}개가 도착했습니다"
+
+
+def render_html(to_name: str, replies: Sequence[Reply]) -> str:
+    """
+    HTML 본문을 렌더링합니다. 답장이 여러 개면 한 통의 요약(digest) 이메일이 됩니다.
+    사용자가 입력한 내용은 모두 HTML 이스케이프됩니다.
+    """
+    title, intro = _header_fragments(len(replies))
+    if len(replies) == 1:
+        intro = f"<strong>{html.escape(replies[0][0])}</strong>{intro}"
+
+    parts: List[str] = [
+        _HTML_HEAD,
+        _HEADER.substitute(title=title, to_name=html.escape(to_name), intro=intro),
+    ]
+    for from_name, message, original in replies:
+        if original:
+            parts.append(_ORIGINAL_BOX.substitute(content=html.escape(original)))
+        parts.append(_REPLY_BOX.substitute(
+            from_name=html.escape(from_name),
+            message=html.escape(message),
+        ))
+    parts.append(_HTML_TAIL)
+    return "".join(parts)
+
+
+def render_text(to_name: str, replies: Sequence[Reply]) -> str:
+    """텍스트 본문 (HTML을 지원하지 않는 이메일 클라이언트용)"""
+    _, intro = _header_fragments(len(replies))
+    if len(replies) == 1:
+        intro = f"{replies[0][0]}{intro}"
+
+    parts: List[str] = [f"""
+        안녕하세요, {to_name}님!
+
+        {intro}
+"""]
+    for from_name, message, original in replies:
+        parts.append(_TEXT_REPLY.substitute(
+            original=f"회원님의 메시지: {original}\n" if original else "",
+            from_name=from_name,
+            message=message,
+        ))
+    parts.append(_TEXT_TAIL)
+    return "".join(parts)
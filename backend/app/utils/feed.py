@@ -0,0 +1,92 @@
+"""
+카테고리 스트림 병합 (개인화 피드)
+카테고리별 기사 스트림은 모든 사용자가 같이 쓰도록 캐시해 두고,
+요청마다 사용자가 켠 카테고리 스트림만 pubDate 최신순으로 k-way 병합합니다.
+
+- 스트림 항목은 (timestamp 내림차순, link 오름차순)으로 정렬되어 있어야 합니다
+- 커서는 마지막으로 돌려준 항목의 (timestamp, link)이며, 다음 페이지는 그 뒤부터 시작합니다
+- 같은 link는 한 번만 돌려줍니다 (먼저 나온 카테고리 기준)
+"""
+
+import base64
+import heapq
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+import orjson
+
+FeedKey = Tuple[float, str]
+
+
+def parse_pub_date(pub_date: str) -> float:
+    """네이버 pubDate를 epoch 초로 변환 (형식이 다르면 0)"""
+    try:
+        return datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %z').timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def build_stream(items: list, category: str) -> list:
+    """검색 결과 items를 병합용 스트림으로 변환 (category/timestamp 추가, 정렬)"""
+    stream = [
+        dict(item, category=category, timestamp=parse_pub_date(item.get('pubDate')))
+        for item in items
+    ]
+    stream.sort(key=_sort_key)
+    return stream
+
+
+def _sort_key(item: dict) -> FeedKey:
+    return (-item['timestamp'], item['link'])
+
+
+def encode_cursor(item: dict) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([item['timestamp'], item['link']])).decode()
+
+
+def decode_cursor(cursor: str) -> FeedKey:
+    """
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    try:
+        timestamp, link = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (-float(timestamp), str(link))
+    except Exception as e:
+        raise ValueError("잘못된 커서입니다") from e
+
+
+def _after(stream: list, cursor_key: Optional[FeedKey]) -> Iterator[dict]:
+    """커서 다음 항목부터 순회 (이진 탐색으로 시작 위치를 찾음)"""
+    lo, hi = 0, len(stream)
+    if cursor_key is not None:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _sort_key(stream[mid]) <= cursor_key:
+                lo = mid + 1
+            else:
+                hi = mid
+    for i in range(lo, len(stream)):
+        yield stream[i]
+
+
+def merge_streams(streams: List[list], limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    여러 카테고리 스트림을 최신순으로 병합해서 한 페이지를 만듭니다.
+
+    Returns:
+        (items, next_cursor): 다음 페이지가 없으면 next_cursor는 None
+    """
+    cursor_key = decode_cursor(cursor) if cursor else None
+    merged = heapq.merge(*(_after(stream, cursor_key) for stream in streams), key=_sort_key)
+
+    page = []
+    seen_links = set()
+    for item in merged:
+        if item['link'] in seen_links:
+            continue
+        if len(page) == limit:
+            return page, encode_cursor(page[-1])
+        seen_links.add(item['link'])
+        page.append(item)
+    return page, None
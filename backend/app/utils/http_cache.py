@@ -0,0 +1,77 @@
+"""
+HTTP 조건부 요청(conditional GET) 지원
+캐시 항목의 ETag/Last-Modified/남은 TTL로 응답 헤더를 만들고,
+클라이언트가 가진 버전이 최신이면 본문 없이 304를 돌려줍니다.
+"""
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from utils.cache import CacheEntry
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더 값이 ETag와 일치하는지 (약한 비교)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP 날짜는 초 단위
+    return int(last_modified) <= int(since)
+
+
+def cache_headers(entry: CacheEntry) -> dict:
+    """캐시 항목으로 ETag/Last-Modified/Cache-Control 헤더를 만듭니다."""
+    return {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": f"max-age={entry.ttl}",
+    }
+
+
+def is_not_modified(request: Request, entry: CacheEntry) -> bool:
+    """클라이언트가 이미 최신 버전을 가지고 있는지"""
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+        return _etag_matches(if_none_match, entry.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        return _not_modified_since(if_modified_since, entry.last_modified)
+    return False
+
+
+def cached_response(request: Request, entry: CacheEntry, stale: bool = False) -> Response:
+    """
+    캐시 항목으로 응답합니다.
+    클라이언트의 If-None-Match/If-Modified-Since가 최신이면 본문 없이 304를 반환합니다.
+    
+    캐시에 넣을 때 이미 인코딩해 둔 본문을 그대로 보내므로
+    응답 모델 검증이나 JSON 직렬화를 다시 하지 않습니다.
+    
+    Args:
+        stale: 업스트림 장애로 만료된 항목을 대신 보내는 경우 (X-Cache-Status: stale, Warning 헤더)
+    """
+    headers = cache_headers(entry)
+    if stale:
+        headers["Cache-Control"] = "max-age=0, must-revalidate"
+        headers["Warning"] = '110 - "Response is Stale"'
+        headers["X-Cache-Status"] = "stale"
+    if is_not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,278 @@
+"""
+백그라운드 작업 실행기
+주기 작업을 등록해 두면 스케줄에 맞춰 실행하고, 마지막 실행 상태를 기록합니다.
+
+여러 워커 프로세스가 떠 있어도 role="leader" 작업은 리더 프로세스 하나에서만 실행됩니다.
+리더가 죽으면 다른 워커가 잠금을 가져가서 이어서 실행합니다 (failover).
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from utils.leader import FileLeaderLock
+from utils.shared_store import SHARED_STATE_DIR, read_state, write_state
+
+# 리더가 아닌 워커가 리더 잠금을 다시 시도하는 주기 (초) = 최대 failover 시간
+LEADER_CHECK_INTERVAL = int(os.getenv("LEADER_CHECK_INTERVAL", "5"))
+
+_JOB_STATE_NAME = "jobs"
+
+
+def _format_time(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Job:
+    """등록된 주기 작업 하나의 스케줄과 실행 상태"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        role: str = "leader",
+        initial_delay: float = 0,
+        retry_interval: Optional[float] = None,
+    ):
+        if role not in ("leader", "follower", "all"):
+            raise ValueError(f"unknown job role: {role}")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.role = role
+        self.initial_delay = initial_delay
+        self.retry_interval = retry_interval or interval
+
+        self.next_run: Optional[float] = None
+        self.last_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.runs = 0
+        self.failures = 0
+        self.running = False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "role": self.role,
+            "interval_seconds": self.interval,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started": _format_time(self.last_started),
+            "last_finished": _format_time(self.last_finished),
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "next_run": _format_time(self.next_run),
+        }
+
+
+class JobRunner:
+    """리더 선출을 포함한 주기 작업 실행기"""
+
+    def __init__(self, lock_path=None):
+        self._lock = FileLeaderLock(lock_path or SHARED_STATE_DIR / "leader.lock")
+        self._jobs: Dict[str, Job] = {}
+        self._services: Dict[str, dict] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock.is_leader
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        role: str = "leader",
+        initial_delay: float = 0,
+        retry_interval: Optional[float] = None,
+    ):
+        """
+        주기 작업을 등록합니다.
+
+        Args:
+            name: 작업 이름
+            func: 한 번 실행할 코루틴 함수
+            interval: 실행 주기 (초)
+            role: "leader"(리더만), "follower"(리더가 아닌 워커만), "all"(모든 워커)
+            initial_delay: 시작 후 첫 실행까지 대기 시간 (초)
+            retry_interval: 실패 시 다시 시도할 때까지 대기 시간 (초), 기본값은 interval
+        """
+        self._jobs[name] = Job(name, func, interval, role, initial_delay, retry_interval)
+
+    def register_service(
+        self,
+        name: str,
+        start: Callable[[], Awaitable],
+        stop: Callable[[], Awaitable],
+        status: Optional[Callable[[], dict]] = None,
+    ):
+        """
+        리더 프로세스에서만 계속 실행되는 서비스(주기 작업이 아닌 상주 작업)를 등록합니다.
+        리더가 되면 start()를, 실행기가 멈출 때 stop()을 호출합니다.
+
+        Args:
+            name: 서비스 이름
+            start: 서비스를 시작하는 코루틴 함수 (곧바로 반환해야 함)
+            stop: 서비스를 멈추는 코루틴 함수
+            status: 상태 조회 함수 (작업 상태 API에 표시)
+        """
+        self._services[name] = {"start": start, "stop": stop, "status": status, "running": False}
+
+    async def _start_services(self):
+        for name, service in self._services.items():
+            if service["running"]:
+                continue
+            try:
+                await service["start"]()
+                service["running"] = True
+            except Exception as e:
+                print(f"[작업] ❌ 서비스 {name} 시작 실패: {str(e)}")
+
+    async def _stop_services(self):
+        for name, service in self._services.items():
+            if not service["running"]:
+                continue
+            try:
+                await service["stop"]()
+            except Exception as e:
+                print(f"[작업] ❌ 서비스 {name} 정지 실패: {str(e)}")
+            service["running"] = False
+
+    async def start(self):
+        """리더 선출 루프와 작업 루프들을 시작합니다."""
+        self._stopping = False
+        self._try_become_leader()
+        now = time.time()
+        for job in self._jobs.values():
+            job.next_run = now + job.initial_delay
+        self._restore_leader_schedule()
+
+        self._tasks = [asyncio.create_task(self._leader_loop())]
+        self._tasks += [asyncio.create_task(self._job_loop(job)) for job in self._jobs.values()]
+        if self.is_leader:
+            await self._start_services()
+        print(f"[작업] 실행기 시작 (PID {os.getpid()}, {'리더' if self.is_leader else '팔로워'})")
+
+    async def stop(self):
+        """모든 작업을 멈추고 리더 자리를 내려놓습니다."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._stop_services()
+        self._lock.release()
+
+    def status(self) -> dict:
+        """작업 스케줄과 마지막 실행 상태"""
+        local_jobs = [job.to_dict() for job in self._jobs.values()]
+        result = {
+            "pid": os.getpid(),
+            "is_leader": self.is_leader,
+            "jobs": local_jobs,
+            "services": {
+                name: dict(service["status"]() if service["status"] else {}, running=service["running"])
+                for name, service in self._services.items()
+            },
+        }
+        if not self.is_leader:
+            # 리더가 게시한 작업 상태도 함께 보여 줌
+            result["leader"] = read_state(_JOB_STATE_NAME)
+        return result
+
+    def _try_become_leader(self) -> bool:
+        was_leader = self.is_leader
+        try:
+            became_leader = self._lock.try_acquire()
+        except OSError as e:
+            print(f"[작업] 리더 잠금 오류: {str(e)}")
+            return False
+        if became_leader and not was_leader:
+            print(f"[작업] 리더가 되었습니다 (PID {os.getpid()})")
+        return became_leader
+
+    def _restore_leader_schedule(self):
+        """
+        이전 리더가 게시한 마지막 실행 시각을 이어받아서,
+        리더가 바뀌어도 방금 실행된 작업을 곧바로 다시 실행하지 않게 합니다.
+        """
+        if not self.is_leader:
+            return
+        state = read_state(_JOB_STATE_NAME) or {}
+        for job_state in state.get("jobs", []):
+            job = self._jobs.get(job_state.get("name"))
+            finished = job_state.get("last_finished_ts")
+            if job and job.role == "leader" and finished and job_state.get("last_error") is None:
+                job.next_run = max(job.next_run, finished + job.interval)
+
+    async def _publish_state(self):
+        try:
+            await asyncio.to_thread(write_state, _JOB_STATE_NAME, {
+                "pid": os.getpid(),
+                "updated_at": _format_time(time.time()),
+                "jobs": [
+                    dict(job.to_dict(), last_finished_ts=job.last_finished)
+                    for job in self._jobs.values() if job.role == "leader"
+                ],
+            })
+        except OSError as e:
+            print(f"[작업] 상태 게시 실패: {str(e)}")
+
+    async def _leader_loop(self):
+        """리더가 아니면 주기적으로 잠금을 다시 시도합니다."""
+        while not self._stopping:
+            await asyncio.sleep(LEADER_CHECK_INTERVAL)
+            if not self.is_leader and self._try_become_leader():
+                self._restore_leader_schedule()
+                await self._start_services()
+
+    def _should_run(self, job: Job) -> bool:
+        if job.role == "leader":
+            return self.is_leader
+        if job.role == "follower":
+            return not self.is_leader
+        return True
+
+    async def _job_loop(self, job: Job):
+        while not self._stopping:
+            delay = max(0.0, job.next_run - time.time())
+            # 리더 여부가 바뀔 수 있으므로 너무 오래 자지 않음
+            await asyncio.sleep(min(delay, LEADER_CHECK_INTERVAL))
+            if time.time() < job.next_run or not self._should_run(job):
+                continue
+
+            job.running = True
+            job.last_started = time.time()
+            try:
+                await job.func()
+                job.last_error = None
+                job.next_run = time.time() + job.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                job.next_run = time.time() + job.retry_interval
+                print(f"[작업] ❌ {job.name} 실패: {str(e)}")
+            finally:
+                job.running = False
+                job.runs += 1
+                job.last_finished = time.time()
+                job.last_duration = job.last_finished - job.last_started
+
+            if job.role == "leader":
+                await self._publish_state()
+
+
+# 프로세스 전체에서 공유하는 실행기
+job_runner = JobRunner()
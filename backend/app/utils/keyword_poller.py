@@ -0,0 +1,247 @@
+"""
+키워드별 적응형 폴링 수집기
+추적하는 키워드마다 sort=date로 최신 기사를 가져오고, 기사 도착 속도를 추정해서
+다음 폴링 시각을 정합니다. (기사가 많은 키워드는 자주, 조용한 키워드는 드물게)
+
+- 생산자(producer): 폴링할 시각이 된 키워드를 큐에 넣음
+- 소비자(worker): 큐에서 키워드를 꺼내 가져오고, 결과를 구독자들(캐시, 피드 스트림 등)에게 전달
+- 도착 속도는 새 기사 수 / 지난 폴링 이후 경과 시간의 EWMA
+- 다음 폴링 간격 = 목표 새 기사 수 / 도착 속도 (최소~최대 간격 사이로 제한)
+"""
+
+import asyncio
+import heapq
+import os
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from utils.feed import parse_pub_date
+
+# 폴링 간격 범위 (초)
+KEYWORD_POLL_MIN_INTERVAL = float(os.getenv("KEYWORD_POLL_MIN_INTERVAL", "60"))
+KEYWORD_POLL_MAX_INTERVAL = float(os.getenv("KEYWORD_POLL_MAX_INTERVAL", "1800"))
+# 폴링 한 번에 새로 들어와 있기를 기대하는 기사 수 (한 페이지 100개보다 충분히 작게)
+KEYWORD_POLL_TARGET_NEW = float(os.getenv("KEYWORD_POLL_TARGET_NEW", "10"))
+# 동시에 가져오는 소비자 수
+KEYWORD_POLL_WORKERS = int(os.getenv("KEYWORD_POLL_WORKERS", "2"))
+# 도착 속도 EWMA 가중치 (클수록 최근 관측을 더 반영)
+RATE_EWMA_ALPHA = 0.3
+
+
+def _format_time(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class PollResult:
+    """한 번의 폴링 결과 (구독자에게 전달)"""
+
+    def __init__(self, keyword: str, data: dict, new_items: list, interval: float):
+        self.keyword = keyword
+        self.data = data
+        self.new_items = new_items
+        # 다음 폴링까지 간격 (초) - 캐시 만료 시간을 정할 때 사용
+        self.interval = interval
+
+
+class KeywordState:
+    """키워드 하나의 폴링 스케줄과 도착 속도 추정값"""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.rate: Optional[float] = None  # 초당 새 기사 수
+        self.interval = KEYWORD_POLL_MIN_INTERVAL
+        self.next_poll = 0.0
+        self.last_poll: Optional[float] = None
+        self.latest_timestamp = 0.0
+        self.latest_links: set = set()
+        self.polls = 0
+        self.new_items = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "keyword": self.keyword,
+            "articles_per_hour": round(self.rate * 3600, 2) if self.rate is not None else None,
+            "interval_seconds": round(self.interval, 1),
+            "polls": self.polls,
+            "new_items": self.new_items,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_poll": _format_time(self.last_poll),
+            "next_poll": _format_time(self.next_poll),
+        }
+
+
+class KeywordPoller:
+    """생산자/소비자 방식의 키워드 폴링 파이프라인"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[dict]],
+        min_interval: float = KEYWORD_POLL_MIN_INTERVAL,
+        max_interval: float = KEYWORD_POLL_MAX_INTERVAL,
+        target_new: float = KEYWORD_POLL_TARGET_NEW,
+        workers: int = KEYWORD_POLL_WORKERS,
+        enabled: Callable[[], bool] = lambda: True,
+    ):
+        self._fetch = fetch
+        # 업스트림 설정이 없으면 시작하지 않음 (설정 누락을 업스트림 실패로 세지 않도록)
+        self._enabled = enabled
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.workers = workers
+        self._keywords: Dict[str, KeywordState] = {}
+        self._subscribers: List[Callable[[PollResult], Awaitable]] = []
+        self._schedule: list = []  # (next_poll, keyword) 힙
+        self._wakeup: Optional[asyncio.Event] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def track(self, keyword: str):
+        """폴링할 키워드를 추가합니다. (실행 중이면 곧바로 첫 폴링)"""
+        if keyword in self._keywords:
+            return
+        state = self._keywords[keyword] = KeywordState(keyword)
+        state.next_poll = time.time()
+        heapq.heappush(self._schedule, (state.next_poll, keyword))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def subscribe(self, callback: Callable[[PollResult], Awaitable]):
+        """폴링 결과를 받을 소비자(코루틴 함수)를 등록합니다."""
+        self._subscribers.append(callback)
+
+    async def start(self):
+        if not self._enabled():
+            print("[폴링] 네이버 API 인증 정보가 없어 키워드 폴링을 하지 않습니다")
+            return
+        self._wakeup = asyncio.Event()
+        self._queue = asyncio.Queue(maxsize=max(1, self.workers))
+        self._tasks = [asyncio.create_task(self._produce())]
+        self._tasks += [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        print(f"[폴링] 시작 (키워드 {len(self._keywords)}개, 간격 {self.min_interval:.0f}~{self.max_interval:.0f}초)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def status(self) -> dict:
+        return {
+            "enabled": self._enabled(),
+            "running": bool(self._tasks),
+            "keywords": [state.to_dict() for state in self._keywords.values()],
+        }
+
+    async def _produce(self):
+        """폴링할 시각이 된 키워드를 큐에 넣습니다."""
+        while True:
+            if not self._schedule:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            next_poll, keyword = self._schedule[0]
+            delay = next_poll - time.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._schedule)
+            # 큐가 차 있으면 소비자가 따라올 때까지 기다림 (업스트림 호출 수 제한)
+            await self._queue.put(keyword)
+
+    async def _consume(self):
+        while True:
+            keyword = await self._queue.get()
+            try:
+                await self._poll(self._keywords[keyword])
+            finally:
+                self._queue.task_done()
+
+    async def _poll(self, state: KeywordState):
+        now = time.time()
+        try:
+            data = await self._fetch(state.keyword)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.failures += 1
+            state.last_error = str(e)
+            # 실패하면 간격을 늘려서 다시 시도
+            state.interval = min(self.max_interval, max(self.min_interval, state.interval * 2))
+            print(f"[폴링] ❌ {state.keyword} 실패: {str(e)} ({state.interval:.0f}초 후 재시도)")
+            self._reschedule(state, now)
+            return
+
+        items = data.get('items', [])
+        new_items = self._take_new_items(state, items)
+        self._update_rate(state, items, len(new_items), now)
+        state.polls += 1
+        state.new_items += len(new_items)
+        state.last_error = None
+        state.last_poll = now
+        self._reschedule(state, now)
+
+        result = PollResult(state.keyword, data, new_items, state.interval)
+        for callback in self._subscribers:
+            try:
+                await callback(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[폴링] ❌ {state.keyword} 결과 전달 실패: {str(e)}")
+
+    def _take_new_items(self, state: KeywordState, items: list) -> list:
+        """지난 폴링 때 본 가장 최신 기사보다 새 기사만 골라냄"""
+        new_items = []
+        newest, newest_links = state.latest_timestamp, set(state.latest_links)
+        for item in items:
+            timestamp = parse_pub_date(item.get('pubDate'))
+            if timestamp < state.latest_timestamp:
+                continue
+            if timestamp == state.latest_timestamp and item['link'] in state.latest_links:
+                continue
+            new_items.append(item)
+            if timestamp > newest:
+                newest, newest_links = timestamp, {item['link']}
+            elif timestamp == newest:
+                newest_links.add(item['link'])
+        state.latest_timestamp, state.latest_links = newest, newest_links
+        return new_items
+
+    def _update_rate(self, state: KeywordState, items: list, new_count: int, now: float):
+        if state.last_poll is None or (items and new_count >= len(items)):
+            # 첫 폴링이거나 한 페이지가 전부 새 기사면 (놓친 기사가 있을 수 있음)
+            # 페이지 안 기사들의 발행 시각 간격으로 추정
+            timestamps = [t for t in (parse_pub_date(item.get('pubDate')) for item in items) if t]
+            span = max(timestamps) - min(timestamps) if len(timestamps) > 1 else 0
+            observed = (len(timestamps) - 1) / span if span > 0 else 0.0
+        else:
+            observed = new_count / max(1.0, now - state.last_poll)
+
+        if state.rate is None:
+            state.rate = observed
+        else:
+            state.rate = RATE_EWMA_ALPHA * observed + (1 - RATE_EWMA_ALPHA) * state.rate
+
+        if state.rate > 0:
+            state.interval = self.target_new / state.rate
+        else:
+            state.interval = self.max_interval
+        state.interval = min(self.max_interval, max(self.min_interval, state.interval))
+
+    def _reschedule(self, state: KeywordState, now: float):
+        state.next_poll = now + state.interval
+        heapq.heappush(self._schedule, (state.next_poll, state.keyword))
+        self._wakeup.set()
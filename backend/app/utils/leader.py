@@ -0,0 +1,73 @@
+"""
+파일 잠금 기반 리더 선출
+같은 서버에서 여러 워커 프로세스(uvicorn --workers N)가 떠 있을 때
+잠금 파일을 잡은 프로세스 하나만 리더가 됩니다.
+
+잠금은 프로세스가 죽으면 OS가 자동으로 풀어 주므로,
+다른 워커가 주기적으로 다시 시도하면 자연스럽게 리더가 넘어갑니다.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl  # Linux / macOS
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLeaderLock:
+    """비차단(non-blocking) 파일 잠금으로 리더 여부를 관리합니다."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """
+        잠금을 시도합니다. 이미 리더이면 바로 True를 반환합니다.
+
+        Returns:
+            리더 여부
+        """
+        if self._fd is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # 디버깅용으로 리더 PID 기록
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        """잠금을 풀고 리더 자리를 내려놓습니다."""
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            os.close(self._fd)
+            self._fd = None
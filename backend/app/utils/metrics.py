@@ -0,0 +1,358 @@
+"""
+요청 지연 시간 계측
+라우트별 지연 시간을 단계(캐시 조회, 네이버 호출, Supabase 호출, 직렬화)별로 나눠 히스토그램으로 모으고,
+이벤트 루프 지연을 주기적으로 재고, 필요할 때만 샘플링 프로파일러를 켭니다.
+
+- 요청마다 단계별 누적 시간을 contextvar에 담음 (asyncio.to_thread로 넘긴 작업도 같은 요청으로 기록됨)
+- 동시에 실행된 단계(asyncio.gather)는 시간이 합산되므로 단계 합이 전체보다 클 수 있음
+- other = 전체 - 단계 합 (핸들러 코드, 검증, 미들웨어 등)
+- 히스토그램은 고정 버킷이라 요청 수와 상관없이 메모리가 일정함
+- 프로파일러 출력은 접힌 스택(collapsed stack) 형식: flamegraph.pl, speedscope에 그대로 넣을 수 있음
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import httpx
+from fastapi.responses import ORJSONResponse
+
+# 히스토그램 버킷 상한 (ms)
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# 이벤트 루프 지연 측정 주기 (초), 경고를 출력할 지연 (ms)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+LOOP_LAG_WARN_MS = float(os.getenv("LOOP_LAG_WARN_MS", "250"))
+# 프로파일러 최대 실행 시간 (초), 샘플링 간격 (초)
+PROFILE_MAX_SECONDS = 60
+PROFILE_INTERVAL = 0.01
+
+# 현재 요청의 단계별 누적 시간 (초), 요청 밖(백그라운드 작업)에서는 None
+_request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_phases", default=None)
+
+
+def record_phase(name: str, seconds: float):
+    """현재 요청에 단계 시간을 더합니다. (요청 밖이면 무시)"""
+    phases = _request_phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str):
+    """with 블록 실행 시간을 현재 요청의 단계 시간으로 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    """함수 실행 시간을 단계 시간으로 기록하는 데코레이터 (async 함수도 가능)"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _request_phases.get() is None:
+                    return await func(*args, **kwargs)
+                with phase(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _request_phases.get() is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_http_client(client, name: str):
+    """
+    httpx 동기/비동기 클라이언트의 요청 시간(응답 헤더를 받을 때까지)을 단계 시간으로 기록합니다.
+    라이브러리 안에서 만든 클라이언트(Supabase 등)에 쓰며, 기존 이벤트 훅은 유지합니다.
+    """
+    def on_request(request):
+        request.extensions["phase_started"] = time.perf_counter()
+
+    def on_response(response):
+        started = response.request.extensions.get("phase_started")
+        if started is not None:
+            record_phase(name, time.perf_counter() - started)
+
+    if isinstance(client, httpx.AsyncClient):
+        async def async_on_request(request):
+            on_request(request)
+
+        async def async_on_response(response):
+            on_response(response)
+        hooks = (async_on_request, async_on_response)
+    else:
+        hooks = (on_request, on_response)
+
+    event_hooks = client.event_hooks
+    client.event_hooks = {
+        "request": list(event_hooks.get("request", [])) + [hooks[0]],
+        "response": list(event_hooks.get("response", [])) + [hooks[1]],
+    }
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """본문 직렬화 시간을 serialize 단계로 기록하는 ORJSONResponse"""
+
+    def render(self, content) -> bytes:
+        with phase("serialize"):
+            return super().render(content)
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램 (ms)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 분위수가 들어 있는 버킷의 상한 (마지막 버킷이면 최대값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {
+                (f"le_{bound}" if i < len(LATENCY_BUCKETS_MS) else "inf"): count
+                for i, (bound, count) in enumerate(zip(LATENCY_BUCKETS_MS + (None,), self.counts))
+                if count
+            },
+        }
+
+
+class RouteLatency:
+    """라우트 하나의 전체/단계별 히스토그램"""
+
+    def __init__(self):
+        self.total = LatencyHistogram()
+        self.phases: Dict[str, LatencyHistogram] = {}
+        self.statuses: Counter = Counter()
+
+    def observe(self, total_ms: float, phases: Dict[str, float], status: int):
+        self.total.observe(total_ms)
+        self.statuses[str(status)] += 1
+        phase_ms = 0.0
+        for name, seconds in phases.items():
+            ms = seconds * 1000
+            phase_ms += ms
+            self._phase(name).observe(ms)
+        self._phase("other").observe(max(0.0, total_ms - phase_ms))
+
+    def _phase(self, name: str) -> LatencyHistogram:
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = LatencyHistogram()
+        return histogram
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total.to_dict(),
+            "statuses": dict(self.statuses),
+            "phases": {name: histogram.to_dict() for name, histogram in sorted(self.phases.items())},
+        }
+
+
+class LatencyRegistry:
+    """라우트(메서드 + 경로 템플릿)별 지연 시간"""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteLatency] = {}
+        self.started_at = time.time()
+
+    def observe(self, route: str, total_ms: float, phases: Dict[str, float], status: int):
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteLatency()
+        stats.observe(total_ms, phases, status)
+
+    def reset(self):
+        self.routes = {}
+        self.started_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "since": self.started_at,
+            "buckets_ms": list(LATENCY_BUCKETS_MS),
+            "routes": {route: stats.to_dict() for route, stats in sorted(self.routes.items())},
+        }
+
+
+class LatencyMiddleware:
+    """
+    요청마다 전체 시간과 단계 시간을 라우트별로 기록하는 ASGI 미들웨어
+    경로는 /api/news/article/{id} 같은 템플릿으로 모으고, 라우트가 없는 요청(404)은 하나로 묶습니다.
+    """
+
+    def __init__(self, app, registry: "LatencyRegistry" = None):
+        self.app = app
+        self.registry = registry or latency_registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        token = _request_phases.set(phases)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            _request_phases.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "(unmatched)"
+            self.registry.observe(f"{scope['method']} {path}", total_ms, phases, status)
+
+
+class LoopLagMonitor:
+    """
+    이벤트 루프 지연 측정: interval마다 잠들었다 깨어난 시각이 예정보다 얼마나 늦었는지
+    (동기 Supabase 호출처럼 루프를 막는 코드가 있으면 커짐)
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, warn_ms: float = LOOP_LAG_WARN_MS):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self.histogram = LatencyHistogram()
+        self.last_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - started - self.interval) * 1000)
+            self.last_ms = lag_ms
+            self.histogram.observe(lag_ms)
+            if lag_ms >= self.warn_ms:
+                print(f"[서버] ⚠ 이벤트 루프 지연 {lag_ms:.0f}ms")
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "last_ms": round(self.last_ms, 2) if self.last_ms is not None else None,
+            **self.histogram.to_dict(),
+        }
+
+
+class SamplingProfiler:
+    """
+    스레드 스택 샘플링 프로파일러 (한 번에 하나만 실행)
+    interval마다 sys._current_frames()로 스택을 읽어서 같은 스택의 횟수를 셉니다.
+    실행 중인 코드를 멈추거나 추적 훅을 걸지 않으므로 켜 두는 동안에도 부담이 적습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, interval: float = PROFILE_INTERVAL,
+            thread_ids: Optional[set] = None) -> Optional[Dict[str, int]]:
+        """
+        seconds 동안 샘플링합니다. (호출한 스레드를 막으므로 asyncio.to_thread로 실행)
+
+        Args:
+            thread_ids: 샘플링할 스레드 (None이면 자기 자신을 뺀 모든 스레드)
+
+        Returns:
+            {접힌 스택: 샘플 수}, 이미 실행 중이면 None
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            own_id = threading.get_ident()
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id or (thread_ids is not None and thread_id not in thread_ids):
+                        continue
+                    stacks[_collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+                time.sleep(interval)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+
+def _collapse(thread_name: str, frame) -> str:
+    """스택을 '스레드;바깥 함수;...;안쪽 함수' 한 줄로"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names)).replace(" ", "_")
+
+
+def format_collapsed(stacks: Dict[str, int]) -> str:
+    """flamegraph.pl/speedscope 입력 형식 ('스택 횟수' 한 줄씩)"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+latency_registry = LatencyRegistry()
+loop_lag_monitor = LoopLagMonitor()
+profiler = SamplingProfiler()
@@ -0,0 +1,334 @@
+"""
+네이버 뉴스 검색 API 클라이언트
+- 프로세스 전체에서 하나의 httpx.AsyncClient(커넥션 풀)를 재사용
+- 토큰 버킷으로 초당 업스트림 호출 수를 제한
+- 서킷 브레이커: 429/시간 초과/5xx가 연달아 나면 잠시 호출을 멈춤 (Retry-After 반영)
+- 동시 호출 수와 대기 줄 길이 제한 (utils/admission.py, 가득 차면 바로 UpstreamBusy)
+- 응답을 받을 때 title/description의 <b> 강조 태그와 HTML 엔티티를 한 번만 정리 (캐시에도 정리된 값이 들어감)
+- 기사마다 고정 ID(id)를 붙이고 ID → 기사 색인에 추가 (utils/articles.py)
+"""
+
+import asyncio
+import html
+import os
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from utils.admission import AdmissionRejected, upstream_admission
+from utils.articles import article_id, article_index
+from utils.bursts import burst_detector
+from utils.metrics import timed
+
+NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
+NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
+NAVER_API_URL = os.getenv("NAVER_API_URL", "https://openapi.naver.com/v1/search/news.json")  # 벤치마크 시 로컬 목 서버로 교체
+
+# 업스트림 호출 제한 (초당 요청 수, 순간 최대 요청 수)
+NAVER_RATE_LIMIT = float(os.getenv("NAVER_RATE_LIMIT", "10"))
+NAVER_RATE_BURST = int(os.getenv("NAVER_RATE_BURST", "10"))
+NAVER_TIMEOUT = 10.0
+
+# 서킷 브레이커: 연속 실패 횟수, 처음 열려 있는 시간(초), 최대 열려 있는 시간(초)
+NAVER_BREAKER_THRESHOLD = int(os.getenv("NAVER_BREAKER_THRESHOLD", "5"))
+NAVER_BREAKER_OPEN_SECONDS = float(os.getenv("NAVER_BREAKER_OPEN_SECONDS", "30"))
+NAVER_BREAKER_MAX_OPEN_SECONDS = float(os.getenv("NAVER_BREAKER_MAX_OPEN_SECONDS", "300"))
+# 반열림(half-open) 상태에서 보내는 확인용 요청
+_PROBE_QUERY = "보안"
+
+# 정리할 텍스트 필드 (검색어 강조 <b> 태그와 &quot; 같은 엔티티가 들어 있음)
+_TEXT_FIELDS = ("title", "description")
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class NaverAPIError(Exception):
+    """네이버 API가 200이 아닌 응답을 돌려줌"""
+
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(message or f"네이버 API 오류: {status_code}")
+        self.status_code = status_code
+
+
+class NaverRateLimited(NaverAPIError):
+    """네이버 API가 429를 돌려줌"""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(429, "네이버 API 요청 한도 초과")
+        self.retry_after = retry_after
+
+
+class NaverCircuitOpen(NaverAPIError):
+    """서킷 브레이커가 열려 있어서 호출하지 않음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(503, "네이버 API 일시 중단 (서킷 브레이커 열림)")
+        self.retry_after = retry_after
+
+
+class UpstreamBusy(NaverAPIError):
+    """동시 호출 수와 대기 줄이 가득 차서 호출하지 않음 (입장 제어)"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(503, "네이버 API 호출 대기열이 가득 찼습니다")
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    닫힘(closed) -> 연속 실패 threshold번 -> 열림(open) -> 대기 시간 후 반열림(half_open)
+    반열림에서는 확인용 요청 하나만 보내고, 성공하면 닫힘, 실패하면 대기 시간을 두 배로 늘려 다시 열림
+    """
+
+    def __init__(self, threshold: int, open_seconds: float, max_open_seconds: float):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.retry_at = 0.0
+        self._cooldown = open_seconds
+        self._probe_in_flight = False
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        """지금 호출하면 거절되는지 (반열림에서 확인 요청이 진행 중이어도 True)"""
+        if self.state == "closed":
+            return False
+        if self.state == "open":
+            return time.time() < self.retry_at
+        return self._probe_in_flight
+
+    def probe_due(self) -> bool:
+        return self.state == "open" and time.time() >= self.retry_at
+
+    def before_call(self):
+        """
+        호출해도 되는지 확인합니다.
+
+        Raises:
+            NaverCircuitOpen: 열려 있거나, 반열림에서 이미 확인 요청이 진행 중
+        """
+        if self.state == "closed":
+            return
+        now = time.time()
+        if self.state == "open" and now >= self.retry_at:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected += 1
+        raise NaverCircuitOpen(max(1.0, self.retry_at - now))
+
+    def record_success(self):
+        if self.state != "closed":
+            print("[네이버] 서킷 브레이커 닫힘 (업스트림 복구)")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._cooldown = self.open_seconds
+        self._probe_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        self.consecutive_failures += 1
+        if self.state == "half_open":
+            # 확인 요청 실패: 대기 시간을 늘려서 다시 열림
+            self._cooldown = min(self.max_open_seconds, self._cooldown * 2)
+            self._open(max(self._cooldown, retry_after or 0))
+        elif self.state == "closed":
+            if self.consecutive_failures >= self.threshold:
+                self._open(max(self._cooldown, retry_after or 0))
+            elif retry_after:
+                # Retry-After를 받으면 연속 실패 횟수와 상관없이 그 시간 동안은 호출하지 않음
+                self._open(min(retry_after, self.max_open_seconds))
+
+    def release_probe(self):
+        """확인 요청이 성공/실패로 판정되지 않고 끝난 경우 (예: 400 응답)"""
+        self._probe_in_flight = False
+
+    def _open(self, wait: float):
+        now = time.time()
+        self.state = "open"
+        self.opened_at = now
+        self.retry_at = now + wait
+        self._probe_in_flight = False
+        self.opens += 1
+        print(f"[네이버] ⚠ 서킷 브레이커 열림: 연속 실패 {self.consecutive_failures}회, {wait:.0f}초 동안 호출 중단")
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(max(0.0, self.retry_at - time.time()), 1) if self.state != "closed" else 0,
+            "opens_total": self.opens,
+            "rejected_total": self.rejected,
+        }
+
+
+class TokenBucket:
+    """asyncio용 토큰 버킷 (대기 순서대로 토큰을 받음)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 하나를 받을 때까지 기다립니다."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def headroom(self) -> float:
+        """지금 남아 있는 토큰 비율 (0~1)"""
+        self._refill()
+        return self._tokens / self.capacity
+
+
+rate_limiter = TokenBucket(NAVER_RATE_LIMIT, NAVER_RATE_BURST)
+breaker = CircuitBreaker(NAVER_BREAKER_THRESHOLD, NAVER_BREAKER_OPEN_SECONDS, NAVER_BREAKER_MAX_OPEN_SECONDS)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def is_configured() -> bool:
+    return bool(NAVER_CLIENT_ID and NAVER_CLIENT_SECRET)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 httpx 클라이언트 (연결을 재사용)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=NAVER_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """서버 종료 시 공유 httpx 클라이언트를 닫습니다."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def clean_text(text: Optional[str]) -> str:
+    """태그를 지우고 HTML 엔티티를 풀어서 일반 텍스트로 (공백은 하나로)"""
+    if not text:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub("", text))).strip()
+
+
+def normalize_items(items: list) -> list:
+    """검색 결과 items의 title/description을 일반 텍스트로 바꾸고 고정 ID를 붙입니다. (제자리에서 수정)"""
+    for item in items:
+        for field in _TEXT_FIELDS:
+            if field in item:
+                item[field] = clean_text(item[field])
+        item["id"] = article_id(item)
+    return items
+
+
+@timed("naver")
+async def fetch_news(query: str, display: int = 10, start: int = 1, sort: str = "date") -> dict:
+    """
+    네이버 뉴스 검색 API를 호출합니다. (서킷 브레이커, 초당 호출 수 제한 적용)
+    title/description은 태그와 HTML 엔티티를 정리한 일반 텍스트로 돌려주고, 기사마다 고정 ID(id)를 붙입니다.
+
+    Raises:
+        NaverCircuitOpen: 서킷 브레이커가 열려 있음 (호출하지 않음)
+        UpstreamBusy: 동시 호출 수와 대기 줄이 가득 참 (호출하지 않음)
+        NaverRateLimited: 429 응답
+        NaverAPIError: 그 밖의 200이 아닌 응답
+        httpx.TimeoutException: 시간 초과
+    """
+    breaker.before_call()
+
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
+    }
+    params = {
+        "query": query,
+        "display": display,
+        "start": start,
+        "sort": sort
+    }
+    try:
+        async with upstream_admission.slot():
+            await rate_limiter.acquire()
+            response = await get_http_client().get(NAVER_API_URL, headers=headers, params=params)
+    except AdmissionRejected as e:
+        breaker.release_probe()
+        raise UpstreamBusy(e.retry_after) from None
+    except httpx.TransportError:
+        # 시간 초과, 연결 실패
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release_probe()
+        raise
+
+    if response.status_code == 429:
+        retry_after = _parse_retry_after(response.headers.get("retry-after"))
+        breaker.record_failure(retry_after)
+        raise NaverRateLimited(retry_after)
+    if response.status_code >= 500:
+        breaker.record_failure()
+        raise NaverAPIError(response.status_code)
+    if response.status_code != 200:
+        # 인증 오류 등은 업스트림 장애가 아니므로 브레이커에 반영하지 않음
+        breaker.release_probe()
+        raise NaverAPIError(response.status_code)
+    breaker.record_success()
+    data = response.json()
+    items = normalize_items(data.get("items", []))
+    article_index.add(items)
+    burst_detector.observe(items)
+    return data
+
+
+async def probe_upstream():
+    """
+    서킷 브레이커가 열려 있고 대기 시간이 지났으면 확인용 요청을 한 번 보냅니다.
+    (작업 실행기가 주기적으로 실행, 사용자 요청이 없어도 복구되도록)
+    """
+    if not is_configured() or not breaker.probe_due():
+        return
+    try:
+        await fetch_news(_PROBE_QUERY, display=1)
+    except (NaverAPIError, httpx.TransportError) as e:
+        print(f"[네이버] 확인 요청 실패: {str(e) or type(e).__name__}")
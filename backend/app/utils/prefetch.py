@@ -0,0 +1,172 @@
+"""
+검색 다음 페이지 미리 가져오기 (speculative prefetch)
+같은 검색어로 start를 display씩 늘려 가며 페이지를 넘기는 패턴을 보면,
+다음 페이지를 백그라운드에서 미리 가져와 캐시에 넣어 둡니다. (다음 요청은 캐시 히트)
+
+- 순서대로 넘기는 중(start = 이전 start + display)이면 헤드룸이 PREFETCH_MIN_HEADROOM 이상일 때만 미리 가져옴
+  (PREFETCH_FIRST_PAGE=true면 첫 페이지에서도, 더 여유 있을 때(PREFETCH_FIRST_PAGE_HEADROOM)만
+  - 한 번 보고 마는 검색마다 호출이 하나 더 생기므로 기본값은 꺼짐)
+- 검색어마다 PREFETCH_WINDOW초 동안 최대 PREFETCH_BUDGET 페이지까지만
+- 서킷 브레이커가 열려 있거나, 이미 캐시에 있거나, 네이버 API 한도(start 1000) 밖이면 건너뜀
+- 업스트림 입장 제어(admission)에 남은 자리가 PREFETCH_MIN_FREE_SLOTS개보다 적거나 기다리는 호출이 있으면 건너뜀
+  (미리 가져오기가 사용자 요청의 자리를 차지하거나 대기 줄을 채워서 거절당하게 하지 않도록)
+- 동시에 PREFETCH_CONCURRENCY개까지만 실행하고, 실행 직전에 헤드룸을 다시 확인 (사용자 요청 우선)
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_BUDGET = int(os.getenv("PREFETCH_BUDGET", "5"))
+PREFETCH_WINDOW = float(os.getenv("PREFETCH_WINDOW", "600"))
+PREFETCH_MIN_HEADROOM = float(os.getenv("PREFETCH_MIN_HEADROOM", "0.5"))
+PREFETCH_FIRST_PAGE = os.getenv("PREFETCH_FIRST_PAGE", "false").lower() == "true"
+PREFETCH_FIRST_PAGE_HEADROOM = float(os.getenv("PREFETCH_FIRST_PAGE_HEADROOM", "0.8"))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+PREFETCH_MIN_FREE_SLOTS = int(os.getenv("PREFETCH_MIN_FREE_SLOTS", "4"))
+# 네이버 검색 API의 최대 start
+MAX_START = 1000
+# 페이지 넘김을 기억하는 검색 수
+_MAX_TRACKED = 2000
+
+# (query, display, sort)
+PagingKey = Tuple[str, int, str]
+
+
+class PagePrefetcher:
+    """검색 페이지 넘김을 보고 다음 페이지를 미리 가져옴"""
+
+    def __init__(
+        self,
+        load: Callable[[str, int, int, str], Awaitable],
+        is_cached: Callable[[str, int, int, str], bool],
+        headroom: Callable[[], float],
+        upstream_open: Callable[[], bool],
+        free_slots: Callable[[], int],
+        budget: int = PREFETCH_BUDGET,
+        window: float = PREFETCH_WINDOW,
+        concurrency: int = PREFETCH_CONCURRENCY,
+    ):
+        self._load = load
+        self._is_cached = is_cached
+        self._headroom = headroom
+        self._upstream_open = upstream_open
+        self._free_slots = free_slots
+        self.budget = budget
+        self.window = window
+        self.concurrency = max(1, concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 검색별 마지막 start와 예산 사용 현황 [마지막 start, 윈도우 시작 시각, 사용한 페이지 수]
+        self._paging: "OrderedDict[PagingKey, list]" = OrderedDict()
+        # 미리 가져온 페이지 (사용자가 실제로 요청하면 used로 셈)
+        self._prefetched: "OrderedDict[tuple, None]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            "scheduled": 0, "prefetched": 0, "used": 0, "failed": 0,
+            "skipped_cached": 0, "skipped_budget": 0, "skipped_headroom": 0, "skipped_upstream": 0,
+            "skipped_admission": 0,
+        }
+
+    def observe(self, query: str, display: int, start: int, sort: str):
+        """검색 요청 하나를 기록하고, 순서대로 넘기는 중이면 다음 페이지를 예약합니다."""
+        page = (query, display, start, sort)
+        if page in self._prefetched:
+            del self._prefetched[page]
+            self.stats["used"] += 1
+
+        if not PREFETCH_ENABLED:
+            return
+        key = (query, display, sort)
+        now = time.time()
+        state = self._paging.get(key)
+        if state is None:
+            state = [None, now, 0]
+        self._paging[key] = state
+        self._paging.move_to_end(key)
+        while len(self._paging) > _MAX_TRACKED:
+            self._paging.popitem(last=False)
+
+        last_start, state[0] = state[0], start
+        if last_start is not None and start == last_start + display:
+            min_headroom = PREFETCH_MIN_HEADROOM
+        elif start == 1 and PREFETCH_FIRST_PAGE:
+            min_headroom = PREFETCH_FIRST_PAGE_HEADROOM
+        else:
+            # 건너뛰기/뒤로 가기는 패턴이 아님
+            return
+
+        next_start = start + display
+        if next_start > MAX_START:
+            return
+        if self._is_cached(query, display, next_start, sort):
+            self.stats["skipped_cached"] += 1
+            return
+        if self._upstream_open():
+            self.stats["skipped_upstream"] += 1
+            return
+        if self._free_slots() < PREFETCH_MIN_FREE_SLOTS:
+            self.stats["skipped_admission"] += 1
+            return
+        if self._headroom() < min_headroom:
+            self.stats["skipped_headroom"] += 1
+            return
+        if now - state[1] >= self.window:
+            state[1], state[2] = now, 0
+        if state[2] >= self.budget:
+            self.stats["skipped_budget"] += 1
+            return
+
+        state[2] += 1
+        self.stats["scheduled"] += 1
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        # 요청의 컨텍스트(지연 시간 계측 등)를 물려받지 않도록 빈 컨텍스트에서 실행
+        task = contextvars.Context().run(
+            asyncio.create_task, self._prefetch(query, display, next_start, sort, min_headroom)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _prefetch(self, query: str, display: int, start: int, sort: str, min_headroom: float):
+        async with self._semaphore:
+            # 기다리는 동안 사용자 요청이 가져갔거나 업스트림 여유가 줄었으면 건너뜀
+            if self._is_cached(query, display, start, sort):
+                self.stats["skipped_cached"] += 1
+                return
+            if self._upstream_open() or self._headroom() < min_headroom:
+                self.stats["skipped_headroom"] += 1
+                return
+            if self._free_slots() < PREFETCH_MIN_FREE_SLOTS:
+                self.stats["skipped_admission"] += 1
+                return
+            try:
+                await self._load(query, display, start, sort)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"⚠ 다음 페이지 미리 가져오기 실패: {query} (start={start}) - {str(e)}")
+                return
+        self.stats["prefetched"] += 1
+        self._prefetched[(query, display, start, sort)] = None
+        while len(self._prefetched) > _MAX_TRACKED:
+            self._prefetched.popitem(last=False)
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def status(self) -> dict:
+        return {
+            "enabled": PREFETCH_ENABLED,
+            "first_page": PREFETCH_FIRST_PAGE,
+            "budget_per_query": self.budget,
+            "window_seconds": self.window,
+            "in_flight": len(self._tasks),
+            **self.stats,
+        }
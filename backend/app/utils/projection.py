@@ -0,0 +1,70 @@
+"""
+검색 결과 필드 선택 (projection)
+목록 화면처럼 일부 필드만 필요한 클라이언트를 위해 items의 필드를 골라서 보냅니다.
+
+- fields=title,pubDate 처럼 고르거나 compact=true로 목록용 필드(title, originallink, pubDate)만
+- 고른 필드로 인코딩한 본문은 캐시 항목에 붙여 두고 재사용 (같은 요청마다 다시 만들지 않음)
+- title/description은 네이버 응답을 받을 때 이미 일반 텍스트로 정리되어 있음 (utils/naver_client.py)
+"""
+
+from typing import Optional, Tuple
+
+from utils.cache import CacheEntry, derived_entry
+
+# 네이버 검색 결과 기사 필드
+NEWS_FIELDS = ("title", "originallink", "link", "description", "pubDate")
+# compact=true일 때 보내는 필드 (목록 화면용)
+COMPACT_FIELDS = ("title", "originallink", "pubDate")
+# 캐시 항목 하나에 붙여 둘 필드 조합 수
+MAX_VARIANTS = 8
+
+Fields = Tuple[str, ...]
+
+
+def parse_fields(fields: Optional[str], compact: bool = False) -> Optional[Fields]:
+    """
+    fields 파라미터(쉼표 구분)와 compact를 필드 목록으로 바꿉니다.
+
+    Returns:
+        고른 필드 (NEWS_FIELDS 순서), 전체 필드면 None
+
+    Raises:
+        ValueError: 알 수 없는 필드
+    """
+    if fields:
+        wanted = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = wanted.difference(NEWS_FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 필드: {', '.join(sorted(unknown))} (가능한 필드: {', '.join(NEWS_FIELDS)})")
+    elif compact:
+        wanted = set(COMPACT_FIELDS)
+    else:
+        return None
+    selected = tuple(name for name in NEWS_FIELDS if name in wanted)
+    return None if len(selected) == len(NEWS_FIELDS) else selected
+
+
+def project_item(item: dict, fields: Fields) -> dict:
+    """기사 필드 중 고른 것만 남김 (피드의 category/timestamp처럼 기사 필드가 아닌 값은 유지)"""
+    return {key: value for key, value in item.items() if key in fields or key not in NEWS_FIELDS}
+
+
+def project_data(data: dict, fields: Optional[Fields]) -> dict:
+    """검색 결과(total, items 등)의 items만 고른 필드로"""
+    if fields is None:
+        return data
+    return dict(data, items=[project_item(item, fields) for item in data.get("items", [])])
+
+
+def projected_entry(entry: CacheEntry, fields: Optional[Fields]) -> CacheEntry:
+    """고른 필드로 인코딩한 캐시 항목 (처음 요청될 때 만들어서 entry에 붙여 둠)"""
+    if fields is None:
+        return entry
+    if entry.variants is None:
+        entry.variants = {}
+    variant = entry.variants.get(fields)
+    if variant is None:
+        variant = derived_entry(entry, project_data(entry.data, fields))
+        if len(entry.variants) < MAX_VARIANTS:
+            entry.variants[fields] = variant
+    return variant
@@ -0,0 +1,72 @@
+"""
+검색어 정규화 (canonicalization)
+같은 뜻의 검색어가 캐시 키, 동시 요청 합치기, 검색어 통계에서 따로 세지지 않도록
+캐시를 찾기 전에 검색어를 한 가지 형태로 바꿉니다.
+
+1. 유니코드 NFKC 정규화 (입력기에 따라 다른 NFD 한글 자모, 전각 영숫자를 하나로)
+2. 앞뒤 공백 제거, 연속 공백은 하나로
+3. 대소문자 통일 (casefold, 네이버 검색은 대소문자를 구분하지 않음)
+4. 별칭 표: "ransomware" → "랜섬웨어" 처럼 검색어 전체가 별칭이면 대표 검색어로
+   (기본 별칭 + QUERY_ALIASES_PATH의 JSON {"대표 검색어": ["별칭", ...]}, QUERY_ALIASES_ENABLED=false면 끔)
+"""
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable
+
+import orjson
+
+QUERY_ALIASES_ENABLED = os.getenv("QUERY_ALIASES_ENABLED", "true").lower() == "true"
+QUERY_ALIASES_PATH = os.getenv("QUERY_ALIASES_PATH")
+
+# 기본 별칭 (대표 검색어: 별칭들)
+DEFAULT_QUERY_ALIASES: Dict[str, list] = {
+    "랜섬웨어": ["ransomware"],
+    "악성코드": ["malware", "멀웨어"],
+    "피싱": ["phishing"],
+    "디도스": ["ddos"],
+    "개인정보": ["개인 정보"],
+    "사이버보안": ["사이버 보안", "cybersecurity", "cyber security"],
+}
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """유니코드/공백/대소문자만 정규화 (별칭은 적용하지 않음)"""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip().casefold()
+
+
+def _build_alias_table(groups: Dict[str, Iterable[str]]) -> Dict[str, str]:
+    table = {}
+    for canonical, aliases in groups.items():
+        target = normalize_query(canonical)
+        for alias in aliases:
+            alias = normalize_query(alias)
+            if alias and alias != target:
+                table[alias] = target
+    return table
+
+
+def _load_alias_groups() -> Dict[str, list]:
+    groups = {name: list(aliases) for name, aliases in DEFAULT_QUERY_ALIASES.items()}
+    if QUERY_ALIASES_PATH:
+        try:
+            with open(QUERY_ALIASES_PATH, "rb") as f:
+                for canonical, aliases in orjson.loads(f.read()).items():
+                    groups.setdefault(canonical, []).extend(aliases)
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[검색어] 별칭 파일을 읽지 못했습니다: {QUERY_ALIASES_PATH} - {str(e)}")
+    return groups
+
+
+_aliases: Dict[str, str] = _build_alias_table(_load_alias_groups()) if QUERY_ALIASES_ENABLED else {}
+
+
+@lru_cache(maxsize=4096)
+def canonical_query(query: str) -> str:
+    """캐시 키, 업스트림 호출, 검색어 통계에 쓰는 대표 검색어"""
+    normalized = normalize_query(query)
+    return _aliases.get(normalized, normalized)
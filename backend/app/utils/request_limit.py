@@ -0,0 +1,209 @@
+"""
+들어오는 요청 제한 (슬라이딩 윈도우 카운터)
+클라이언트 하나가 캐시 미스를 계속 만들어서 네이버 API 호출을 독차지하지 못하게,
+라우트마다 IP/사용자별 요청 수를 제한합니다.
+
+- 라우트마다 전체 요청 한도(hit)와 캐시 미스 한도(miss)를 따로 둠 (미스는 두 한도를 모두 씀)
+- 슬라이딩 윈도우는 카운터 두 개(지난 윈도우, 현재 윈도우)로 근사: 지난 윈도우 수 × 남은 비율 + 현재 윈도우 수
+- 카운터는 최근 사용 순서(OrderedDict)로 보관하고, 윈도우 두 개가 지난 카운터는 앞에서부터 정리,
+  최대 개수를 넘으면 가장 오래 안 쓴 카운터부터 버림 (메모리 상한)
+- 라우트에서 토큰을 검증한 요청(mark_verified)은 사용자별 + IP별(여러 사용자가 같은 IP를 쓸 수 있으므로 한도 × RATE_LIMIT_IP_FACTOR),
+  그 밖의 요청은 Bearer 토큰이 있어도 IP별로 셈 (검증하지 않은 토큰으로 IP 한도를 늘릴 수 없도록)
+- 워커 프로세스마다 따로 셈 (전체 한도는 워커 수만큼 커짐)
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# 윈도우 길이 (초)
+RATE_LIMIT_WINDOW = float(os.getenv("RATE_LIMIT_WINDOW", "60"))
+# 보관하는 카운터 최대 개수
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "50000"))
+# 로그인 요청의 IP별 한도 배수
+RATE_LIMIT_IP_FACTOR = int(os.getenv("RATE_LIMIT_IP_FACTOR", "3"))
+# 프록시 뒤에서 실행할 때만 X-Forwarded-For를 믿음
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+
+class RouteLimit:
+    """라우트 하나의 윈도우당 한도 (전체 요청 수, 캐시 미스 수)"""
+
+    def __init__(self, hit: int, miss: int):
+        self.hit = hit
+        self.miss = miss
+
+    def to_dict(self) -> dict:
+        return {"hit": self.hit, "miss": self.miss}
+
+
+# 라우트별 기본 한도 (윈도우당)
+# RATE_LIMIT_ROUTES="search=120/20,feed=60/10" 처럼 환경변수로 바꿀 수 있음
+DEFAULT_ROUTE_LIMITS: Dict[str, RouteLimit] = {
+    "search": RouteLimit(120, 20),
+    "search-batch": RouteLimit(30, 20),  # 미스는 캐시에 없는 검색어 수만큼 셈
+    "feed": RouteLimit(120, 20),
+    "category-stats": RouteLimit(60, 5),
+    "category-volume": RouteLimit(120, 120),
+}
+
+
+def _parse_route_limits(value: str) -> Dict[str, RouteLimit]:
+    limits = dict(DEFAULT_ROUTE_LIMITS)
+    for rule in filter(None, (part.strip() for part in value.split(","))):
+        try:
+            route, counts = rule.split("=")
+            hit, miss = counts.split("/")
+            limits[route.strip()] = RouteLimit(int(hit), int(miss))
+        except ValueError:
+            print(f"[요청 제한] 잘못된 RATE_LIMIT_ROUTES 항목 무시: {rule}")
+    return limits
+
+
+class SlidingWindowCounter:
+    """키별 슬라이딩 윈도우 카운터 (메모리 상한 있음)"""
+
+    def __init__(self, window: float = RATE_LIMIT_WINDOW, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [현재 윈도우 시작 시각, 지난 윈도우 수, 현재 윈도우 수] (최근 사용 순서)
+        self._counters: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _counter(self, key: str, now: float) -> List[float]:
+        window_start = now - now % self.window
+        counter = self._counters.get(key)
+        if counter is None:
+            return [window_start, 0, 0]
+        if counter[0] != window_start:
+            # 바로 앞 윈도우면 현재 수가 지난 윈도우 수가 되고, 더 오래됐으면 둘 다 0
+            previous = counter[2] if window_start - counter[0] == self.window else 0
+            counter[:] = [window_start, previous, 0]
+        return counter
+
+    def _estimate(self, counter: List[float], now: float) -> float:
+        elapsed = (now - counter[0]) / self.window
+        return counter[1] * (1 - elapsed) + counter[2]
+
+    def check(self, key: str, limit: int, cost: int = 1, now: Optional[float] = None) -> float:
+        """
+        cost만큼 더 세도 한도 안인지 확인합니다. (세지는 않음)
+
+        Returns:
+            0이면 허용, 아니면 다시 시도할 수 있을 때까지 남은 시간 (초)
+        """
+        now = time.time() if now is None else now
+        counter = self._counter(key, now)
+        if self._estimate(counter, now) + cost <= limit:
+            return 0.0
+        return self._retry_after(counter, limit, cost, now)
+
+    def _retry_after(self, counter: List[float], limit: int, cost: int, now: float) -> float:
+        elapsed = now - counter[0]
+        previous, current = counter[1], counter[2]
+        if cost > limit:
+            return self.window
+        # 현재 윈도우 안에서 지난 윈도우 몫이 줄어드는 것만으로 충분한 경우
+        room = limit - current - cost
+        if room >= 0 and previous > 0:
+            return max(0.0, self.window * (1 - room / previous) - elapsed)
+        # 다음 윈도우에서 현재 수가 지난 윈도우 몫으로 줄어들 때까지
+        wait_next = self.window * (1 - (limit - cost) / current) if current > 0 else 0.0
+        return (self.window - elapsed) + max(0.0, wait_next)
+
+    def add(self, key: str, cost: int = 1, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        counter = self._counter(key, now)
+        counter[2] += cost
+        self._counters[key] = counter
+        self._counters.move_to_end(key)
+        self._evict(now)
+
+    def _evict(self, now: float):
+        # 앞쪽(가장 오래 안 쓴 키)부터 윈도우 두 개가 지난 카운터 정리
+        expired_before = now - now % self.window - self.window
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[0] >= expired_before and len(self._counters) <= self.max_keys:
+                break
+            self._counters.popitem(last=False)
+
+
+class RequestLimiter:
+    """라우트별 한도를 IP/사용자 카운터에 적용"""
+
+    def __init__(self, limits: Dict[str, RouteLimit], window: float = RATE_LIMIT_WINDOW,
+                 max_keys: int = RATE_LIMIT_MAX_KEYS, ip_factor: int = RATE_LIMIT_IP_FACTOR):
+        self.limits = limits
+        self.ip_factor = max(1, ip_factor)
+        self.counter = SlidingWindowCounter(window, max_keys)
+        self.rejected: Dict[str, int] = {}
+
+    def _clients(self, request: Request) -> List[Tuple[str, int]]:
+        """(클라이언트 키, 한도 배수) 목록"""
+        ip = None
+        if RATE_LIMIT_TRUST_PROXY:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                ip = forwarded.split(",")[0].strip()
+        if not ip:
+            ip = request.client.host if request.client else "unknown"
+
+        user = getattr(request.state, "rate_limit_user", None)
+        if user:
+            return [(f"user:{user}", 1), (f"ip:{ip}", self.ip_factor)]
+        return [(f"ip:{ip}", 1)]
+
+    def hit(self, request: Request, route: str, misses: int = 0):
+        """
+        요청 하나(캐시 미스 misses개 포함)를 세고, 한도를 넘으면 429를 던집니다.
+        한도를 넘은 요청은 세지 않습니다.
+
+        Raises:
+            HTTPException: 429 (Retry-After 헤더 포함)
+        """
+        limit = self.limits.get(route)
+        if not RATE_LIMIT_ENABLED or limit is None:
+            return
+
+        now = time.time()
+        checks = []
+        for client, factor in self._clients(request):
+            checks.append((f"{route}:{client}", limit.hit * factor, 1))
+            if misses:
+                checks.append((f"{route}:miss:{client}", limit.miss * factor, misses))
+
+        # 모두 확인한 뒤에 셈 (일부만 세고 거절하지 않도록)
+        retry_after = max(self.counter.check(key, count, cost, now) for key, count, cost in checks)
+        if retry_after > 0:
+            self.rejected[route] = self.rejected.get(route, 0) + 1
+            raise HTTPException(
+                status_code=429,
+                detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+            )
+        for key, _, cost in checks:
+            self.counter.add(key, cost, now)
+
+    def status(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "window_seconds": self.counter.window,
+            "tracked_keys": len(self.counter),
+            "limits": {route: limit.to_dict() for route, limit in self.limits.items()},
+            "rejected": dict(self.rejected),
+        }
+
+
+def mark_verified(request: Request, user_id: str):
+    """토큰을 검증한 사용자로 표시 (hit 전에 호출하면 사용자별 한도와 IP 한도 × RATE_LIMIT_IP_FACTOR를 씀)"""
+    request.state.rate_limit_user = user_id
+
+
+request_limiter = RequestLimiter(_parse_route_limits(os.getenv("RATE_LIMIT_ROUTES", "")))
@@ -0,0 +1,220 @@
+"""
+워커 프로세스 간 공유 저장소
+리더 프로세스가 만든 결과(캐시 항목, 작업 상태 등)를 로컬 디렉터리에 파일로 게시하고,
+다른 워커는 주기적으로 새로 바뀐 파일만 읽어 자신의 메모리 캐시에 반영합니다.
+
+파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로
+읽는 쪽에서 반쯤 쓰인 파일을 보는 일은 없습니다.
+디렉터리 훑기와 파일 읽기/쓰기는 모두 동기 함수이므로, 주기 작업에서는 asyncio.to_thread로 호출합니다.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+SHARED_STATE_DIR = Path(os.getenv(
+    "SHARED_STATE_DIR",
+    str(Path(__file__).resolve().parent.parent.parent / ".shared_state")
+))
+_ENTRIES_DIR = SHARED_STATE_DIR / "entries"
+_INVALIDATIONS_DIR = SHARED_STATE_DIR / "invalidations"
+
+# 디렉터리를 다시 훑을 때 넘기는 표시: (마지막으로 본 mtime, 그 mtime의 파일 중 이미 읽은 것들의 이름)
+ScanMark = Tuple[float, FrozenSet[str]]
+EMPTY_MARK: ScanMark = (0.0, frozenset())
+
+
+def _write_atomic(path: Path, payload: dict) -> float:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path.stat().st_mtime
+
+
+def _read(path: Path) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _scan_new_files(directory: Path, mark: ScanMark) -> Tuple[List[Path], ScanMark]:
+    """
+    mark 이후에 새로 쓰였거나 바뀐 .json 파일 경로들 (mtime 순)
+    같은 mtime에 연달아 쓰인 파일도 놓치지 않고, 이미 읽은 파일은 다시 돌려주지 않습니다.
+    """
+    since, seen = mark
+    found = []
+    latest, at_latest = since, set(seen)
+    try:
+        scanner = os.scandir(directory)
+    except FileNotFoundError:
+        return [], mark
+
+    with scanner:
+        for item in scanner:
+            if not item.name.endswith(".json"):
+                continue
+            try:
+                mtime = item.stat().st_mtime
+            except OSError:
+                continue
+            if mtime < since or (mtime == since and item.name in seen):
+                continue
+            found.append((mtime, item.name, Path(item.path)))
+            if mtime > latest:
+                latest, at_latest = mtime, {item.name}
+            elif mtime == latest:
+                at_latest.add(item.name)
+
+    found.sort()
+    return [path for _, _, path in found], (latest, frozenset(at_latest))
+
+
+def publish_entry(key: str, data, expire_seconds: int, tags: Iterable[str] = ()):
+    """캐시 항목을 공유 저장소에 게시합니다."""
+    file_name = hashlib.sha1(key.encode()).hexdigest() + ".json"
+    _write_atomic(_ENTRIES_DIR / file_name, {
+        "key": key,
+        "expires_at": time.time() + expire_seconds,
+        "tags": sorted(tags),
+        "data": data,
+    })
+
+
+def read_updated_entries(mark: ScanMark) -> Tuple[List[dict], ScanMark]:
+    """
+    mark 이후에 게시된, 아직 만료되지 않은 항목들을 읽습니다. (이미 읽은 파일은 다시 읽지 않음)
+
+    Returns:
+        (항목 목록, 다음 호출에 넘길 mark 값)
+    """
+    paths, mark = _scan_new_files(_ENTRIES_DIR, mark)
+    now = time.time()
+    entries = [entry for entry in map(_read, paths) if entry and entry.get("expires_at", 0) > now]
+    return entries, mark
+
+
+def remove_entries(match: Callable[[dict], bool]) -> int:
+    """match(항목)가 참인 게시 항목 파일을 지웁니다. (캐시 무효화 시 다른 워커가 다시 가져가지 않도록)"""
+    removed = 0
+    try:
+        scanner = os.scandir(_ENTRIES_DIR)
+    except FileNotFoundError:
+        return removed
+
+    with scanner:
+        for item in scanner:
+            if not item.name.endswith(".json"):
+                continue
+            entry = _read(Path(item.path))
+            if entry is not None and match(entry):
+                try:
+                    os.remove(item.path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+def prune_expired_entries() -> int:
+    """만료된 항목 파일을 지웁니다. (리더가 주기적으로 호출)"""
+    removed = 0
+    now = time.time()
+    try:
+        scanner = os.scandir(_ENTRIES_DIR)
+    except FileNotFoundError:
+        return removed
+
+    with scanner:
+        for item in scanner:
+            if not item.name.endswith(".json"):
+                continue
+            entry = _read(Path(item.path))
+            if entry is None or entry.get("expires_at", 0) <= now:
+                try:
+                    os.remove(item.path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+def write_state(name: str, state: dict) -> float:
+    """
+    작업 상태 등 작은 상태 파일을 게시합니다.
+
+    Returns:
+        게시한 파일의 mtime (read_state_if_changed에 넘길 값)
+    """
+    return _write_atomic(SHARED_STATE_DIR / f"{name}.json", state)
+
+
+def read_state(name: str) -> Optional[dict]:
+    """write_state로 게시된 상태 파일을 읽습니다."""
+    return _read(SHARED_STATE_DIR / f"{name}.json")
+
+
+def read_state_if_changed(name: str, since: float) -> Tuple[Optional[dict], float]:
+    """
+    상태 파일의 mtime이 since와 다를 때만 읽습니다.
+
+    Returns:
+        (상태 또는 바뀌지 않았으면 None, 다음 호출에 넘길 since 값)
+    """
+    path = SHARED_STATE_DIR / f"{name}.json"
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None, since
+    if mtime == since:
+        return None, since
+    state = _read(path)
+    return state, (mtime if state is not None else since)
+
+
+# 캐시 무효화 기록 (모든 워커가 읽어서 자기 메모리 캐시에도 적용)
+# 무효화마다 파일 하나로 씀 (한 파일을 읽고 고쳐 쓰면 여러 워커가 동시에 기록할 때 하나가 사라짐)
+_MAX_INVALIDATIONS = 100
+_invalidation_seq = itertools.count()
+
+
+def publish_invalidation(tags: Iterable[str], prefixes: Iterable[str]) -> dict:
+    """
+    캐시 무효화를 기록합니다. 최근 _MAX_INVALIDATIONS개만 남깁니다.
+
+    Returns:
+        기록한 무효화 {"id", "at", "tags", "prefixes"}
+    """
+    now = time.time()
+    event_id = f"{os.getpid()}-{now}-{next(_invalidation_seq)}"
+    event = {"id": event_id, "at": now, "tags": sorted(tags), "prefixes": sorted(prefixes)}
+    _write_atomic(_INVALIDATIONS_DIR / f"{now:017.6f}-{event_id}.json", event)
+
+    # 오래된 기록 정리 (다른 워커와 겹쳐서 이미 지워졌으면 무시)
+    names = sorted(name for name in os.listdir(_INVALIDATIONS_DIR) if name.endswith(".json"))
+    for name in names[:-_MAX_INVALIDATIONS]:
+        try:
+            os.remove(_INVALIDATIONS_DIR / name)
+        except OSError:
+            pass
+    return event
+
+
+def read_invalidations_if_changed(mark: ScanMark) -> Tuple[List[dict], ScanMark]:
+    """
+    mark 이후에 새로 기록된 무효화만 읽습니다. (기록 순)
+
+    Returns:
+        (무효화 목록, 다음 호출에 넘길 mark 값)
+    """
+    paths, mark = _scan_new_files(_INVALIDATIONS_DIR, mark)
+    events = [event for event in map(_read, paths) if event is not None]
+    return events, mark
@@ -0,0 +1,38 @@
+"""
+같은 키의 작업 합치기 (single flight)
+캐시 미스가 동시에 여러 번 나도 실제 작업(업스트림 호출)은 한 번만 실행하고,
+나머지 요청은 그 결과를 함께 받습니다.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 func()을 실행합니다.
+        작업이 실패하면 기다리던 요청들도 같은 예외를 받습니다.
+
+        func()은 별도 태스크에서 실행하므로, 먼저 시작한 요청을 포함해 어느 요청이 취소되어도
+        (클라이언트 연결 끊김, 요청 기한) 그 요청의 기다림만 끝나고 작업과 다른 요청은 계속됩니다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리는 쪽이 없을 때 "exception was never retrieved" 경고 방지
+            task.exception()
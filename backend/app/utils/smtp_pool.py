@@ -0,0 +1,314 @@
+"""
+비동기 SMTP 전송 워커
+인증된 SMTP 세션을 작은 풀로 유지하면서 제한된 동시성으로 이메일을 전송합니다.
+
+smtplib 호출은 모두 스레드에서 실행되므로 이벤트 루프를 막지 않습니다.
+각 워커는 자신의 SMTP 세션을 하나씩 유지하고, 연결이 끊기면 다시 연결합니다.
+"""
+
+import asyncio
+import os
+import smtplib
+import time
+from collections import deque
+from email.message import Message
+from typing import List, Optional
+
+# 풀 크기 = 동시에 유지하는 SMTP 세션 수 = 최대 동시 전송 수
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+# 전송 대기열 최대 길이 (가득 차면 send()가 자리가 날 때까지 대기)
+SMTP_QUEUE_SIZE = int(os.getenv("SMTP_QUEUE_SIZE", "10000"))
+# 연결 끊김 등으로 실패했을 때 재연결 후 재시도 횟수
+SMTP_MAX_RETRIES = 2
+# 이 시간(초) 이상 쉬었던 세션은 NOOP으로 상태를 확인한 뒤 사용
+SMTP_IDLE_CHECK = 60
+
+# 전송 결과
+SEND_OK = "sent"  # 전송 성공
+SEND_RETRYABLE = "retryable"  # 일시적 실패 (연결 끊김, 4xx 응답, 인증 실패 등) - 나중에 다시 시도
+SEND_PERMANENT = "permanent"  # 메시지 자체의 영구 실패 (수신 거부, 본문 거부 등) - 다시 시도해도 소용없음
+
+
+def _is_retryable(error: Exception) -> bool:
+    """재연결 후 재시도할 가치가 있는 오류인지 판단 (수신 거부, 인증 실패 등은 제외)"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    # 소켓 오류, 타임아웃 등
+    return isinstance(error, OSError)
+
+
+def classify_failure(error: Exception) -> str:
+    """
+    전송 실패를 재시도할 실패(SEND_RETRYABLE)와 메시지별 영구 실패(SEND_PERMANENT)로 구분
+
+    서버가 이 메시지를 5xx로 거부한 경우만 영구 실패입니다.
+    인증 실패나 발신자 거부처럼 설정 문제일 수 있는 오류는 다른 메시지에도 똑같이 생기므로
+    재시도 대상으로 두고 최대 시도 횟수에 맡깁니다.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return SEND_PERMANENT if codes and all(500 <= code < 600 for code in codes) else SEND_RETRYABLE
+    if isinstance(error, smtplib.SMTPDataError):
+        return SEND_PERMANENT if 500 <= error.smtp_code < 600 else SEND_RETRYABLE
+    if isinstance(error, ValueError):
+        # 수신자가 없는 메시지 등 send_message가 거부한 메시지
+        return SEND_PERMANENT
+    return SEND_RETRYABLE
+
+
+class SMTPSettings:
+    """환경변수에서 읽은 SMTP 접속 정보"""
+
+    def __init__(self):
+        self.host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+        self.port = int(os.getenv("SMTP_PORT", "587"))
+        self.user = os.getenv("SMTP_USER")
+        self.password = os.getenv("SMTP_PASSWORD")
+        # 로컬 SMTP 싱크(aiosmtpd 등)로 테스트할 때는 둘 다 false로 설정
+        self.starttls = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+        self.login = os.getenv("SMTP_LOGIN", "true").lower() == "true"
+        self.timeout = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+    @property
+    def configured(self) -> bool:
+        """실제 전송이 가능한 설정인지 여부"""
+        if not self.user:
+            return False
+        return bool(self.password) or not self.login
+
+
+class SMTPDeliveryWorker:
+    """
+    SMTP 세션 풀을 가진 전송 워커
+
+    pool_size개의 워커 태스크가 하나의 큐를 나눠서 처리합니다.
+    각 태스크는 인증된 세션을 하나씩 계속 재사용하므로
+    이메일마다 연결/STARTTLS/LOGIN을 반복하지 않습니다.
+    """
+
+    def __init__(self, settings: Optional[SMTPSettings] = None, pool_size: int = SMTP_POOL_SIZE):
+        self.settings = settings or SMTPSettings()
+        self.pool_size = max(1, pool_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._started_at: Optional[float] = None
+
+        # 메트릭
+        self._sent = 0
+        self._failed = 0
+        self._rejected = 0  # 실패 중 영구 실패
+        self._connects = 0
+        self._reconnects = 0
+        self._latencies = deque(maxlen=1000)  # 최근 전송 소요 시간 (초)
+        self._completed_at = deque(maxlen=1000)  # 최근 전송 완료 시각 (처리량 계산용)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """워커 태스크를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=SMTP_QUEUE_SIZE)
+        self._started_at = time.monotonic()
+        self._tasks = [
+            asyncio.create_task(self._run(worker_id))
+            for worker_id in range(self.pool_size)
+        ]
+        print(f"[SMTP] 전송 워커 시작 (세션 {self.pool_size}개)")
+
+    async def stop(self):
+        """대기열에 남은 이메일을 모두 보낸 뒤 세션을 닫고 종료합니다."""
+        if not self.running:
+            return
+        await self._queue.join()
+        for _ in self._tasks:
+            await self._queue.put(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print("[SMTP] 전송 워커 종료")
+
+    async def send(self, msg: Message) -> str:
+        """
+        이메일 한 통을 대기열에 넣고 전송 결과를 기다립니다.
+
+        Returns:
+            SEND_OK, SEND_RETRYABLE, SEND_PERMANENT 중 하나
+        """
+        if not self.running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((msg, future))
+        return await future
+
+    async def send_many(self, messages: List[Message]) -> List[str]:
+        """여러 이메일을 풀 크기만큼 동시에 전송하고 입력 순서대로 결과를 반환합니다."""
+        return list(await asyncio.gather(*(self.send(msg) for msg in messages)))
+
+    def metrics(self) -> dict:
+        """처리량과 지연 시간 메트릭"""
+        latencies = sorted(self._latencies)
+        now = time.monotonic()
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(len(latencies) * p))
+            return round(latencies[index] * 1000, 2)
+
+        throughput = 0.0
+        if len(self._completed_at) >= 2:
+            window = now - self._completed_at[0]
+            if window > 0:
+                throughput = len(self._completed_at) / window
+
+        return {
+            "running": self.running,
+            "pool_size": self.pool_size,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "sent": self._sent,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "connects": self._connects,
+            "reconnects": self._reconnects,
+            "throughput_per_sec": round(throughput, 2),
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+            },
+            "uptime_seconds": round(now - self._started_at, 1) if self._started_at else 0,
+        }
+
+    async def _run(self, worker_id: int):
+        """워커 태스크: 대기열에서 이메일을 꺼내 자신의 세션으로 전송"""
+        session = _Session(self)
+        try:
+            while True:
+                job = await self._queue.get()
+                if job is None:
+                    self._queue.task_done()
+                    break
+
+                msg, future = job
+                started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(session.send, msg)
+                    self._sent += 1
+                    if not future.done():
+                        future.set_result(SEND_OK)
+                except Exception as e:
+                    self._failed += 1
+                    outcome = classify_failure(e)
+                    if outcome == SEND_PERMANENT:
+                        self._rejected += 1
+                    print(f"[SMTP] 워커 {worker_id} 전송 실패 ({outcome}): {msg.get('To')} - {str(e)}")
+                    if not future.done():
+                        future.set_result(outcome)
+                finally:
+                    self._latencies.append(time.perf_counter() - started)
+                    self._completed_at.append(time.monotonic())
+                    self._queue.task_done()
+        finally:
+            await asyncio.to_thread(session.close)
+
+
+class _Session:
+    """워커 하나가 소유하는 SMTP 연결 (항상 같은 워커 스레드 호출에서만 사용)"""
+
+    def __init__(self, worker: SMTPDeliveryWorker):
+        self._worker = worker
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        settings = self._worker.settings
+        server = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+        try:
+            if settings.starttls:
+                server.starttls()
+            if settings.login:
+                server.login(settings.user, settings.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._worker._connects += 1
+
+    def _ensure_connected(self):
+        if self._server is None:
+            self._connect()
+            return
+        # 오래 쉬었던 세션은 서버가 이미 끊었을 수 있으므로 확인
+        if time.monotonic() - self._last_used > SMTP_IDLE_CHECK:
+            try:
+                status, _ = self._server.noop()
+                if status != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP failed")
+            except Exception:
+                self.close()
+                self._connect()
+
+    def send(self, msg: Message):
+        attempt = 0
+        while True:
+            try:
+                self._ensure_connected()
+                self._server.send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except Exception as e:
+                if not _is_retryable(e):
+                    # 수신 거부, 본문 거부 같은 메시지별 영구 오류: 연결은 멀쩡하므로 거래 상태만 초기화하고 세션 유지
+                    self._reset()
+                    raise
+                self.close()
+                if attempt >= SMTP_MAX_RETRIES:
+                    raise
+                attempt += 1
+                self._worker._reconnects += 1
+
+    def _reset(self):
+        """진행 중이던 메일 거래를 RSET으로 초기화 (실패하면 연결을 닫음)"""
+        if self._server is None:
+            return
+        try:
+            self._server.rset()
+            self._last_used = time.monotonic()
+        except Exception:
+            self.close()
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+        self._server = None
+
+
+# 프로세스 전체에서 공유하는 워커
+_delivery_worker: Optional[SMTPDeliveryWorker] = None
+
+
+def get_delivery_worker() -> SMTPDeliveryWorker:
+    """공유 전송 워커를 반환합니다 (처음 전송할 때 시작됨)"""
+    global _delivery_worker
+    if _delivery_worker is None:
+        _delivery_worker = SMTPDeliveryWorker()
+    return _delivery_worker
+
+
+async def close_delivery_worker():
+    """서버 종료 시 남은 이메일을 보내고 SMTP 세션을 닫습니다."""
+    global _delivery_worker
+    if _delivery_worker is not None:
+        await _delivery_worker.stop()
+        _delivery_worker = None
@@ -0,0 +1,157 @@
+"""
+카테고리별 기사 수 시계열 (시간 단위 링 버퍼)
+수집 경로(카테고리 통계 집계)에서 본 기사를 발행 시각 기준 시간 버킷에 더해 두고,
+추이 조회는 미리 집계된 버킷만 읽습니다. (네이버 API 호출 없음)
+
+- 카테고리마다 보관 기간(시간 수)만큼의 array 두 개(버킷 시각, 기사 수)를 링 버퍼로 사용
+- 같은 기사를 여러 번 세지 않도록 카테고리마다 마지막으로 센 발행 시각(워터마크)을 기억
+- 리더가 수집 후 공유 저장소에 게시하고, 다른 워커는 바뀌었을 때만 다시 읽음
+"""
+
+import asyncio
+import os
+from array import array
+from typing import Dict, Iterable, List
+
+from utils.shared_store import read_state_if_changed, write_state
+
+# 보관 기간 (일)
+CATEGORY_VOLUME_RETENTION_DAYS = int(os.getenv("CATEGORY_VOLUME_RETENTION_DAYS", "30"))
+
+_STATE_NAME = "category_volume"
+
+
+class HourlyRing:
+    """시간 버킷 링 버퍼 (슬롯마다 어느 시각의 버킷인지 함께 저장)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._hours = array('q', [-1]) * size
+        self._counts = array('L', [0]) * size
+        self.latest_hour = -1
+
+    def add(self, hour: int, count: int = 1):
+        # 보관 기간보다 오래된 시각은 버림
+        if hour <= self.latest_hour - self.size:
+            return
+        slot = hour % self.size
+        if self._hours[slot] != hour:
+            self._hours[slot] = hour
+            self._counts[slot] = 0
+        self._counts[slot] += count
+        self.latest_hour = max(self.latest_hour, hour)
+
+    def get(self, hour: int) -> int:
+        slot = hour % self.size
+        return self._counts[slot] if self._hours[slot] == hour else 0
+
+    def to_state(self) -> List[List[int]]:
+        """0이 아닌 버킷만 [시각, 기사 수] 목록으로"""
+        oldest = self.latest_hour - self.size
+        return [
+            [hour, count] for hour, count in zip(self._hours, self._counts)
+            if hour > oldest and count
+        ]
+
+    @classmethod
+    def from_state(cls, size: int, buckets: Iterable) -> "HourlyRing":
+        ring = cls(size)
+        for hour, count in sorted(buckets):
+            ring.add(int(hour), int(count))
+        return ring
+
+
+class CategoryVolume:
+    """카테고리별 시간 단위 기사 수"""
+
+    def __init__(self, retention_days: int = CATEGORY_VOLUME_RETENTION_DAYS):
+        self.retention_hours = retention_days * 24
+        self._rings: Dict[str, HourlyRing] = {}
+        # 카테고리별 워터마크: 마지막으로 센 가장 최신 발행 시각과 그 시각의 link들
+        self._watermarks: Dict[str, float] = {}
+        self._watermark_links: Dict[str, List[str]] = {}
+        self._state_mtime = 0.0
+
+    def _ring(self, category: str) -> HourlyRing:
+        ring = self._rings.get(category)
+        if ring is None:
+            ring = self._rings[category] = HourlyRing(self.retention_hours)
+        return ring
+
+    def ingest(self, category: str, items: Iterable[dict]) -> int:
+        """
+        한 번의 수집에서 본 기사들(timestamp, link 포함)을 버킷에 더합니다.
+        이전 수집의 워터마크보다 새 기사만 세므로, 같은 기사를 다시 봐도 중복으로 세지 않습니다.
+
+        Returns:
+            새로 센 기사 수
+        """
+        watermark = self._watermarks.get(category, 0.0)
+        watermark_links = set(self._watermark_links.get(category, ()))
+        ring = self._ring(category)
+
+        added = 0
+        seen = set()
+        newest = watermark
+        newest_links = set(watermark_links)
+        for item in items:
+            timestamp, link = item['timestamp'], item['link']
+            if not timestamp or link in seen:
+                continue
+            seen.add(link)
+            if timestamp < watermark or (timestamp == watermark and link in watermark_links):
+                continue
+
+            ring.add(int(timestamp // 3600))
+            added += 1
+            if timestamp > newest:
+                newest, newest_links = timestamp, {link}
+            elif timestamp == newest:
+                newest_links.add(link)
+
+        self._watermarks[category] = newest
+        self._watermark_links[category] = sorted(newest_links)
+        return added
+
+    def query(self, categories: List[str], start_hour: int, end_hour: int) -> Dict[str, List[int]]:
+        """[start_hour, end_hour) 구간의 카테고리별 시간 버킷 (epoch 시각 단위)"""
+        hours = range(start_hour, end_hour)
+        result = {}
+        for category in categories:
+            ring = self._rings.get(category)
+            result[category] = [ring.get(hour) for hour in hours] if ring else [0] * len(hours)
+        return result
+
+    async def publish(self):
+        """현재 시계열을 공유 저장소에 게시합니다. (리더)"""
+        state = {
+            "retention_hours": self.retention_hours,
+            "categories": {
+                category: {
+                    "buckets": ring.to_state(),
+                    "watermark": self._watermarks.get(category, 0.0),
+                    "watermark_links": list(self._watermark_links.get(category, [])),
+                }
+                for category, ring in self._rings.items()
+            },
+        }
+        try:
+            self._state_mtime = await asyncio.to_thread(write_state, _STATE_NAME, state)
+        except OSError as e:
+            print(f"[시계열] 게시 실패: {str(e)}")
+
+    async def sync(self):
+        """공유 저장소의 시계열이 바뀌었으면 다시 읽습니다. (시작 시, 조회 시)"""
+        state, mtime = await asyncio.to_thread(read_state_if_changed, _STATE_NAME, self._state_mtime)
+        if state is None:
+            return
+        self._state_mtime = mtime
+        self._rings = {}
+        for category, data in state.get("categories", {}).items():
+            self._rings[category] = HourlyRing.from_state(self.retention_hours, data.get("buckets", []))
+            self._watermarks[category] = data.get("watermark", 0.0)
+            self._watermark_links[category] = data.get("watermark_links", [])
+
+
+# 프로세스 전체에서 공유하는 시계열
+category_volume = CategoryVolume()
@@ -0,0 +1,112 @@
+"""
+급상승 감지 벤치마크
+합성 기사 스트림(기본값 10만 건, 3일치)을 utils/bursts.py의 BurstDetector에 넣으면서
+기사당 갱신 시간, 처리량, 감지기 메모리 사용량을 재고, 끝 무렵에 심어 둔 급상승 단어가 잡히는지 확인합니다.
+
+- 평소 기사: mock_naver.py와 같은 회사/사건 조합 + 검색어, 하루 동안 고르게 도착
+- 급상승: 마지막 BURST 분 동안 새 CVE 번호와 회사 이름이 들어간 기사가 몰림
+- 기사는 검색 결과처럼 100건씩 묶어서 넣고, 긴 꼬리 단어(일련번호 제품명)로 단어 수 제한도 확인
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_bursts
+    python -m benchmarks.bench_bursts --articles 200000 --max-terms 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.mock_naver import KST, _EVENTS, _VENDORS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR / "app"))
+
+from utils.bursts import BurstDetector  # noqa: E402
+
+_QUERIES = ["랜섬웨어", "해킹", "개인정보", "악성코드", "피싱", "보안 취약점", "클라우드 보안", "IT 보안"]
+_BURST_TITLE = "오픈웨어 VPN 장비 CVE-2026-31337 원격 코드 실행 취약점 악용"
+_BATCH = 100
+
+
+def synthetic_stream(articles: int, days: float, burst_minutes: float, burst_share: float, seed: int = 7):
+    """(발행 시각, 기사) 목록 - 시간순, 마지막 burst_minutes 동안 급상승 기사를 섞음"""
+    rng = random.Random(seed)
+    end = datetime.now(KST)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+    burst_from = span - burst_minutes * 60
+    stream = []
+    for i in range(articles):
+        offset = span * i / articles
+        if offset >= burst_from and rng.random() < burst_share:
+            title = f"{rng.choice(['[긴급]', '[속보]', ''])} {_BURST_TITLE}"
+        else:
+            title = f"{rng.choice(_VENDORS)}, {rng.choice(_QUERIES)} {rng.choice(_EVENTS)}"
+            if rng.random() < 0.2:
+                # 긴 꼬리 단어 (단어 수 제한 확인용)
+                title += f" 제품{rng.randint(1, 200000)}"
+        published = start + timedelta(seconds=offset)
+        stream.append({
+            "id": f"a{i}",
+            "title": title,
+            "description": f"{title} 관련 소식",
+            "pubDate": published.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        })
+    return stream, start.timestamp()
+
+
+def _run(stream: list, started_at: float, span: float, args):
+    """스트림을 검색 결과처럼 _BATCH건씩 넣고 (감지기, observe에 걸린 시간) 반환"""
+    detector = BurstDetector(max_terms=args.max_terms, seen_size=args.articles)
+    for keyword in _QUERIES:
+        detector.track(keyword)
+    elapsed = 0.0
+    for i in range(0, len(stream), _BATCH):
+        batch = stream[i:i + _BATCH]
+        # 마지막 기사가 도착한 시점에 검색 결과를 받은 것처럼
+        now = started_at + span * min(i + _BATCH, len(stream)) / len(stream)
+        t0 = time.perf_counter()
+        detector.observe(batch, now=now)
+        elapsed += time.perf_counter() - t0
+    return detector, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="급상승 감지 처리량/메모리 벤치마크")
+    parser.add_argument("--articles", type=int, default=100000, help="합성 기사 수")
+    parser.add_argument("--days", type=float, default=3, help="스트림 기간 (일)")
+    parser.add_argument("--burst-minutes", type=float, default=45, help="급상승 기간 (분, 스트림 끝)")
+    parser.add_argument("--burst-share", type=float, default=0.3, help="급상승 기간 기사 중 급상승 기사 비율")
+    parser.add_argument("--max-terms", type=int, default=20000, help="보관할 제목 단어 수")
+    args = parser.parse_args()
+
+    stream, started_at = synthetic_stream(args.articles, args.days, args.burst_minutes, args.burst_share)
+    span = args.days * 86400
+
+    # 처리량은 tracemalloc 없이, 메모리는 같은 스트림을 새 감지기에 다시 넣으면서 잼
+    detector, elapsed = _run(stream, started_at, span, args)
+    tracemalloc.start()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+    measured, _ = _run(stream, started_at, span, args)
+    memory = tracemalloc.get_traced_memory()[0] - baseline_memory
+    tracemalloc.stop()
+    del measured
+
+    status = detector.status()
+    print(f"기사 {status['articles']}건, 단어 갱신 {status['updates']}회, 보관 단어 {status['terms']}개"
+          f" (제한 {status['max_terms']}), 추적 키워드 {status['tracked']}개")
+    print(f"처리 시간 {elapsed:.2f}s → 기사 {status['articles'] / elapsed:,.0f}건/s, "
+          f"기사당 {elapsed / status['articles'] * 1e6:.1f}µs, 단어 갱신당 {elapsed / status['updates'] * 1e6:.2f}µs")
+    print(f"감지기 메모리 {memory / 1024 / 1024:.1f}MiB (본 기사 ID {min(args.articles, detector.seen_size)}개 포함)")
+
+    print("급상승 단어:")
+    for burst in detector.bursts(limit=10, now=started_at + span):
+        print(f"  {burst['term']:<16} z={burst['z']:>7.1f}  최근 {burst['recent_count']:>6.1f}건  기대 {burst['expected_count']:.1f}건")
+
+
+if __name__ == "__main__":
+    main()
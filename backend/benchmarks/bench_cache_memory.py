@@ -0,0 +1,131 @@
+"""
+캐시 기사 풀 메모리 벤치마크
+검색 결과가 겹치는 현실적인 캐시(검색어 여러 개 × display/페이지 변형 + 카테고리 피드 스트림)를
+기사 풀 없이/있게 채워서 캐시 메모리(tracemalloc)와 캐시 히트 때 본문을 만드는 시간을 비교합니다.
+
+- 기사 하나는 주제 1~3개에 속하고, 검색 결과는 그 주제의 기사를 최신순으로 자른 것
+  ("보안", "데이터 보안", "개인정보" 결과와 display 10/20/100 결과에 같은 기사가 함께 나옴)
+- 응답마다 JSON을 새로 파싱한 것처럼 기사 dict와 문자열을 새로 만들어서 넣음 (실제 네이버 응답과 같음)
+- 두 방식의 본문이 바이트 단위로 같은지(= ETag가 같은지)도 확인
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_cache_memory
+    python -m benchmarks.bench_cache_memory --articles 5000 --cache-size 400
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+
+from benchmarks.mock_naver import KST, _make_item
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR / "app"))
+
+from utils import cache  # noqa: E402
+from utils.feed import build_stream  # noqa: E402
+from utils.naver_client import normalize_items  # noqa: E402
+
+_TOPICS = [
+    "보안", "사이버보안", "해킹", "개인정보", "IT 보안", "악성코드", "보안제품", "암호화",
+    "네트워크 보안", "보안 정책", "데이터 보안", "랜섬웨어", "피싱", "제로데이", "정보보호", "클라우드 보안",
+]
+# 카테고리 피드 스트림 (news_api.NEWS_CATEGORIES의 키워드 중 일부)
+_FEED_TOPICS = ["사이버보안", "해킹", "개인정보", "IT 보안", "악성코드", "보안제품", "암호화", "네트워크 보안"]
+# 검색어마다 캐시에 들어가는 (display, start) 변형
+_VARIANTS = [(10, 1), (10, 11), (10, 21), (20, 1), (20, 21), (100, 1)]
+
+
+def synthetic_universe(articles: int, seed: int = 11) -> dict:
+    """주제 -> 그 주제의 기사 목록 (최신순, 기사 하나가 여러 주제에 속함)"""
+    rng = random.Random(seed)
+    now = datetime.now(KST)
+    by_topic = {topic: [] for topic in _TOPICS}
+    for position in range(articles):
+        topics = rng.sample(_TOPICS, rng.choice([1, 2, 2, 3]))
+        item = _make_item(topics[0], rng, position, now)
+        for topic in topics:
+            by_topic[topic].append(item)
+    # 네이버 응답을 받을 때처럼 태그/엔티티 정리, 고정 ID 부여
+    return {topic: orjson.dumps(normalize_items([dict(item) for item in items])) for topic, items in by_topic.items()}
+
+
+def _responses(universe: dict):
+    """(캐시 키, 응답 data, 태그) - 응답마다 새로 파싱 (같은 기사도 다른 dict/문자열)"""
+    for topic in _TOPICS:
+        for display, start in _VARIANTS:
+            items = orjson.loads(universe[topic])[start - 1:start - 1 + display]
+            data = {"lastBuildDate": "Mon, 19 Oct 2026 09:00:00 +0900", "total": 1000,
+                    "start": start, "display": display, "items": items}
+            yield f"news:search:{topic}:{display}:{start}:date", data, ("endpoint:search", f"query:{topic}")
+    for topic in _FEED_TOPICS:
+        stream = build_stream(orjson.loads(universe[topic])[:100], topic)
+        yield f"news:feed:stream:{topic}", {"category": topic, "items": stream}, ("endpoint:feed",)
+
+
+def _fill(universe: dict, pooled: bool) -> dict:
+    """캐시를 비우고 채운 뒤 (메모리, 키 -> ETag)"""
+    cache._memory_cache.clear()
+    cache._article_pool.clear()
+    cache.CACHE_ARTICLE_POOL = pooled
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for key, data, tags in _responses(universe):
+        asyncio.run(cache.set_cached_data(key, data, expire_seconds=600, tags=tags))
+        del data
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {"memory": memory, "etags": {key: entry.etag for key, entry in cache._memory_cache.items()}}
+
+
+def _render(rounds: int) -> float:
+    """캐시 히트마다 본문을 꺼내는 시간 (항목당 평균, 초)"""
+    entries = list(cache._memory_cache.values())
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for entry in entries:
+            entry.body
+    return (time.perf_counter() - started) / (rounds * len(entries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐시 기사 풀 메모리 벤치마크")
+    parser.add_argument("--articles", type=int, default=3000, help="합성 기사 수")
+    parser.add_argument("--cache-size", type=int, default=cache.MAX_CACHE_SIZE, help="캐시 최대 항목 수")
+    parser.add_argument("--rounds", type=int, default=200, help="본문 만들기 반복 횟수")
+    args = parser.parse_args()
+    cache.MAX_CACHE_SIZE = args.cache_size
+
+    universe = synthetic_universe(args.articles)
+    results = {}
+    for name, pooled in (("기사 풀 없음", False), ("기사 풀", True)):
+        results[name] = _fill(universe, pooled)
+        results[name]["render"] = _render(args.rounds)
+        results[name]["entries"] = len(cache._memory_cache)
+        results[name]["pool"] = cache.article_pool_status()
+
+    print(f"합성 기사 {args.articles}건, 캐시 항목 {results['기사 풀']['entries']}개 "
+          f"(검색어 {len(_TOPICS)}개 × 변형 {len(_VARIANTS)}개 + 피드 스트림 {len(_FEED_TOPICS)}개)")
+    print(f"{'':<14}{'메모리':>12}{'본문 만들기':>14}")
+    for name, r in results.items():
+        print(f"{name:<14}{r['memory'] / 1024 / 1024:>10.2f}MiB{r['render'] * 1e6:>12.1f}µs")
+    pool = results["기사 풀"]["pool"]
+    print(f"풀: 기사 {pool['articles']}개, 참조 {pool['refs']}개 (기사 하나를 평균 {pool['refs'] / max(1, pool['articles']):.1f}개 항목이 공유)")
+    saved = 1 - results["기사 풀"]["memory"] / results["기사 풀 없음"]["memory"]
+    print(f"메모리 {saved:.0%} 감소")
+    same = results["기사 풀"]["etags"] == results["기사 풀 없음"]["etags"]
+    print("본문(ETag) 일치" if same else "❌ 본문(ETag)이 다름")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+JSON 응답 인코딩 벤치마크
+뉴스/통계 응답 payload를 인코딩 방식별로 몇 번씩 인코딩해서 1회당 시간을 비교합니다.
+
+- fastapi-default: jsonable_encoder + json.dumps (JSONResponse 기본 경로)
+- orjson-response: jsonable_encoder + orjson (ORJSONResponse 경로)
+- orjson-trusted: 검증/변환 없이 orjson만 (캐시에 넣을 때 한 번 실행되는 비용)
+- pre-encoded: 캐시 히트 시 미리 인코딩된 바이트를 그대로 사용 (인코딩 없음)
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --payload saved_response.json   # 실제 응답을 저장해 둔 파일 사용
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.mock_naver import KST, _make_item
+
+
+def _search_payload(display: int) -> dict:
+    rng = random.Random(42)
+    now = datetime.now(KST)
+    return {
+        "lastBuildDate": now.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        "total": 1000,
+        "start": 1,
+        "display": display,
+        "items": [_make_item("개인정보 유출", rng, i, now) for i in range(display)],
+    }
+
+
+def _category_stats_payload() -> dict:
+    names = [
+        "사이버보안", "해킹/침해사고", "개인정보보호", "IT/보안 트렌드", "악성코드/피싱",
+        "보안제품/서비스", "인증·암호화", "네트워크보안", "정책·제도", "데이터보안",
+    ]
+    categories = [{"category": name, "count": 40 + i * 7, "percentage": 10} for i, name in enumerate(names)]
+    return {"total": sum(c["count"] for c in categories), "categories": categories}
+
+
+def _popular_keywords_payload() -> list:
+    words = ["랜섬웨어", "해킹", "개인정보", "피싱", "제로데이", "보안 정책", "악성코드", "DDoS", "클라우드 보안", "인증"]
+    return [{"keyword": f"{words[i % len(words)]} {i}", "count": 1000 - i * 13} for i in range(30)]
+
+
+def _fastapi_default(data) -> bytes:
+    return json.dumps(
+        jsonable_encoder(data), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _orjson_response(data) -> bytes:
+    return orjson.dumps(jsonable_encoder(data), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _orjson_trusted(data) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+
+def _bench(func, data, number: int) -> float:
+    """1회당 평균 시간 (마이크로초), 5번 반복 중 최솟값"""
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 응답 인코딩 벤치마크")
+    parser.add_argument("--payload", type=Path, help="인코딩할 JSON 파일 (실제 응답 저장본)")
+    parser.add_argument("--number", type=int, default=200, help="반복 횟수")
+    args = parser.parse_args()
+
+    payloads = {}
+    if args.payload:
+        payloads[args.payload.name] = json.loads(args.payload.read_text(encoding="utf-8"))
+    else:
+        payloads["search display=10"] = _search_payload(10)
+        payloads["search display=100"] = _search_payload(100)
+        payloads["category-stats"] = _category_stats_payload()
+        payloads["popular-keywords 30"] = _popular_keywords_payload()
+
+    encoders = [
+        ("fastapi-default", _fastapi_default),
+        ("orjson-response", _orjson_response),
+        ("orjson-trusted", _orjson_trusted),
+    ]
+
+    print(f"{'payload':<22}{'bytes':>9}" + "".join(f"{name:>18}" for name, _ in encoders) + f"{'pre-encoded':>14}")
+    print("-" * (31 + 18 * len(encoders) + 14))
+    for name, data in payloads.items():
+        size = len(_orjson_trusted(data))
+        timings = [_bench(func, data, args.number) for _, func in encoders]
+        print(
+            f"{name:<22}{size:>9}"
+            + "".join(f"{t:>16.1f}us" for t in timings)
+            + f"{0.0:>12.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+벤치마크용 로컬 목(mock) 업스트림 서버
+- 네이버 뉴스 검색 API: GET /v1/search/news.json
+- Supabase 프로필 조회에 필요한 최소 엔드포인트: GET /auth/v1/user, GET /rest/v1/user_profiles
+
+환경변수:
+- MOCK_LATENCY_MS: 네이버 응답 지연 (밀리초, 기본값 80)
+- MOCK_JITTER_MS: 지연에 더할 무작위 흔들림 최댓값 (밀리초, 기본값 20)
+- MOCK_429_RATE: 429를 돌려줄 확률 (0~1, 기본값 0)
+- MOCK_TODAY_ARTICLES: 검색어마다 오늘 날짜 기사 수 (기본값 60, sort=date면 앞쪽에 위치)
+
+응답 지연은 실행 중에도 POST /__config?latency_ms=...로 바꿀 수 있습니다. (업스트림이 느려지는 시나리오)
+
+실행:
+    uvicorn benchmarks.mock_naver:app --port 18081
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+MOCK_LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "80"))
+MOCK_JITTER_MS = float(os.getenv("MOCK_JITTER_MS", "20"))
+MOCK_429_RATE = float(os.getenv("MOCK_429_RATE", "0"))
+MOCK_TODAY_ARTICLES = int(os.getenv("MOCK_TODAY_ARTICLES", "60"))
+
+KST = timezone(timedelta(hours=9))
+
+_VENDORS = [
+    "삼성전자", "KISA", "안랩", "이스트시큐리티", "SK쉴더스", "LG유플러스",
+    "카카오", "네이버", "KT", "지란지교", "파수", "마이크로소프트", "구글",
+]
+_EVENTS = [
+    "랜섬웨어 공격 피해 확산", "개인정보 유출 사고 조사 착수", "제로데이 취약점 긴급 패치",
+    "피싱 메일 주의보 발령", "공급망 공격 정황 포착", "보안 관제 센터 확대",
+    "클라우드 보안 인증 획득", "악성 앱 유포 경고", "DDoS 공격 대응 훈련 실시",
+    "정보보호 공시 의무화 대상 확대",
+]
+_PRESS = [
+    ("https://www.boannews.com/media/view.asp?idx=", "boannews"),
+    ("https://www.dailysecu.com/news/articleView.html?idxno=", "dailysecu"),
+    ("https://www.etnews.com/", "etnews"),
+    ("https://it.chosun.com/news/articleView.html?idxno=", "chosun"),
+]
+
+app = FastAPI()
+
+# 받은 요청 수 (벤치마크 결과에 업스트림 호출 수로 표시)
+_stats = {"naver_requests": 0, "naver_429": 0, "supabase_requests": 0}
+# 실행 중에 바꿀 수 있는 설정
+_config = {"latency_ms": MOCK_LATENCY_MS}
+
+
+def _make_item(query: str, rng: random.Random, position: int, now: datetime) -> dict:
+    vendor = rng.choice(_VENDORS)
+    event = rng.choice(_EVENTS)
+    base_url, _ = rng.choice(_PRESS)
+    article_no = rng.randint(100000, 999999)
+
+    # 앞쪽 결과일수록 최신 기사 (sort=date 흉내)
+    minutes_today = now.hour * 60 + now.minute
+    if position < MOCK_TODAY_ARTICLES:
+        published = now - timedelta(minutes=minutes_today * position // MOCK_TODAY_ARTICLES)
+    else:
+        published = now - timedelta(minutes=minutes_today + 1 + (position - MOCK_TODAY_ARTICLES) * 7)
+
+    return {
+        "title": f"{vendor}, &quot;<b>{query}</b>&quot; {event}",
+        "originallink": f"{base_url}{article_no}",
+        "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 999):03d}/{article_no:010d}",
+        "description": (
+            f"{vendor}는 최근 <b>{query}</b> 관련 {event} 소식을 전하며 "
+            f"&quot;기업과 개인 모두 보안 점검을 강화해야 한다&quot;고 밝혔다. "
+            f"업계에서는 이번 사안이 국내 정보보호 산업 전반에 영향을 줄 것으로 보고 있으며 "
+            f"관계 기관은 추가 피해를 막기 위한 대응 방안을 검토 중이다."
+        ),
+        "pubDate": published.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+    }
+
+
+@app.get("/v1/search/news.json")
+async def search_news(
+    query: str = Query(...),
+    display: int = Query(10),
+    start: int = Query(1),
+    sort: str = Query("sim"),
+):
+    _stats["naver_requests"] += 1
+
+    delay = _config["latency_ms"] + random.random() * MOCK_JITTER_MS
+    await asyncio.sleep(delay / 1000)
+
+    if MOCK_429_RATE and random.random() < MOCK_429_RATE:
+        _stats["naver_429"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"errorMessage": "Rate limit exceeded.", "errorCode": "012"},
+            headers={"Retry-After": "1"},
+        )
+
+    # 같은 (query, start, display)에는 항상 같은 결과 (재현 가능)
+    seed = int(hashlib.md5(f"{query}:{start}:{display}:{sort}".encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    now = datetime.now(KST)
+    items = [_make_item(query, rng, start - 1 + i, now) for i in range(display)]
+
+    return {
+        "lastBuildDate": now.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        "total": 1000,
+        "start": start,
+        "display": display,
+        "items": items,
+    }
+
+
+@app.get("/auth/v1/user")
+async def supabase_get_user(request: Request):
+    _stats["supabase_requests"] += 1
+    return {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": "bench@example.com",
+        "app_metadata": {"provider": "email"},
+        "user_metadata": {"name": "벤치마크"},
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+@app.get("/rest/v1/user_profiles")
+async def supabase_user_profiles(request: Request):
+    _stats["supabase_requests"] += 1
+    return [{
+        "id": "00000000-0000-0000-0000-000000000001",
+        "email": "bench@example.com",
+        "name": "벤치마크",
+        "category_settings": {
+            "사이버보안": True, "해킹/침해사고": True, "개인정보보호": True,
+            "IT/보안 트렌드": True, "악성코드/피싱": True, "보안제품/서비스": True,
+            "인증·암호화": True, "네트워크보안": True, "정책·제도": True, "데이터보안": True,
+        },
+        "email_notification": True,
+        "comments": [],
+    }]
+
+
+@app.get("/__stats")
+async def get_stats():
+    return _stats
+
+
+@app.post("/__reset")
+async def reset_stats():
+    for key in _stats:
+        _stats[key] = 0
+    return _stats
+
+
+@app.post("/__config")
+async def set_config(latency_ms: float = Query(None, ge=0)):
+    if latency_ms is not None:
+        _config["latency_ms"] = latency_ms
+    return _config
@@ -0,0 +1,122 @@
+"""
+검색어 정규화 캐시 히트율 비교
+검색어 로그를 다시 재생하면서, 검색어를 그대로 캐시 키로 쓸 때와
+정규화한 검색어(utils/query.py의 canonical_query)를 쓸 때의 LRU 캐시 히트율을 비교합니다.
+
+- 로그 파일: 한 줄에 검색어 하나 (요청 순서대로, 빈 줄은 건너뜀)
+- 로그 파일이 없으면 보안 뉴스 검색어 인기 분포(Zipf)에 표기 차이(공백, NFD 한글,
+  대소문자, 전각 문자, 영문 별칭)를 섞은 합성 로그를 만듭니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.replay_queries                       # 합성 로그
+    python -m benchmarks.replay_queries queries.txt           # 실제 검색어 로그
+    python -m benchmarks.replay_queries --requests 50000 --cache-size 200
+"""
+
+import argparse
+import random
+import sys
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR / "app"))
+
+from utils.query import canonical_query  # noqa: E402
+
+# utils/cache.py의 MAX_CACHE_SIZE와 같은 값
+DEFAULT_CACHE_SIZE = 200
+
+# 합성 로그의 검색어 (영문 별칭이 있으면 함께)
+_BASE_QUERIES = [
+    ("랜섬웨어", "Ransomware"), ("해킹", None), ("개인정보", None), ("피싱", "Phishing"),
+    ("악성코드", "Malware"), ("디도스", "DDoS"), ("사이버보안", "Cyber Security"), ("제로데이", None),
+    ("IT 보안", None), ("정보보호", None), ("보안 취약점", None), ("클라우드 보안", None),
+    ("데이터 유출", None), ("보안 정책", None), ("인증", None), ("암호화", None),
+]
+
+
+def _variant(query: str, alias, rng: random.Random) -> str:
+    """같은 검색어를 사용자가 입력할 법한 다른 표기로"""
+    roll = rng.random()
+    if roll < 0.45:
+        return query
+    if roll < 0.55:
+        return f" {query} "
+    if roll < 0.65:
+        return query.replace(" ", "  ") if " " in query else f"{query} "
+    if roll < 0.75:
+        # macOS 등에서 들어오는 자모 분리(NFD) 한글
+        return unicodedata.normalize("NFD", query)
+    if roll < 0.82:
+        # 전각 영숫자
+        return "".join(chr(ord(c) + 0xFEE0) if "!" <= c <= "~" else c for c in query)
+    if alias:
+        return rng.choice([alias, alias.lower(), alias.upper()])
+    return query.lower() if query != query.lower() else f"{query} "
+
+
+def synthetic_log(requests: int, distinct: int, seed: int = 42) -> List[str]:
+    """Zipf 분포 인기도에 표기 차이를 섞은 합성 검색어 로그"""
+    rng = random.Random(seed)
+    queries = [(q, alias) for q, alias in _BASE_QUERIES]
+    for i in range(len(queries), distinct):
+        # 긴 꼬리: 한 번씩만 나오는 검색어들
+        queries.append((f"{_BASE_QUERIES[i % len(_BASE_QUERIES)][0]} {i}", None))
+    weights = [1 / (rank + 1) for rank in range(len(queries))]
+    picks = rng.choices(queries, weights=weights, k=requests)
+    return [_variant(query, alias, rng) for query, alias in picks]
+
+
+def replay(log: Iterable[str], key: Callable[[str], str], cache_size: int) -> Dict[str, float]:
+    """LRU 캐시에 로그를 재생해서 히트율과 서로 다른 키 수를 반환"""
+    cache: "OrderedDict[str, None]" = OrderedDict()
+    seen = set()
+    hits = total = 0
+    for query in log:
+        k = key(query)
+        seen.add(k)
+        total += 1
+        if k in cache:
+            hits += 1
+            cache.move_to_end(k)
+        else:
+            cache[k] = None
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+    return {"requests": total, "hits": hits, "hit_rate": hits / total if total else 0.0, "distinct_keys": len(seen)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색어 정규화 전후 캐시 히트율 비교")
+    parser.add_argument("log", nargs="?", help="검색어 로그 파일 (한 줄에 하나, 없으면 합성 로그)")
+    parser.add_argument("--requests", type=int, default=20000, help="합성 로그 요청 수")
+    parser.add_argument("--distinct", type=int, default=400, help="합성 로그 검색어 종류 수")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="LRU 캐시 크기")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            log = [line.rstrip("\n") for line in f if line.strip()]
+        source = args.log
+    else:
+        log = synthetic_log(args.requests, args.distinct)
+        source = f"합성 로그 ({args.requests}건, 검색어 {args.distinct}종)"
+
+    print(f"로그: {source}, 캐시 크기: {args.cache_size}")
+    print(f"{'키':<12}{'히트율':>10}{'히트':>10}{'서로 다른 키':>14}")
+    results = {
+        "raw": replay(log, lambda q: q, args.cache_size),
+        "canonical": replay(log, canonical_query, args.cache_size),
+    }
+    for name, r in results.items():
+        print(f"{name:<12}{r['hit_rate']:>10.1%}{r['hits']:>10}{r['distinct_keys']:>14}")
+    gain = results["canonical"]["hit_rate"] - results["raw"]["hit_rate"]
+    print(f"정규화로 히트율 {gain:+.1%}p, 업스트림 호출 {results['raw']['requests'] - results['raw']['hits']}"
+          f" → {results['canonical']['requests'] - results['canonical']['hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+부하/지연 시간 벤치마크
+로컬 목 업스트림(mock_naver.py)에 연결된 FastAPI 앱을 띄우고
+시나리오별 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.run_bench                              # 전체 시나리오 실행
+    python -m benchmarks.run_bench --scenarios search_hit stampede
+    python -m benchmarks.run_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_bench --compare benchmarks/baseline.json --threshold 0.2
+
+--compare를 주면 기준 결과보다 p95가 threshold 비율 이상 느려지거나
+처리량이 threshold 비율 이상 줄어든 시나리오가 있을 때 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+MOCK_PORT = 18081
+APP_PORT = 18080
+MOCK_URL = f"http://127.0.0.1:{MOCK_PORT}"
+APP_URL = f"http://127.0.0.1:{APP_PORT}"
+
+# Supabase 클라이언트가 형식 검사만 통과하면 되는 가짜 키
+FAKE_SUPABASE_KEY = "bench.fake.key"
+
+
+# ----------------------------------------------------------------------------
+# 프로세스 관리
+# ----------------------------------------------------------------------------
+
+def _start_server(module_app: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module_app, "--port", str(port), "--log-level", "warning"],
+        cwd=str(BACKEND_DIR),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_ready(url: str, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"서버가 준비되지 않았습니다: {url}")
+
+
+def _stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+class Servers:
+    """목 업스트림 서버와 앱 서버를 띄우고 내리는 도우미"""
+
+    def __init__(self, mock_env: Dict[str, str]):
+        self.mock_env = mock_env
+        self.mock: Optional[subprocess.Popen] = None
+        self.app: Optional[subprocess.Popen] = None
+
+    def start_mock(self):
+        env = dict(os.environ, **self.mock_env)
+        self.mock = _start_server("benchmarks.mock_naver:app", MOCK_PORT, env)
+        _wait_ready(f"{MOCK_URL}/__stats")
+
+    def start_app(self):
+        env = dict(
+            os.environ,
+            NAVER_API_URL=f"{MOCK_URL}/v1/search/news.json",
+            NAVER_CLIENT_ID="bench",
+            NAVER_CLIENT_SECRET="bench",
+            SUPABASE_URL=MOCK_URL,
+            SUPABASE_KEY=FAKE_SUPABASE_KEY,
+            SUPABASE_SERVICE_ROLE=FAKE_SUPABASE_KEY,
+            BACKGROUND_JOBS_ENABLED="false",
+            CACHE_SNAPSHOT_ENABLED="false",  # 재시작으로 캐시를 비우는 시나리오가 있음
+            RATE_LIMIT_ENABLED="false",  # 부하 생성기 한 대(IP 하나)에서 모든 요청을 보냄
+            SHARED_STATE_DIR=str(BACKEND_DIR / ".bench_state"),
+        )
+        self.app = _start_server("app.main:app", APP_PORT, env)
+        _wait_ready(f"{APP_URL}/api/test")
+
+    def restart_app(self):
+        """캐시를 비우기 위해 앱만 다시 띄움"""
+        if self.app:
+            _stop_server(self.app)
+        self.start_app()
+
+    def stop(self):
+        for proc in (self.app, self.mock):
+            if proc:
+                _stop_server(proc)
+
+
+# ----------------------------------------------------------------------------
+# 측정
+# ----------------------------------------------------------------------------
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Dict],
+    total: int,
+    concurrency: int,
+) -> Dict:
+    """make_request(i)로 만든 요청 total개를 concurrency개씩 동시에 보내고 지연 시간을 모읍니다."""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            spec = make_request(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(**spec)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def _summarize(runs: List[Dict], upstream: Dict) -> Dict:
+    latencies = sorted(l for run in runs for l in run["latencies"])
+    elapsed = sum(run["elapsed"] for run in runs)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": sum(run["errors"] for run in runs),
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "upstream_naver_calls": upstream.get("naver_requests", 0),
+        "upstream_supabase_calls": upstream.get("supabase_requests", 0),
+    }
+
+
+def _search(query: str, display: int = 10, start: int = 1, deadline_ms: Optional[int] = None) -> Dict:
+    spec = {
+        "method": "GET",
+        "url": "/api/news/search",
+        "params": {"query": query, "display": display, "start": start, "sort": "date"},
+    }
+    if deadline_ms is not None:
+        spec["headers"] = {"X-Deadline-Ms": str(deadline_ms)}
+    return spec
+
+
+# ----------------------------------------------------------------------------
+# 시나리오
+# ----------------------------------------------------------------------------
+
+async def scenario_search_hit(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """같은 검색어 반복 (캐시 히트)"""
+    await client.request(**_search("사이버보안"))
+    return [await _drive(client, lambda i: _search("사이버보안"), args.requests, args.concurrency)]
+
+
+async def scenario_search_miss(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """매번 다른 검색어 (캐시 미스)"""
+    run_id = int(time.time())
+    return [await _drive(
+        client, lambda i: _search(f"보안 {run_id}-{i}"),
+        min(args.requests, 200), args.concurrency,
+    )]
+
+
+async def scenario_slow_upstream(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """
+    업스트림이 느려졌을 때 매번 다른 검색어 (X-Deadline-Ms: 1000)
+    입장 제어와 요청 기한 덕분에 지연 시간이 기한 근처에서 멈추고, 넘친 요청은 503/504로 빨리 끝나야 함
+    (오류 수는 503/504 응답 수)
+    """
+    run_id = int(time.time())
+    async with httpx.AsyncClient(base_url=MOCK_URL) as mock_client:
+        await mock_client.post("/__config", params={"latency_ms": args.slow_latency_ms})
+        try:
+            return [await _drive(
+                client, lambda i: _search(f"장애 {run_id}-{i}", deadline_ms=1000),
+                min(args.requests, 200), args.concurrency,
+            )]
+        finally:
+            await mock_client.post("/__config", params={"latency_ms": args.latency_ms})
+
+
+async def scenario_stampede(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """캐시가 비어 있는 같은 키로 동시에 몰리는 요청 (hot-key stampede)"""
+    runs = []
+    for round_no in range(args.rounds):
+        query = f"랜섬웨어 {int(time.time())}-{round_no}"
+        runs.append(await _drive(client, lambda i: _search(query, display=100), args.concurrency, args.concurrency))
+    return runs
+
+
+async def scenario_category_stats_cold(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """카테고리 통계 (빈 캐시에서 동시 요청) - 라운드마다 앱을 다시 띄움"""
+    runs = []
+    for _ in range(args.rounds):
+        servers.restart_app()
+        runs.append(await _drive(
+            client, lambda i: {"method": "GET", "url": "/api/news/category-stats"},
+            args.concurrency, args.concurrency,
+        ))
+    return runs
+
+
+async def scenario_category_stats_warm(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """카테고리 통계 (캐시 히트)"""
+    await client.get("/api/news/category-stats")
+    return [await _drive(
+        client, lambda i: {"method": "GET", "url": "/api/news/category-stats"},
+        args.requests, args.concurrency,
+    )]
+
+
+async def scenario_profile_read(servers: Servers, client: httpx.AsyncClient, args) -> List[Dict]:
+    """사용자 프로필 조회 (목 Supabase)"""
+    spec = {
+        "method": "GET",
+        "url": "/api/user/profile",
+        "headers": {"Authorization": "Bearer bench-token"},
+    }
+    return [await _drive(client, lambda i: spec, min(args.requests, 500), args.concurrency)]
+
+
+SCENARIOS = {
+    "search_hit": scenario_search_hit,
+    "search_miss": scenario_search_miss,
+    "slow_upstream": scenario_slow_upstream,
+    "stampede": scenario_stampede,
+    "category_stats_cold": scenario_category_stats_cold,
+    "category_stats_warm": scenario_category_stats_warm,
+    "profile_read": scenario_profile_read,
+}
+
+
+async def run_scenarios(servers: Servers, names: List[str], args) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        async with httpx.AsyncClient(base_url=MOCK_URL) as mock_client:
+            await mock_client.post("/__reset")
+        async with httpx.AsyncClient(base_url=APP_URL, timeout=60.0) as client:
+            runs = await SCENARIOS[name](servers, client, args)
+        async with httpx.AsyncClient(base_url=MOCK_URL) as mock_client:
+            upstream = (await mock_client.get("/__stats")).json()
+        results[name] = _summarize(runs, upstream)
+        _print_row(name, results[name])
+    return results
+
+
+# ----------------------------------------------------------------------------
+# 보고 및 기준 비교
+# ----------------------------------------------------------------------------
+
+def _print_header():
+    print(f"{'scenario':<22}{'reqs':>7}{'err':>6}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'naver':>8}")
+    print("-" * 83)
+
+
+def _print_row(name: str, r: Dict):
+    print(
+        f"{name:<22}{r['requests']:>7}{r['errors']:>6}{r['throughput_rps']:>10}"
+        f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['upstream_naver_calls']:>8}"
+    )
+
+
+def compare_with_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """기준 결과 대비 회귀(regression) 목록을 반환합니다."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] > 0 and current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if base["throughput_rps"] > 0 and current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {current['throughput_rps']} rps")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {current['errors']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="뉴스 API 부하/지연 시간 벤치마크")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="시나리오당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--rounds", type=int, default=3, help="stampede/cold 시나리오 반복 횟수")
+    parser.add_argument("--latency-ms", type=float, default=80, help="목 Naver 응답 지연")
+    parser.add_argument("--slow-latency-ms", type=float, default=3000, help="slow_upstream 시나리오의 목 Naver 응답 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="목 Naver 429 비율 (0~1)")
+    parser.add_argument("--save-baseline", type=Path, help="결과를 기준 파일로 저장")
+    parser.add_argument("--compare", type=Path, help="비교할 기준 파일")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 회귀 비율 (기본값 20%%)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    servers = Servers({
+        "MOCK_LATENCY_MS": str(args.latency_ms),
+        "MOCK_429_RATE": str(args.error_rate),
+    })
+    try:
+        servers.start_mock()
+        servers.start_app()
+        _print_header()
+        results = asyncio.run(run_scenarios(servers, args.scenarios, args))
+    finally:
+        servers.stop()
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "rounds": args.rounds,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n기준 결과 저장: {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n❌ 회귀 발견 (허용치 {int(args.threshold * 100)}%):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ 기준 대비 회귀 없음 (허용치 {int(args.threshold * 100)}%)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
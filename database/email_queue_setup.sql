@@ -0,0 +1,174 @@
+-- ============================================
+-- email_log 전송 큐: 배치 claim/lease 및 일괄 ack
+-- (chat_setup.sql 실행 후 실행)
+-- ============================================
+
+-- 1. 큐 처리를 위한 컬럼 추가
+ALTER TABLE public.email_log ADD COLUMN IF NOT EXISTS attempts INT NOT NULL DEFAULT 0;
+ALTER TABLE public.email_log ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+ALTER TABLE public.email_log ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE public.email_log ADD COLUMN IF NOT EXISTS claimed_by TEXT;
+
+-- 2. processing 상태 허용
+ALTER TABLE public.email_log DROP CONSTRAINT IF EXISTS email_log_status_check;
+ALTER TABLE public.email_log ADD CONSTRAINT email_log_status_check
+    CHECK (status IN ('pending', 'processing', 'sent', 'failed'));
+
+-- 3. 인덱스 생성 (claim 쿼리용)
+CREATE INDEX IF NOT EXISTS idx_email_log_pending_next
+    ON public.email_log(next_attempt_at)
+    WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_email_log_processing_lease
+    ON public.email_log(lease_expires_at)
+    WHERE status = 'processing';
+
+-- 4. 배치 claim 함수
+-- 전송할 차례가 된 pending 레코드와 lease가 만료된 processing 레코드를
+-- 최대 p_batch_size개까지 processing으로 바꾸고 반환합니다.
+-- SKIP LOCKED로 여러 워커가 동시에 호출해도 같은 레코드를 가져가지 않습니다.
+CREATE OR REPLACE FUNCTION public.claim_email_batch(
+    p_batch_size INT,
+    p_lease_seconds INT,
+    p_worker_id TEXT
+)
+RETURNS SETOF public.email_log AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE public.email_log e
+    SET status = 'processing',
+        attempts = e.attempts + 1,
+        lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+        claimed_by = p_worker_id
+    WHERE e.id IN (
+        SELECT id FROM public.email_log
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'processing' AND lease_expires_at < NOW())
+        ORDER BY created_at
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING e.*;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 4-1. 요약(digest) 모드용 수신자 단위 claim 함수
+-- 전송할 차례가 된 레코드가 있는 수신자를 가장 오래된 알림 순으로 최대 p_recipient_count명 고르고,
+-- 그 수신자들의 전송할 차례가 된 레코드를 모두 claim합니다.
+-- 한 수신자의 알림이 여러 배치/워커로 나뉘어 요약 이메일이 여러 통으로 쪼개지지 않도록
+-- 수신자마다 트랜잭션 advisory lock을 잡고, 다른 워커가 처리 중인 수신자는 건너뜁니다.
+CREATE OR REPLACE FUNCTION public.claim_email_digest_batch(
+    p_recipient_count INT,
+    p_lease_seconds INT,
+    p_worker_id TEXT
+)
+RETURNS SETOF public.email_log AS $$
+BEGIN
+    RETURN QUERY
+    WITH due AS (
+        SELECT recipient_email, MIN(created_at) AS oldest
+        FROM public.email_log
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'processing' AND lease_expires_at < NOW())
+        GROUP BY recipient_email
+    ),
+    recipients AS (
+        SELECT recipient_email FROM due
+        WHERE pg_try_advisory_xact_lock(hashtext('email_digest:' || recipient_email))
+        ORDER BY oldest
+        LIMIT p_recipient_count
+    )
+    UPDATE public.email_log e
+    SET status = 'processing',
+        attempts = e.attempts + 1,
+        lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+        claimed_by = p_worker_id
+    WHERE e.id IN (
+        SELECT id FROM public.email_log
+        WHERE recipient_email IN (SELECT recipient_email FROM recipients)
+          AND ((status = 'pending' AND next_attempt_at <= NOW())
+               OR (status = 'processing' AND lease_expires_at < NOW()))
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING e.*;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 5. 배치 ack 함수
+-- 한 배치의 결과를 한 번에 기록합니다.
+-- - p_sent_ids: 전송 성공 -> sent
+-- - p_retry_ids: 일시적 실패 -> 지수 백오프 후 다시 pending (최대 횟수 초과 시 failed)
+-- - p_dead_ids: 영구 실패 (잘못된 주소 등) -> failed
+-- - p_release_ids: 이번에 처리하지 않고 돌려놓음 (요약 모드에서 미룬 레코드) -> pending
+--   수신자의 가장 오래된 알림 기준으로 p_release_window초가 지날 때까지 다시 claim되지 않습니다.
+-- lease를 잃은 워커의 ack는 무시됩니다 (claimed_by 확인).
+CREATE OR REPLACE FUNCTION public.ack_email_batch(
+    p_worker_id TEXT,
+    p_sent_ids UUID[],
+    p_retry_ids UUID[],
+    p_dead_ids UUID[],
+    p_release_ids UUID[],
+    p_release_window INT,
+    p_max_attempts INT,
+    p_backoff_seconds INT
+)
+RETURNS JSONB AS $$
+DECLARE
+    sent_count INT;
+    retry_count INT;
+    dead_count INT;
+    release_count INT;
+BEGIN
+    UPDATE public.email_log
+    SET status = 'sent', sent_at = NOW(), lease_expires_at = NULL
+    WHERE id = ANY(p_sent_ids) AND status = 'processing' AND claimed_by = p_worker_id;
+    GET DIAGNOSTICS sent_count = ROW_COUNT;
+
+    UPDATE public.email_log
+    SET status = CASE WHEN attempts >= p_max_attempts THEN 'failed' ELSE 'pending' END,
+        -- 백오프: base * 2^(attempts-1), 최대 6시간
+        next_attempt_at = NOW() + LEAST(
+            make_interval(secs => p_backoff_seconds * power(2, GREATEST(attempts - 1, 0))),
+            INTERVAL '6 hours'
+        ),
+        lease_expires_at = NULL
+    WHERE id = ANY(p_retry_ids) AND status = 'processing' AND claimed_by = p_worker_id;
+    GET DIAGNOSTICS retry_count = ROW_COUNT;
+
+    UPDATE public.email_log
+    SET status = 'failed', lease_expires_at = NULL
+    WHERE id = ANY(p_dead_ids) AND status = 'processing' AND claimed_by = p_worker_id;
+    GET DIAGNOSTICS dead_count = ROW_COUNT;
+
+    UPDATE public.email_log e
+    SET status = 'pending',
+        attempts = GREATEST(e.attempts - 1, 0),
+        next_attempt_at = (
+            SELECT MIN(x.created_at) FROM public.email_log x
+            WHERE x.recipient_email = e.recipient_email AND x.id = ANY(p_release_ids)
+        ) + make_interval(secs => p_release_window),
+        lease_expires_at = NULL
+    WHERE e.id = ANY(p_release_ids) AND e.status = 'processing' AND e.claimed_by = p_worker_id;
+    GET DIAGNOSTICS release_count = ROW_COUNT;
+
+    RETURN jsonb_build_object(
+        'sent', sent_count,
+        'retried', retry_count,
+        'dead', dead_count,
+        'released', release_count
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 6. 실행 권한
+-- 두 함수는 SECURITY DEFINER라 RLS를 거치지 않으므로 (수신자 주소와 본문 조회, lease 가로채기, 임의 ack 가능)
+-- anon/authenticated 키로는 호출할 수 없고 백엔드 워커(service_role)만 호출할 수 있게 합니다.
+REVOKE EXECUTE ON FUNCTION public.claim_email_batch(INT, INT, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.claim_email_batch(INT, INT, TEXT) TO service_role;
+
+REVOKE EXECUTE ON FUNCTION public.claim_email_digest_batch(INT, INT, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.claim_email_digest_batch(INT, INT, TEXT) TO service_role;
+
+REVOKE EXECUTE ON FUNCTION public.ack_email_batch(TEXT, UUID[], UUID[], UUID[], UUID[], INT, INT, INT)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ack_email_batch(TEXT, UUID[], UUID[], UUID[], UUID[], INT, INT, INT)
+    TO service_role;
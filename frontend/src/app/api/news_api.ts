@@ -7,10 +7,8 @@ const getApiBaseUrl = () => {
 
 const API_BASE_URL = getApiBaseUrl()
 
-// 유틸리티 함수: 지정된 시간만큼 대기
-const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
-
 export interface NewsItem {
+  id: string // 고정 기사 ID (originallink 해시)
   title: string
   originallink: string
   link: string
@@ -28,7 +26,7 @@ export interface NewsResponse {
 }
 
 export interface ArticleData {
-  id: number
+  id: string
   title: string
   summary: string
   date: string
@@ -59,9 +57,95 @@ export async function searchNews(
     headers: {
       'Content-Type': 'application/json',
     },
-    cache: 'no-store', // 항상 최신 데이터 가져오기
+    cache: 'no-cache', // 항상 서버에 재검증 (ETag가 같으면 304로 본문 생략)
+  })
+
+  if (!response.ok) {
+    throw new Error(`API 호출 실패: ${response.status}`)
+  }
+
+  return response.json()
+}
+
+export interface BatchSearchQuery {
+  query: string
+  display?: number
+  start?: number
+  sort?: 'sim' | 'date'
+}
+
+export interface BatchSearchResult {
+  query: string
+  display: number
+  start: number
+  sort: 'sim' | 'date'
+  status: number
+  data?: NewsResponse
+  error?: string
+}
+
+/**
+ * 여러 검색을 한 번의 요청으로 가져오기 (결과는 요청 순서대로)
+ */
+export async function searchNewsBatch(
+  queries: BatchSearchQuery[]
+): Promise<BatchSearchResult[]> {
+  const response = await fetch(`${API_BASE_URL}/api/news/search/batch`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ queries }),
+  })
+
+  if (!response.ok) {
+    throw new Error(`API 호출 실패: ${response.status}`)
+  }
+
+  const { results } = await response.json()
+  return results
+}
+
+/**
+ * 검색 결과를 화면용 기사 목록으로 변환
+ */
+function toArticles(category: string, newsResponse: NewsResponse): ArticleData[] {
+  // 캐시 준비 중이면 빈 배열 반환 (에러 아님)
+  if (newsResponse.message || newsResponse.items.length === 0) {
+    console.log(
+      `${category}: 캐시 준비 중... (${
+        newsResponse.message || '잠시 후 새로고침하세요'
+      })`
+    )
+    return []
+  }
+
+  // title/description은 서버에서 태그와 HTML 엔티티를 정리해서 보냄
+  return newsResponse.items.map((item) => {
+    return {
+      id: item.id,
+      title: item.title,
+      summary: item.description,
+      date: formatDate(item.pubDate),
+      source: extractSource(item.originallink),
+      category: category,
+      image: generateImageUrl(), // 랜덤 이미지 생성
+      link: item.originallink || item.link,
+    }
   })
+}
+
+/**
+ * 고정 ID로 기사 하나 가져오기 (검색 결과의 id, 없으면 null)
+ */
+export async function getArticle(id: string): Promise<NewsItem | null> {
+  const response = await fetch(
+    `${API_BASE_URL}/api/news/article/${encodeURIComponent(id)}`
+  )
 
+  if (response.status === 404) {
+    return null
+  }
   if (!response.ok) {
     throw new Error(`API 호출 실패: ${response.status}`)
   }
@@ -78,55 +162,13 @@ export async function getNewsByCategory(
 ): Promise<ArticleData[]> {
   try {
     const newsResponse = await searchNews(category, display, 1, 'date')
-
-    // 캐시 준비 중이면 빈 배열 반환 (에러 아님)
-    if (newsResponse.message || newsResponse.items.length === 0) {
-      console.log(
-        `${category}: 캐시 준비 중... (${
-          newsResponse.message || '잠시 후 새로고침하세요'
-        })`
-      )
-      return []
-    }
-
-    return newsResponse.items.map((item, index) => {
-      // HTML 태그 제거 후 엔티티 디코딩
-      const cleanTitle = decodeHtmlEntities(item.title.replace(/<[^>]*>/g, ''))
-      const cleanSummary = decodeHtmlEntities(
-        item.description.replace(/<[^>]*>/g, '')
-      )
-
-      return {
-        id: index + 1,
-        title: cleanTitle,
-        summary: cleanSummary,
-        date: formatDate(item.pubDate),
-        source: extractSource(item.originallink),
-        category: category,
-        image: generateImageUrl(), // 랜덤 이미지 생성
-        link: item.originallink || item.link,
-      }
-    })
+    return toArticles(category, newsResponse)
   } catch (error) {
     console.error(`${category} 카테고리 뉴스 가져오기 실패:`, error)
     return []
   }
 }
 
-/**
- * HTML 엔티티 디코딩
- */
-function decodeHtmlEntities(text: string): string {
-  return text
-    .replace(/&amp;/g, '&')
-    .replace(/&lt;/g, '<')
-    .replace(/&gt;/g, '>')
-    .replace(/&quot;/g, '"')
-    .replace(/&#039;/g, "'")
-    .replace(/&apos;/g, "'")
-    .replace(/&nbsp;/g, ' ')
-}
-
 /**
  * 날짜 형식 변환 (예: "2시간 전", "1일 전")
  */
@@ -192,7 +234,7 @@ function generateImageUrl(): string {
 
 /**
  * 모든 카테고리의 뉴스 가져오기
- * 배치 처리로 API 제한 회피하면서 속도 최적화
+ * 배치 검색 API 한 번으로 가져옴 (서버가 중복 제거, 캐시 조회, 동시 호출을 처리)
  */
 export async function getAllCategoryNews(): Promise<{
   [key: string]: ArticleData[]
@@ -211,24 +253,28 @@ export async function getAllCategoryNews(): Promise<{
   ]
 
   const results: { [key: string]: ArticleData[] } = {}
-  const BATCH_SIZE = 3 // 3개씩 배치 처리
-  const BATCH_DELAY = 100 // 배치 간 100ms 대기
-
-  // 배치 단위로 처리
-  for (let i = 0; i < categories.length; i += BATCH_SIZE) {
-    const batch = categories.slice(i, i + BATCH_SIZE)
-
-    // 각 배치는 병렬 처리
-    await Promise.all(
-      batch.map(async ({ key, query }) => {
-        results[key] = await getNewsByCategory(query, 7)
-      })
+
+  try {
+    // 모든 카테고리를 한 번의 배치 요청으로 가져옴
+    const batchResults = await searchNewsBatch(
+      categories.map(({ query }) => ({ query, display: 7, start: 1, sort: 'date' }))
     )
 
-    // 마지막 배치가 아니면 대기
-    if (i + BATCH_SIZE < categories.length) {
-      await delay(BATCH_DELAY)
-    }
+    categories.forEach(({ key, query }, index) => {
+      const result = batchResults[index]
+      // 429는 빈 결과와 안내 메시지가 data로 옴
+      if (!result.data) {
+        console.error(`${query} 카테고리 뉴스 가져오기 실패:`, result.error)
+        results[key] = []
+        return
+      }
+      results[key] = toArticles(query, result.data)
+    })
+  } catch (error) {
+    console.error('카테고리 뉴스 배치 요청 실패:', error)
+    categories.forEach(({ key }) => {
+      results[key] = []
+    })
   }
 
   return results
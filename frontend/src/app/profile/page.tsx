@@ -21,7 +21,7 @@ import { useCategoryFilter } from '@/contexts/CategoryFilterContext'
 
 interface BookmarkItem {
   id: string
-  news_id: number
+  news_id: string
   news_title: string
   news_category: string
   news_link?: string
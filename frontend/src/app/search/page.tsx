@@ -15,10 +15,11 @@ import Link from 'next/link'
 
 // 네이버 뉴스 API 응답 타입
 interface NaverNewsItem {
-  title: string // HTML 태그 포함
+  id: string // 고정 기사 ID (originallink 해시)
+  title: string // 일반 텍스트 (서버에서 태그/엔티티 정리)
   originallink: string
   link: string
-  description: string // HTML 태그 포함
+  description: string // 일반 텍스트 (서버에서 태그/엔티티 정리)
   pubDate: string
 }
 
@@ -32,7 +33,7 @@ interface NaverNewsResponse {
 
 interface BookmarkItem {
   id: string
-  news_id: number
+  news_id: string
   news_title: string
   news_category: string
   news_link?: string
@@ -63,11 +64,6 @@ function SearchContent() {
     }
   }
 
-  // HTML 태그 제거 함수
-  const removeHtmlTags = (text: string) => {
-    return text.replace(/<\/?[^>]+(>|$)/g, '')
-  }
-
   // 날짜 포맷 변환 함수
   const formatDate = (dateString: string) => {
     const date = new Date(dateString)
@@ -161,8 +157,8 @@ function SearchContent() {
         // 북마크 추가
         const newBookmark: BookmarkItem = {
           id: `${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
-          news_id: index,
-          news_title: removeHtmlTags(news.title),
+          news_id: news.id,
+          news_title: news.title,
           news_category: '검색결과',
           news_link: newsLink,
           created_at: new Date().toISOString(),
@@ -205,8 +201,8 @@ function SearchContent() {
     }
 
     const params = new URLSearchParams({
-      newsId: index.toString(),
-      newsTitle: removeHtmlTags(news.title),
+      newsId: news.id,
+      newsTitle: news.title,
       newsCategory: '검색결과',
       newsLink: news.originallink,
     })
@@ -232,7 +228,7 @@ function SearchContent() {
         const response = await fetch(
           `${apiUrl}/api/news/search?query=${encodeURIComponent(
             query
-          )}&display=${itemsPerPage}&start=${start}&sort=date`
+          )}&display=${itemsPerPage}&start=${start}&sort=date&fields=title,originallink,description,pubDate`
         )
 
         if (!response.ok) {
@@ -428,7 +424,7 @@ function SearchContent() {
               <div className="space-y-6">
                 {searchResults.map((news, index) => (
                   <div
-                    key={index}
+                    key={news.id}
                     className="block bg-white rounded-lg shadow-md hover:shadow-xl transition-shadow duration-300 p-6"
                   >
                     <a
@@ -438,12 +434,9 @@ function SearchContent() {
                       className="block"
                     >
                       <div className="flex items-start justify-between mb-2">
-                        <h3
-                          className="text-xl font-bold text-gray-900 mb-2 flex-1"
-                          dangerouslySetInnerHTML={{
-                            __html: news.title,
-                          }}
-                        />
+                        <h3 className="text-xl font-bold text-gray-900 mb-2 flex-1">
+                          {news.title}
+                        </h3>
                         <div className="flex items-center gap-2 ml-4">
                           <span className="text-xs text-gray-500 whitespace-nowrap">
                             {formatDate(news.pubDate)}
@@ -483,12 +476,9 @@ function SearchContent() {
                           )}
                         </div>
                       </div>
-                      <p
-                        className="text-sm text-gray-600 mb-3 line-clamp-2"
-                        dangerouslySetInnerHTML={{
-                          __html: news.description,
-                        }}
-                      />
+                      <p className="text-sm text-gray-600 mb-3 line-clamp-2">
+                        {news.description}
+                      </p>
                       <div className="flex items-center justify-between text-sm">
                         <span className="text-blue-600 hover:underline">
                           원문 보기 →
@@ -11,7 +11,7 @@ import 'swiper/css/navigation'
 import 'swiper/css/pagination'
 
 interface Article {
-  id: number
+  id: string
   title: string
   summary: string
   date: string
@@ -23,7 +23,7 @@ interface Article {
 
 interface BookmarkItem {
   id: string
-  news_id: number
+  news_id: string
   news_title: string
   news_category: string
   news_link?: string
@@ -44,10 +44,10 @@ export default function NewsSection({
   articles,
 }: NewsSectionProps) {
   const router = useRouter()
-  const [bookmarkedIds, setBookmarkedIds] = useState<Set<number>>(new Set())
+  const [bookmarkedIds, setBookmarkedIds] = useState<Set<string>>(new Set())
   const [bookmarks, setBookmarks] = useState<BookmarkItem[]>([])
   const [user, setUser] = useState<any>(null)
-  const [bookmarkLoading, setBookmarkLoading] = useState<number | null>(null)
+  const [bookmarkLoading, setBookmarkLoading] = useState<string | null>(null)
 
   // 로그인 상태 및 북마크 목록 확인
   useEffect(() => {
@@ -166,7 +166,7 @@ export default function NewsSection({
 
     // 뉴스 정보를 URL 파라미터로 전달하여 커뮤니티 페이지로 이동
     const params = new URLSearchParams({
-      newsId: article.id.toString(),
+      newsId: article.id,
       newsTitle: article.title,
       newsCategory: article.category,
       newsLink: article.link || '',
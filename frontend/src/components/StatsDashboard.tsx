@@ -24,6 +24,12 @@ interface CategoryStatsResponse {
   categories: CategoryStat[]
 }
 
+interface DashboardResponse {
+  popular_keywords: KeywordStat[]
+  category_stats: CategoryStatsResponse | null
+  trend: TrendData[]
+}
+
 export default function StatsDashboard() {
   const [popularKeywords, setPopularKeywords] = useState<KeywordStat[]>([])
   const [categoryStats, setCategoryStats] =
@@ -36,27 +42,15 @@ export default function StatsDashboard() {
 
   const fetchStats = async () => {
     try {
-      // 인기 키워드 가져오기
+      // 인기 키워드, 카테고리별 뉴스 통계를 대시보드 스냅샷 한 번으로 가져오기
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const keywordsRes = await fetch(
-        `${apiUrl}/api/stats/popular-keywords?limit=30`
-      )
-      if (keywordsRes.ok) {
-        const keywords = await keywordsRes.json()
-        setPopularKeywords(keywords)
-        console.log('인기 키워드:', keywords)
-      }
-
-      // 카테고리별 뉴스 통계 가져오기
-      console.log('카테고리 통계 가져오는 중...')
-      const categoryRes = await fetch(`${apiUrl}/api/news/category-stats`)
-      console.log('응답 상태:', categoryRes.status)
-      if (categoryRes.ok) {
-        const stats = await categoryRes.json()
-        console.log('카테고리 통계:', stats)
-        setCategoryStats(stats)
+      const dashboardRes = await fetch(`${apiUrl}/api/stats/dashboard`)
+      if (dashboardRes.ok) {
+        const dashboard: DashboardResponse = await dashboardRes.json()
+        setPopularKeywords(dashboard.popular_keywords)
+        setCategoryStats(dashboard.category_stats)
       } else {
-        console.error('카테고리 통계 가져오기 실패:', categoryRes.status)
+        console.error('통계 대시보드 가져오기 실패:', dashboardRes.status)
       }
     } catch (error) {
       console.error('통계 데이터 로드 실패:', error)